@@ -0,0 +1,495 @@
+#
+# This file is part of TROCOLA.
+#
+# TROCOLA is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# TROCOLA is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with TROCOLA.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Benchmarks of :mod:`trocola.core.json` over synthetic corpora, compared with
+the standard :mod:`json` module.
+
+Run it from the project root path::
+
+   $ PYTHONPATH=packages python3 -m benchmarks.trocola.core.json --save base.json
+   $ PYTHONPATH=packages python3 -m benchmarks.trocola.core.json --compare base.json
+
+Throughput is given in MB/s of UTF-8 encoded JSON text, taking the best of
+several runs, and peak memory is measured by :mod:`tracemalloc` in a
+separate run. When comparing with a baseline, exit status is 1 if some
+throughput dropped, or some peak memory grew, beyond the tolerance.
+"""
+
+from trocola.core import json
+
+import argparse
+import io
+import json as std_json
+import random
+import sys
+import time
+import tracemalloc
+
+def deep_corpus(rnd, scale):
+
+	"""
+	Deeply nested lists and dictionaries.
+	
+	:param random.Random rnd:
+	   Random generator.
+	:param int scale:
+	   Number of nested chains.
+	:rtype:
+	   list
+	:return:
+	   The corpus value.
+	"""
+	
+	chains = []
+	for i in range(scale):
+		value = rnd.randint(0, 1000)
+		for depth in range(64):
+			if depth % 2 == 0:
+				value = [ value, depth ]
+			else:
+				value = { "level": depth, "child": value }
+		chains.append(value)
+	return chains
+	
+def wide_corpus(rnd, scale):
+
+	"""
+	Dictionaries with many keys.
+	
+	:param random.Random rnd:
+	   Random generator.
+	:param int scale:
+	   Number of dictionaries.
+	:rtype:
+	   list
+	:return:
+	   The corpus value.
+	"""
+	
+	return [
+		{ "key{}".format(k): rnd.randint(0, 1 << 20) for k in range(500) }
+		for i in range(scale)
+	]
+	
+def strings_corpus(rnd, scale):
+
+	"""
+	Long strings, some of them with characters to be escaped.
+	
+	:param random.Random rnd:
+	   Random generator.
+	:param int scale:
+	   Number of strings.
+	:rtype:
+	   list
+	:return:
+	   The corpus value.
+	"""
+	
+	words = [ "convert", "-resize", "800x600", "input file.png", "output.png" ]
+	special = [ "\"quoted\"", "C:\\path", "line\nbreak", "caf\u00e9" ]
+	strings = []
+	for i in range(scale):
+		parts = [ rnd.choice(words) for j in range(200) ]
+		if i % 4 == 0:
+			parts.append(rnd.choice(special))
+		strings.append(" ".join(parts))
+	return strings
+	
+def numbers_corpus(rnd, scale):
+
+	"""
+	Lists of integer and floating point numbers.
+	
+	:param random.Random rnd:
+	   Random generator.
+	:param int scale:
+	   Number of lists.
+	:rtype:
+	   list
+	:return:
+	   The corpus value.
+	"""
+	
+	return [
+		[ rnd.uniform(-1e6, 1e6) if j % 2 else rnd.randint(-1 << 31, 1 << 31)
+			for j in range(1000) ]
+		for i in range(scale)
+	]
+	
+def image_document(rnd, i):
+
+	"""
+	Image document, as loaded by :func:`trocola.engine.image.load`.
+	
+	:param random.Random rnd:
+	   Random generator.
+	:param int i:
+	   Image number.
+	:rtype:
+	   dict
+	:return:
+	   The image document.
+	"""
+	
+	image = {
+		"name": "image{}".format(i),
+		"version": "{}.{}".format(i % 7, i % 13),
+		"ports": [
+			{
+				"name": "port{}".format(j),
+				"value": rnd.randint(1024, 65535),
+				"protocol": rnd.choice([ "tcp", "udp" ])
+			}
+			for j in range(rnd.randint(1, 4))
+		],
+		"resources": [
+			{
+				"source": {
+					"uri": "files/image{}/#{{service.user}}.conf".format(i)
+				},
+				"target": "/etc/image{}/#{{service.user}}.conf".format(i),
+				"properties": {
+					"mode": "0644"
+				}
+			}
+		],
+		"provision": [
+			{
+				"arguments": [ "useradd", "#{service.user}" ]
+			},
+			{
+				"arguments": [ "sh", "-c", "install image{}".format(i) ]
+			}
+		],
+		"execution": [
+			{
+				"arguments": [ "serve", "--port", "#{service.port}" ]
+			}
+		]
+	}
+	if i > 0:
+		base = rnd.randint(0, i - 1)
+		image["extends"] = {
+			"name": "image{}".format(base),
+			"version": "{}.{}".format(base % 7, base % 13)
+		}
+	return {
+		"properties": {
+			"service": {
+				"user": "user{}".format(i),
+				"port": rnd.randint(1024, 65535)
+			}
+		},
+		"image": image
+	}
+	
+def layout_document(rnd, scale):
+
+	"""
+	Layout document, as loaded by :func:`trocola.engine.layout.load`.
+	
+	:param random.Random rnd:
+	   Random generator.
+	:param int scale:
+	   Number of containers.
+	:rtype:
+	   dict
+	:return:
+	   The layout document.
+	"""
+	
+	containers = {}
+	volumes = {}
+	executions = []
+	for i in range(scale):
+		cont_key = "container-{:03}".format(i)
+		containers[cont_key] = {
+			"image": {
+				"name": "image{}".format(i),
+				"version": "{}.{}".format(i % 7, i % 13)
+			},
+			"ports": [
+				{
+					"name": "http",
+					"service": "service{}".format(i)
+				}
+			]
+		}
+		vol_key = "volume-{:03}".format(i)
+		volumes[vol_key] = {
+			"storage": rnd.choice([ "local", "remote" ]),
+			"size": "{}Gb".format(rnd.randint(1, 64))
+		}
+		executions.append({
+			"container": cont_key,
+			"platform": "#{main_platform['name']}",
+			"configuration": {
+				"volumes": [
+					{
+						"volume": vol_key,
+						"path": "/var/data{}".format(i)
+					}
+				]
+			},
+			"enabled": "#{main_platform['enabled']}"
+		})
+	return {
+		"properties": {
+			"main_platform": {
+				"name": "local",
+				"enabled": "true"
+			}
+		},
+		"layout": {
+			"containers": containers,
+			"volumes": volumes,
+			"executions": executions
+		}
+	}
+	
+def layout_corpus(rnd, scale):
+
+	"""
+	Layout and image documents, with the schemas loaded by the engine.
+	
+	:param random.Random rnd:
+	   Random generator.
+	:param int scale:
+	   Number of images, and of containers of the layout.
+	:rtype:
+	   dict
+	:return:
+	   The corpus value.
+	"""
+	
+	return {
+		"layout": layout_document(rnd, scale),
+		"images": [ image_document(rnd, i) for i in range(scale) ]
+	}
+	
+corpora = {
+	"deep": ( deep_corpus, 20 ),
+	"wide": ( wide_corpus, 10 ),
+	"strings": ( strings_corpus, 100 ),
+	"numbers": ( numbers_corpus, 5 ),
+	"layout": ( layout_corpus, 50 )
+}
+
+sizes = {
+	"small": 1,
+	"medium": 10,
+	"large": 100
+}
+
+def __walk(reader):
+
+	if reader.islist():
+		for r in reader:
+			__walk(r)
+	elif reader.isdict():
+		for r_k, r_v in reader:
+			__walk(r_v)
+	else:
+		reader.value()
+		
+def __read(text, data):
+
+	json.read(io.StringIO(text)).value()
+	
+def __read_bytes(text, data):
+
+	json.read(data).value()
+	
+def __iterate(text, data):
+
+	__walk(json.read(data))
+	
+def __write(text, data, value):
+
+	json.write(io.StringIO(), value)
+	
+def __write_depth(text, data, value):
+
+	json.write(io.StringIO(), value, 0)
+	
+def __std_read(text, data):
+
+	std_json.loads(text)
+	
+def __std_write(text, data, value):
+
+	std_json.dumps(value)
+	
+operations = {
+	"read": __read,
+	"read-bytes": __read_bytes,
+	"iterate": __iterate,
+	"write": __write,
+	"write-depth": __write_depth,
+	"stdlib-read": __std_read,
+	"stdlib-write": __std_write
+}
+
+def __measure(op, args, repeat):
+
+	best = None
+	for i in range(repeat):
+		start = time.perf_counter()
+		op(*args)
+		elapsed = time.perf_counter() - start
+		if best is None or elapsed < best:
+			best = elapsed
+	tracemalloc.start()
+	try:
+		op(*args)
+		peak = tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+	return ( best, peak )
+	
+def run(corpus_names, size_names, op_names, repeat=3, out=sys.stdout):
+
+	"""
+	Run benchmarks.
+	
+	:param corpus_names:
+	   Names of the corpora to be used.
+	:param size_names:
+	   Names of the corpus sizes to be used.
+	:param op_names:
+	   Names of the operations to be measured.
+	:param int repeat:
+	   Number of timed runs of every operation.
+	:param out:
+	   Output where results are reported.
+	:rtype:
+	   dict
+	:return:
+	   Results by ``corpus/size/operation`` name, with throughput in MB/s
+	   and peak memory in bytes.
+	"""
+	
+	results = {}
+	row = "{:<28} {:>10} {:>10} {:>12}\n"
+	out.write(row.format("benchmark", "MB", "MB/s", "peak KB"))
+	for corpus_name in corpus_names:
+		corpus_fn, scale = corpora[corpus_name]
+		for size_name in size_names:
+			value = corpus_fn(random.Random(0), scale * sizes[size_name])
+			text = std_json.dumps(value)
+			data = text.encode("utf-8")
+			mb = len(data) / 1e6
+			for op_name in op_names:
+				op = operations[op_name]
+				if "write" in op_name:
+					args = ( text, data, value )
+				else:
+					args = ( text, data )
+				elapsed, peak = __measure(op, args, repeat)
+				name = "/".join(( corpus_name, size_name, op_name ))
+				results[name] = {
+					"throughput": mb / elapsed,
+					"peak": peak
+				}
+				out.write(row.format(
+					name,
+					"{:.2f}".format(mb),
+					"{:.2f}".format(mb / elapsed),
+					peak // 1024
+				))
+	return results
+	
+def compare(results, baseline, tolerance, out=sys.stdout):
+
+	"""
+	Compare results with a baseline.
+	
+	:param dict results:
+	   Results given by :func:`run`.
+	:param dict baseline:
+	   Results of a previous run.
+	:param float tolerance:
+	   Allowed drop of throughput, and allowed growth of peak memory, as a
+	   fraction of the baseline.
+	:param out:
+	   Output where regressions are reported.
+	:rtype:
+	   bool
+	:return:
+	   True if there is no regression. False otherwise.
+	"""
+	
+	passed = True
+	for name, result in results.items():
+		if name not in baseline or name.split("/")[2].startswith("stdlib"):
+			continue
+		expected = baseline[name]["throughput"]
+		if result["throughput"] < expected * (1 - tolerance):
+			msg = "Regression at {}: {:.2f} MB/s, baseline {:.2f} MB/s\n"
+			out.write(msg.format(name, result["throughput"], expected))
+			passed = False
+		expected = baseline[name].get("peak")
+		if expected is not None and result["peak"] > expected * (1 + tolerance):
+			msg = "Regression at {}: {} KB peak, baseline {} KB peak\n"
+			out.write(msg.format(name, result["peak"] // 1024, expected // 1024))
+			passed = False
+	return passed
+	
+def main(argv=None):
+
+	"""
+	Run benchmarks from command line.
+	
+	:param argv:
+	   Command line arguments, or None for :data:`sys.argv`.
+	:rtype:
+	   int
+	:return:
+	   Exit status.
+	"""
+	
+	parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+	parser.add_argument("--corpus", nargs="+", choices=corpora,
+		default=list(corpora))
+	parser.add_argument("--size", nargs="+", choices=sizes,
+		default=[ "small", "medium" ])
+	parser.add_argument("--op", nargs="+", choices=operations,
+		default=list(operations))
+	parser.add_argument("--repeat", type=int, default=3)
+	parser.add_argument("--save", metavar="PATH",
+		help="save results as baseline")
+	parser.add_argument("--compare", metavar="PATH",
+		help="compare results with baseline")
+	parser.add_argument("--tolerance", type=float, default=0.2,
+		help="allowed throughput drop and peak memory growth (default: 0.2)")
+	args = parser.parse_args(argv)
+	
+	results = run(args.corpus, args.size, args.op, args.repeat)
+	if args.save is not None:
+		with open(args.save, "w") as str_out:
+			json.write(str_out, results, 0)
+	if args.compare is not None:
+		with open(args.compare) as str_in:
+			baseline = json.read(str_in).value()
+		if not compare(results, baseline, args.tolerance):
+			return 1
+	return 0
+	
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,1310 @@
+#
+# This file is part of TROCOLA.
+#
+# TROCOLA is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# TROCOLA is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with TROCOLA.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Read and write the same values as :mod:`trocola.core.json`, with the same
+reader and writer interface, but in a compact binary format.
+
+Every value starts with a tag byte, and multi-byte fields are big-endian:
+
+========================  ==================================================
+Tag                       Value
+========================  ==================================================
+``0x00`` to ``0x7f``      Integer from 0 to 127.
+``0xe0`` to ``0xff``      Integer from -32 to -1.
+:data:`INT8` to           Integer in the next 1, 2, 4 or 8 bytes.
+:data:`INT64`
+:data:`BIGINT`            Integer in as many bytes as the next 4-byte length.
+:data:`FLOAT32`           Number in the next 4 bytes, as single precision.
+:data:`FLOAT`             Double precision number in the next 8 bytes.
+``0xa0`` to ``0xbf``      UTF-8 string with up to 31 bytes, as given by the
+                          lowest 5 bits of the tag.
+:data:`STR8` to           UTF-8 string with as many bytes as the next 1, 2
+:data:`STR32`             or 4-byte length.
+:data:`LIST8` or          List whose items fill as many bytes as the next
+:data:`LIST`              1 or 4-byte length.
+:data:`DICT8` or          Dictionary whose keys and values fill as many bytes
+:data:`DICT`              as the next 1 or 4-byte length.
+========================  ==================================================
+
+Since lists and dictionaries are prefixed by their length in bytes, they can
+be skipped without being decoded.
+"""
+
+from trocola.core.json import ReaderException, WriterException, decode_number
+
+import mmap
+import struct
+
+INT8 = 0xd0
+INT16 = 0xd1
+INT32 = 0xd2
+INT64 = 0xd3
+BIGINT = 0xc7
+FLOAT32 = 0xca
+FLOAT = 0xcb
+STR8 = 0xd9
+STR16 = 0xda
+STR32 = 0xdb
+LIST8 = 0xc4
+LIST = 0xdd
+DICT8 = 0xc5
+DICT = 0xdf
+
+class Scanner:
+
+	"""
+	Buffered scanner for binary source.
+	
+	Readers sharing the same scanner share the same input position.
+	
+	:param src:
+	   Binary source, as a binary stream or a bytes-like object such as
+	   :class:`bytes`, :class:`memoryview` or :class:`mmap.mmap`.
+	:param int size:
+	   Number of bytes pulled from source at once.
+	"""
+	
+	__int8 = struct.Struct(">b")
+	__int16 = struct.Struct(">h")
+	__int32 = struct.Struct(">i")
+	__int64 = struct.Struct(">q")
+	__uint8 = struct.Struct(">B")
+	__uint16 = struct.Struct(">H")
+	__uint32 = struct.Struct(">I")
+	__float32 = struct.Struct(">f")
+	__float = struct.Struct(">d")
+	
+	def __init__(self, src, size=65536):
+	
+		if isinstance(src, ( bytes, bytearray, memoryview, mmap.mmap )):
+			self.__src = None
+			self.__buf = src
+		else:
+			self.__src = src
+			self.__buf = src.read(size)
+		self.__size = size
+		self.__pos = 0
+		self.__base = 0
+		
+	def __ensure(self, count):
+	
+		while len(self.__buf) - self.__pos < count:
+			more = self.__src.read(self.__size) if self.__src else b""
+			if len(more) == 0:
+				raise ReaderException("Unexpected end of input")
+			self.__base += self.__pos
+			self.__buf = self.__buf[self.__pos:] + more
+			self.__pos = 0
+			
+	def __field(self, field):
+	
+		self.__ensure(field.size)
+		value = field.unpack_from(self.__buf, self.__pos)[0]
+		self.__pos += field.size
+		return value
+		
+	def __decode(self, buf, pos):
+	
+		tag = buf[pos]
+		pos += 1
+		if tag < 0x80:
+			return ( tag, pos )
+		elif tag >= 0xe0:
+			return ( tag - 0x100, pos )
+		elif 0xa0 <= tag < 0xc0:
+			end = pos + (tag & 0x1f)
+			return ( str(buf[pos:end], "utf-8"), end )
+		elif tag == STR8:
+			end = pos + 1 + buf[pos]
+			return ( str(buf[pos + 1:end], "utf-8"), end )
+		elif tag == STR16:
+			end = pos + 2 + self.__uint16.unpack_from(buf, pos)[0]
+			return ( str(buf[pos + 2:end], "utf-8"), end )
+		elif tag == STR32:
+			end = pos + 4 + self.__uint32.unpack_from(buf, pos)[0]
+			return ( str(buf[pos + 4:end], "utf-8"), end )
+		elif tag == LIST8 or tag == LIST:
+			if tag == LIST8:
+				end = pos + 1 + buf[pos]
+				pos += 1
+			else:
+				end = pos + 4 + self.__uint32.unpack_from(buf, pos)[0]
+				pos += 4
+			val = []
+			while pos < end:
+				item, pos = self.__decode(buf, pos)
+				val.append(item)
+			return ( val, end )
+		elif tag == DICT8 or tag == DICT:
+			if tag == DICT8:
+				end = pos + 1 + buf[pos]
+				pos += 1
+			else:
+				end = pos + 4 + self.__uint32.unpack_from(buf, pos)[0]
+				pos += 4
+			val = {}
+			while pos < end:
+				key, pos = self.__decode(buf, pos)
+				if type(key) != str:
+					raise ReaderException("Dictionary key is not an string")
+				val[key], pos = self.__decode(buf, pos)
+			return ( val, end )
+		elif tag == FLOAT:
+			return ( self.__float.unpack_from(buf, pos)[0], pos + 8 )
+		elif tag == FLOAT32:
+			return ( self.__float32.unpack_from(buf, pos)[0], pos + 4 )
+		elif tag == INT8:
+			return ( self.__int8.unpack_from(buf, pos)[0], pos + 1 )
+		elif tag == INT16:
+			return ( self.__int16.unpack_from(buf, pos)[0], pos + 2 )
+		elif tag == INT32:
+			return ( self.__int32.unpack_from(buf, pos)[0], pos + 4 )
+		elif tag == INT64:
+			return ( self.__int64.unpack_from(buf, pos)[0], pos + 8 )
+		elif tag == BIGINT:
+			end = pos + 4 + self.__uint32.unpack_from(buf, pos)[0]
+			return ( int.from_bytes(buf[pos + 4:end], "big", signed=True), end )
+		raise ReaderException("Illegal tag 0x{:02x}".format(tag))
+		
+	@property
+	def offset(self):
+	
+		"""
+		Number of bytes consumed from source.
+		"""
+		
+		return self.__base + self.__pos
+		
+	def at_end(self):
+	
+		"""
+		Determines if source has been consumed.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if there are no more bytes in source. False otherwise.
+		"""
+		
+		try:
+			self.__ensure(1)
+		except ReaderException:
+			return True
+		return False
+		
+	def read(self, count):
+	
+		"""
+		Read next *count* bytes from source.
+		
+		:param int count:
+		   Number of bytes to be read.
+		:rtype:
+		   bytes
+		:return:
+		   Read bytes.
+		:raise ReaderException:
+		   If source has less bytes than requested.
+		"""
+		
+		self.__ensure(count)
+		data = self.__buf[self.__pos:self.__pos + count]
+		self.__pos += count
+		return bytes(data)
+		
+	def skip(self, count):
+	
+		"""
+		Discard next *count* bytes from source.
+		
+		:param int count:
+		   Number of bytes to be discarded.
+		:raise ReaderException:
+		   If source has less bytes than requested.
+		"""
+		
+		while len(self.__buf) - self.__pos < count:
+			count -= len(self.__buf) - self.__pos
+			self.__base += len(self.__buf)
+			self.__buf = self.__src.read(self.__size) if self.__src else b""
+			self.__pos = 0
+			if len(self.__buf) == 0:
+				raise ReaderException("Unexpected end of input")
+		self.__pos += count
+		
+	def read_header(self):
+	
+		"""
+		Consume the tag of the next value, along with the value itself for
+		numbers, or with the length in bytes for strings, lists and
+		dictionaries.
+		
+		:rtype:
+		   tuple
+		:return:
+		   Type of the value, as :class:`int`, :class:`float`, :class:`str`,
+		   :class:`list` or :class:`dict`, and the number or the length.
+		:raise ReaderException:
+		   If there is no valid tag.
+		"""
+		
+		tag = self.__field(self.__uint8)
+		if tag < 0x80:
+			return ( int, tag )
+		elif tag >= 0xe0:
+			return ( int, tag - 0x100 )
+		elif 0xa0 <= tag < 0xc0:
+			return ( str, tag & 0x1f )
+		elif tag == STR8:
+			return ( str, self.__field(self.__uint8) )
+		elif tag == STR16:
+			return ( str, self.__field(self.__uint16) )
+		elif tag == STR32:
+			return ( str, self.__field(self.__uint32) )
+		elif tag == LIST8:
+			return ( list, self.__field(self.__uint8) )
+		elif tag == LIST:
+			return ( list, self.__field(self.__uint32) )
+		elif tag == DICT8:
+			return ( dict, self.__field(self.__uint8) )
+		elif tag == DICT:
+			return ( dict, self.__field(self.__uint32) )
+		elif tag == FLOAT:
+			return ( float, self.__field(self.__float) )
+		elif tag == FLOAT32:
+			return ( float, self.__field(self.__float32) )
+		elif tag == INT8:
+			return ( int, self.__field(self.__int8) )
+		elif tag == INT16:
+			return ( int, self.__field(self.__int16) )
+		elif tag == INT32:
+			return ( int, self.__field(self.__int32) )
+		elif tag == INT64:
+			return ( int, self.__field(self.__int64) )
+		elif tag == BIGINT:
+			data = self.read(self.__field(self.__uint32))
+			return ( int, int.from_bytes(data, "big", signed=True) )
+		raise ReaderException("Illegal tag 0x{:02x}".format(tag))
+		
+	def decode_items(self, length, keyed):
+	
+		"""
+		Consume and decode the items of a list or dictionary, whose header
+		has already been consumed.
+		
+		:param int length:
+		   Length in bytes of the items.
+		:param bool keyed:
+		   Whether items are keys and values of a dictionary.
+		:rtype:
+		   list or dict
+		:return:
+		   The decoded items.
+		:raise ReaderException:
+		   If items are not valid.
+		"""
+		
+		self.__ensure(length)
+		buf = self.__buf
+		pos = self.__pos
+		end = pos + length
+		try:
+			if keyed:
+				val = {}
+				while pos < end:
+					key, pos = self.__decode(buf, pos)
+					if type(key) != str:
+						raise ReaderException("Dictionary key is not an string")
+					val[key], pos = self.__decode(buf, pos)
+			else:
+				val = []
+				while pos < end:
+					item, pos = self.__decode(buf, pos)
+					val.append(item)
+		except ( IndexError, struct.error, UnicodeDecodeError ) as e:
+			raise ReaderException("Illegal value: {}".format(e))
+		if pos != end:
+			raise ReaderException("Item exceeds container length")
+		self.__pos = end
+		return val
+		
+class Reader:
+
+	"""
+	Abstract reader for binary source.
+	
+	It can be iterated in order to fetch its child :class:`Reader` items.
+	
+	:param src:
+	   Binary source, :class:`Scanner` or parent :class:`Reader`.
+	"""
+	
+	def __init__(self, src):
+	
+		if isinstance(src, Reader):
+			self.__scanner = src.scanner
+		elif isinstance(src, Scanner):
+			self.__scanner = src
+		else:
+			self.__scanner = Scanner(src)
+			
+	def __iter__(self):
+	
+		yield from ()
+		
+	@property
+	def scanner(self):
+	
+		"""
+		Scanner shared by this reader and its children.
+		"""
+		
+		return self.__scanner
+		
+	def isnumber(self):
+	
+		"""
+		Determines if it is a number reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if it is a number reader. False otherwise.
+		"""
+		
+		return False
+		
+	def isstr(self):
+	
+		"""
+		Determines if it is an string reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if it is an string reader. False otherwise.
+		"""
+		
+		return False
+		
+	def islist(self):
+	
+		"""
+		Determines if it is a list reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if it is a list reader. False otherwise.
+		"""
+		
+		return False
+		
+	def isdict(self):
+	
+		"""
+		Determines if it is a dictionary reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if it is a dictionary reader. False otherwise.
+		"""
+		
+		return False
+		
+	def skip(self):
+	
+		"""
+		Discard the rest of this value.
+		"""
+		
+		pass
+		
+class NumberReader(Reader):
+
+	"""
+	Reader for binary numbers.
+	
+	:param src:
+	   Binary source.
+	:param number:
+	   Number whose header has been consumed.
+	"""
+	
+	def __init__(self, src, number):
+	
+		super().__init__(src)
+		self.__number = number
+		
+	def isnumber(self):
+	
+		"""
+		Determines if it is a number reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True because it is a number reader.
+		"""
+		
+		return True
+		
+	def value(self):
+	
+		"""
+		Number value.
+		
+		:return:
+		   The number value.
+		"""
+		
+		return self.__number
+		
+class StringReader(Reader):
+
+	"""
+	Reader for binary strings.
+	
+	It can be iterated in order to fetch its characters.
+	
+	:param src:
+	   Binary source.
+	:param int length:
+	   Length in bytes of the string.
+	"""
+	
+	def __init__(self, src, length):
+	
+		super().__init__(src)
+		self.__length = length
+		self.__concluded = False
+		
+	def __iter__(self):
+	
+		yield from self.value()
+		
+	def isstr(self):
+	
+		"""
+		Determines if it is an string reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True because it is an string reader.
+		"""
+		
+		return True
+		
+	def value(self):
+	
+		"""
+		String value.
+		
+		:rtype:
+		   string
+		:return:
+		   The string value.
+		:raise ReaderException:
+		   If the string is not valid UTF-8.
+		"""
+		
+		if self.__concluded:
+			return ""
+		self.__concluded = True
+		try:
+			return str(self.scanner.read(self.__length), "utf-8")
+		except UnicodeDecodeError as e:
+			raise ReaderException("Illegal string: {}".format(e))
+			
+	def skip(self):
+	
+		"""
+		Discard the rest of this string.
+		"""
+		
+		if not self.__concluded:
+			self.__concluded = True
+			self.scanner.skip(self.__length)
+			
+class ListReader(Reader):
+
+	"""
+	Reader for binary lists.
+	
+	Child readers not consumed by the caller are skipped by their length
+	before fetching the next one.
+	
+	:param src:
+	   Binary source.
+	:param int length:
+	   Length in bytes of the list items.
+	"""
+	
+	def __init__(self, src, length):
+	
+		super().__init__(src)
+		self.__end = self.scanner.offset + length
+		self.__child = None
+		
+	def __iter__(self):
+	
+		scanner = self.scanner
+		while True:
+			if self.__child is not None:
+				self.__child.skip()
+				self.__child = None
+			if scanner.offset >= self.__end:
+				break
+			self.__child = value_reader(self)
+			yield self.__child
+			
+	def islist(self):
+	
+		"""
+		Determines if it is a list reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True because it is a list reader.
+		"""
+		
+		return True
+		
+	def value(self):
+	
+		"""
+		List value.
+		
+		:rtype:
+		   list
+		:return:
+		   The list value.
+		:raise ReaderException:
+		   If some item is not valid.
+		"""
+		
+		if self.__child is not None:
+			self.__child.skip()
+			self.__child = None
+		length = self.__end - self.scanner.offset
+		return self.scanner.decode_items(length, False)
+		
+	def skip(self):
+	
+		"""
+		Discard the rest of this list.
+		"""
+		
+		if self.__child is not None:
+			self.__child.skip()
+			self.__child = None
+		self.scanner.skip(self.__end - self.scanner.offset)
+		
+class DictionaryReader(Reader):
+
+	"""
+	Reader for binary dictionaries.
+	
+	Child readers not consumed by the caller are skipped by their length
+	before fetching the next one.
+	
+	:param src:
+	   Binary source.
+	:param int length:
+	   Length in bytes of the dictionary keys and values.
+	"""
+	
+	def __init__(self, src, length):
+	
+		super().__init__(src)
+		self.__end = self.scanner.offset + length
+		self.__child = None
+		
+	def __iter__(self):
+	
+		scanner = self.scanner
+		while True:
+			if self.__child is not None:
+				self.__child.skip()
+				self.__child = None
+			if scanner.offset >= self.__end:
+				break
+			key = value_reader(self)
+			if not key.isstr():
+				raise ReaderException("Dictionary key is not an string")
+			key = key.value()
+			self.__child = value_reader(self)
+			yield ( key, self.__child )
+			
+	def isdict(self):
+	
+		"""
+		Determines if it is a dictionary reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True because it is a dictionary reader.
+		"""
+		
+		return True
+		
+	def value(self):
+	
+		"""
+		Dictionary value.
+		
+		:rtype:
+		   dict
+		:return:
+		   The dictionary value.
+		:raise ReaderException:
+		   If some key or value is not valid.
+		"""
+		
+		if self.__child is not None:
+			self.__child.skip()
+			self.__child = None
+		length = self.__end - self.scanner.offset
+		return self.scanner.decode_items(length, True)
+		
+	def skip(self):
+	
+		"""
+		Discard the rest of this dictionary.
+		"""
+		
+		if self.__child is not None:
+			self.__child.skip()
+			self.__child = None
+		self.scanner.skip(self.__end - self.scanner.offset)
+		
+class Writer:
+
+	"""
+	Abstract writer for binary target.
+	
+	Writers created on a binary target share their buffer with their
+	children, and write it to target when they are closed, once lengths of
+	all lists and dictionaries are known.
+	
+	:param tgt:
+	   Binary target or parent :class:`Writer`.
+	"""
+	
+	def __init__(self, tgt):
+	
+		if isinstance(tgt, Writer):
+			self.__tgt = None
+			self.__buffer = tgt.buffer
+		else:
+			self.__tgt = tgt
+			self.__buffer = bytearray()
+		self.__write = self.__buffer.extend
+		
+	def __write_closed(self, data):
+	
+		raise WriterException("Writer already closed")
+		
+	@property
+	def buffer(self):
+	
+		"""
+		Buffer shared by this writer and its children.
+		"""
+		
+		return self.__buffer
+		
+	def write(self, data):
+	
+		"""
+		Write encoded data to target.
+		
+		:param bytes data:
+		   Data to be written.
+		:raise WriterExeption:
+		   If writer is already closed.
+		"""
+		
+		self.__write(data)
+		
+	def close(self):
+	
+		"""
+		Close this writer.
+		
+		:raise WriterExeption:
+		   If writer is already closed.
+		"""
+		
+		self.__write(b"")
+		self.__write = self.__write_closed
+		if self.__tgt is not None:
+			self.__tgt.write(self.__buffer)
+			
+class NumberWriter(Writer):
+
+	"""
+	Writer for binary numbers.
+	
+	Written text is the JSON text of the number, encoded when the writer is
+	closed.
+	
+	:param tgt:
+	   Binary target.
+	"""
+	
+	def __init__(self, tgt):
+	
+		super().__init__(tgt)
+		self.__parts = []
+		
+	def write(self, text):
+	
+		"""
+		Write number text.
+		
+		:param string text:
+		   Text to be written.
+		:raise WriterExeption:
+		   If writer is already closed.
+		"""
+		
+		super().write(b"")
+		self.__parts.append(text)
+		
+	def close(self):
+	
+		"""
+		Close this writer.
+		
+		:raise WriterExeption:
+		   If writer is already closed or number text is not valid.
+		"""
+		
+		try:
+			number = decode_number("".join(self.__parts))
+		except ReaderException as e:
+			raise WriterException(str(e))
+		super().write(encode(number))
+		super().close()
+		
+class StringWriter(Writer):
+
+	"""
+	Writer for binary strings.
+	
+	Written text is encoded when the writer is closed.
+	
+	:param tgt:
+	   Binary target.
+	"""
+	
+	def __init__(self, tgt):
+	
+		super().__init__(tgt)
+		self.__parts = []
+		
+	def write(self, text):
+	
+		"""
+		Write string text.
+		
+		:param string text:
+		   Text to be written.
+		:raise WriterExeption:
+		   If writer is already closed.
+		"""
+		
+		super().write(b"")
+		self.__parts.append(text)
+		
+	def close(self):
+	
+		"""
+		Close this writer.
+		
+		:raise WriterExeption:
+		   If writer is already closed.
+		"""
+		
+		super().write(encode("".join(self.__parts)))
+		super().close()
+		
+class ListWriter(Writer):
+
+	"""
+	Writer for binary lists.
+	
+	:param tgt:
+	   Binary target.
+	"""
+	
+	def __init__(self, tgt):
+	
+		super().__init__(tgt)
+		self.__start = len(self.buffer)
+		self.write(b"\xdd\0\0\0\0")
+		
+	def append(self, value):
+	
+		"""
+		Append a value.
+		
+		:param value:
+		   Value to be appended.
+		:raise WriterException:
+		   If value type is not supported.
+		"""
+		
+		self.write(encode(value))
+		
+	def append_number(self):
+	
+		"""
+		Append a number.
+		
+		:rtype:
+		   NumberWriter
+		:return:
+		   The appended number writer.
+		"""
+		
+		return NumberWriter(self)
+		
+	def append_str(self):
+	
+		"""
+		Append an string.
+		
+		:rtype:
+		   StringWriter
+		:return:
+		   The appended string writer.
+		"""
+		
+		return StringWriter(self)
+		
+	def append_list(self):
+	
+		"""
+		Append a list.
+		
+		:rtype:
+		   ListWriter
+		:return:
+		   The appended list writer.
+		"""
+		
+		return ListWriter(self)
+		
+	def append_dict(self):
+	
+		"""
+		Append a dictionary.
+		
+		:rtype:
+		   DictionaryWriter
+		:return:
+		   The appended dictionary writer.
+		"""
+		
+		return DictionaryWriter(self)
+		
+	def close(self):
+	
+		"""
+		Close this writer.
+		
+		:raise WriterExeption:
+		   If writer is already closed.
+		"""
+		
+		self.write(b"")
+		conclude(self.buffer, self.__start)
+		super().close()
+		
+class DictionaryWriter(Writer):
+
+	"""
+	Writer for binary dictionaries.
+	
+	:param tgt:
+	   Binary target.
+	"""
+	
+	def __init__(self, tgt):
+	
+		super().__init__(tgt)
+		self.__start = len(self.buffer)
+		self.write(b"\xdf\0\0\0\0")
+		
+	def __write_key(self, key):
+	
+		if type(key) != str:
+			msg = "Key type '{}' is not supported"
+			raise WriterException(msg.format(type(key)))
+		self.write(encode(key))
+		
+	def put(self, key, value):
+	
+		"""
+		Put a value.
+		
+		:param string key:
+		   Key of the value to be put.
+		:param value:
+		   Value to be put.
+		:raise WriterException:
+		   If value type is not supported.
+		"""
+		
+		data = encode(value)
+		self.__write_key(key)
+		self.write(data)
+		
+	def put_number(self, key):
+	
+		"""
+		Put a number.
+		
+		:param string key:
+		   Key of the value to be put.
+		:rtype:
+		   NumberWriter
+		:return:
+		   The put number writer.
+		"""
+		
+		self.__write_key(key)
+		return NumberWriter(self)
+		
+	def put_str(self, key):
+	
+		"""
+		Put an string.
+		
+		:param string key:
+		   Key of the value to be put.
+		:rtype:
+		   StringWriter
+		:return:
+		   The put string writer.
+		"""
+		
+		self.__write_key(key)
+		return StringWriter(self)
+		
+	def put_list(self, key):
+	
+		"""
+		Put a list.
+		
+		:param string key:
+		   Key of the value to be put.
+		:rtype:
+		   ListWriter
+		:return:
+		   The put list writer.
+		"""
+		
+		self.__write_key(key)
+		return ListWriter(self)
+		
+	def put_dict(self, key):
+	
+		"""
+		Put a dictionary.
+		
+		:param string key:
+		   Key of the value to be put.
+		:rtype:
+		   DictionaryWriter
+		:return:
+		   The put dictionary writer.
+		"""
+		
+		self.__write_key(key)
+		return DictionaryWriter(self)
+		
+	def close(self):
+	
+		"""
+		Close this writer.
+		
+		:raise WriterExeption:
+		   If writer is already closed.
+		"""
+		
+		self.write(b"")
+		conclude(self.buffer, self.__start)
+		super().close()
+		
+def value_reader(src):
+
+	"""
+	Reader for the next value of a binary source.
+	
+	:param src:
+	   Binary source, :class:`Scanner` or parent :class:`Reader`.
+	:rtype:
+	   Reader
+	:return:
+	   Binary reader.
+	:raise ReaderException:
+	   If there is no valid value.
+	"""
+	
+	reader = src if isinstance(src, Reader) else Reader(src)
+	kind, header = reader.scanner.read_header()
+	if kind is list:
+		return ListReader(reader, header)
+	elif kind is dict:
+		return DictionaryReader(reader, header)
+	elif kind is str:
+		return StringReader(reader, header)
+	else:
+		return NumberReader(reader, header)
+		
+def read(bin_in):
+
+	"""
+	Read a value.
+	
+	:param bin_in:
+	   Binary input, as a binary stream or a bytes-like object.
+	:rtype:
+	   Reader
+	:return:
+	   Binary reader.
+	:raise ReaderException:
+	   If some error has been ocurred at reading.
+	"""
+	
+	return value_reader(bin_in)
+	
+def decode(data):
+
+	"""
+	Decode a whole value.
+	
+	:param data:
+	   Bytes-like object holding exactly one value.
+	:return:
+	   The decoded value.
+	:raise ReaderException:
+	   If data does not hold a valid value.
+	"""
+	
+	scanner = Scanner(data)
+	reader = value_reader(scanner)
+	val = reader.value()
+	if not scanner.at_end():
+		raise ReaderException("Unexpected data after value")
+	return val
+	
+__int8 = struct.Struct(">Bb")
+__int16 = struct.Struct(">Bh")
+__int32 = struct.Struct(">Bi")
+__int64 = struct.Struct(">Bq")
+__str8 = struct.Struct(">BB")
+__str16 = struct.Struct(">BH")
+__uint32 = struct.Struct(">BI")
+__float32 = struct.Struct(">Bf")
+__float = struct.Struct(">Bd")
+
+def conclude(out, start):
+
+	"""
+	Set the length of a list or dictionary, once all its items have been
+	encoded after its header.
+	
+	Lengths lower than 256 bytes are stored in a single byte, so the items
+	are moved back three bytes.
+	
+	:param bytearray out:
+	   Buffer ending with the list or dictionary.
+	:param int start:
+	   Position of the header, encoded with :data:`LIST` or :data:`DICT`
+	   tag and four bytes reserved for length.
+	"""
+	
+	length = len(out) - start - 5
+	if length < 0x100:
+		out[start] = LIST8 if out[start] == LIST else DICT8
+		out[start + 1] = length
+		del out[start + 2:start + 5]
+	else:
+		out[start + 1:start + 5] = length.to_bytes(4, "big")
+		
+def __encode(out, value):
+
+	value_type = type(value)
+	if value_type == str:
+		data = value.encode("utf-8")
+		length = len(data)
+		if length < 0x20:
+			out.append(0xa0 | length)
+		elif length < 0x100:
+			out += __str8.pack(STR8, length)
+		elif length < 0x10000:
+			out += __str16.pack(STR16, length)
+		else:
+			out += __uint32.pack(STR32, length)
+		out += data
+	elif value_type == int:
+		if 0 <= value < 0x80:
+			out.append(value)
+		elif -0x20 <= value < 0:
+			out.append(value + 0x100)
+		elif -0x80 <= value < 0x80:
+			out += __int8.pack(INT8, value)
+		elif -0x8000 <= value < 0x8000:
+			out += __int16.pack(INT16, value)
+		elif -0x80000000 <= value < 0x80000000:
+			out += __int32.pack(INT32, value)
+		elif -0x8000000000000000 <= value < 0x8000000000000000:
+			out += __int64.pack(INT64, value)
+		else:
+			length = value.bit_length() // 8 + 1
+			data = value.to_bytes(length, "big", signed=True)
+			out += __uint32.pack(BIGINT, len(data))
+			out += data
+	elif value_type == float:
+		try:
+			data = __float32.pack(FLOAT32, value)
+			single = __float32.unpack(data)[1] == value
+		except OverflowError:
+			single = False
+		out += data if single else __float.pack(FLOAT, value)
+	elif value_type == list:
+		start = len(out)
+		out += b"\xdd\0\0\0\0"
+		for item in value:
+			__encode(out, item)
+		conclude(out, start)
+	elif value_type == dict:
+		start = len(out)
+		out += b"\xdf\0\0\0\0"
+		for k, v in value.items():
+			if type(k) != str:
+				msg = "Key type '{}' is not supported"
+				raise WriterException(msg.format(type(k)))
+			__encode(out, k)
+			__encode(out, v)
+		conclude(out, start)
+	else:
+		msg = "Value type '{}' is not supported"
+		raise WriterException(msg.format(value_type))
+		
+def encode(value):
+
+	"""
+	Encode a whole value.
+	
+	:param value:
+	   Value to be encoded.
+	:rtype:
+	   bytearray
+	:return:
+	   The encoded value.
+	:raise WriterException:
+	   If some value type is not supported.
+	"""
+	
+	out = bytearray()
+	__encode(out, value)
+	return out
+	
+def write(bin_out, value):
+
+	"""
+	Write a value.
+	
+	:param bin_out:
+	   Binary output.
+	:param value:
+	   Value to be written.
+	:raise WriterException:
+	   If value type is not supported.
+	"""
+	
+	bin_out.write(encode(value))
+	
+def write_number(bin_out):
+
+	"""
+	Write a number.
+	
+	:param bin_out:
+	   Binary output.
+	:rtype:
+	   NumberWriter
+	:return:
+	   The written number writer.
+	"""
+	
+	return NumberWriter(bin_out)
+	
+def write_str(bin_out):
+
+	"""
+	Write an string.
+	
+	:param bin_out:
+	   Binary output.
+	:rtype:
+	   StringWriter
+	:return:
+	   The written string writer.
+	"""
+	
+	return StringWriter(bin_out)
+	
+def write_list(bin_out):
+
+	"""
+	Write a list.
+	
+	:param bin_out:
+	   Binary output.
+	:rtype:
+	   ListWriter
+	:return:
+	   The written list writer.
+	"""
+	
+	return ListWriter(bin_out)
+	
+def write_dict(bin_out):
+
+	"""
+	Write a dictionary.
+	
+	:param bin_out:
+	   Binary output.
+	:rtype:
+	   DictionaryWriter
+	:return:
+	   The written dictionary writer.
+	"""
+	
+	return DictionaryWriter(bin_out)
@@ -20,7 +20,22 @@ Read an write JSON data from and to string input and output, as well it does the
 standard :mod:`json` module, but in streaming mode.
 """
 
+import array
+import codecs
+import collections.abc
+import concurrent.futures
+import functools
 import io
+import mmap
+import os
+import re
+import types
+import weakref
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
 
 class ReaderException(BaseException):
 
@@ -35,6 +50,591 @@ class ReaderException(BaseException):
 	
 		super().__init__(args)
 		
+class KeyCache:
+
+	"""
+	Cache for interning dictionary keys.
+	
+	Repeated keys are resolved to the same string object, without being
+	decoded again. It may be shared by several scanners in order to reuse
+	keys across several sources.
+	
+	:param int size:
+	   Maximum number of cached keys. Keys beyond it are not cached.
+	"""
+	
+	def __init__(self, size=4096):
+	
+		self.__size = size
+		self.__keys = {}
+		
+	def __len__(self):
+	
+		return len(self.__keys)
+		
+	def intern(self, key):
+	
+		"""
+		Cached string for a key.
+		
+		:param key:
+		   Key as string, or as UTF-8 bytes.
+		:rtype:
+		   string
+		:return:
+		   Cached string equal to the key.
+		"""
+		
+		keys = self.__keys
+		val = keys.get(key)
+		if val is None:
+			val = key if isinstance(key, str) else str(key, "utf-8")
+			val = keys.get(val, val)
+			if len(keys) < self.__size:
+				keys[key] = val
+				keys[val] = val
+		return val
+		
+# Lexical definitions shared by Scanner, FeedParser and events(), which are
+# not name mangled so classes can use them too.
+_token_source = r"\s*(\S)"
+_plain_source = r"[^\"\\]*"
+_number_source = r"[0-9.eE+-]*"
+_escapes = {
+	"\"": "\"",
+	"\\": "\\",
+	"/": "/",
+	"b": "\b",
+	"f": "\f",
+	"n": "\n",
+	"r": "\r",
+	"t": "\t"
+}
+_start_map_event = ( "start_map", None )
+_end_map_event = ( "end_map", None )
+_start_array_event = ( "start_array", None )
+_end_array_event = ( "end_array", None )
+
+class Scanner:
+
+	"""
+	Buffered scanner for JSON source.
+	
+	It pulls large chunks from the source and scans runs of plain string
+	characters, digits and whitespace in one step. Readers sharing the same
+	scanner share the same input position.
+	
+	Source may be a text stream, a binary stream or a bytes-like object such
+	as :class:`bytes`, :class:`memoryview` or :class:`mmap.mmap`. Binary
+	input is scanned as raw UTF-8 and only the produced strings are decoded.
+	
+	:param src:
+	   JSON source.
+	:param int size:
+	   Number of characters, or bytes, pulled from source at once.
+	:param KeyCache key_cache:
+	   Cache for interning dictionary keys, if any.
+	"""
+	
+	__sources = (
+		_token_source,
+		_plain_source,
+		r"([^\"\\]*)\"\s*:\s*(\S)",
+		_number_source,
+		r"[^\"\\]*(?:\\.[^\"\\]*)*\"",
+		r"[\s0-9.eE+,-]*",
+		r"[^\[\]{}\"]*(?:\"[^\"\\]*(?:\\.[^\"\\]*)*\"[^\[\]{}\"]*)*",
+		r"[^\n]*"
+	)
+	__patterns = (
+		tuple(re.compile(source) for source in __sources),
+		tuple(re.compile(source.encode()) for source in __sources)
+	)
+	__escape = re.compile(
+		r"\\(?:u([dD][89abAB][0-9a-fA-F]{2})\\u([dD][c-fC-F][0-9a-fA-F]{2})"
+		r"|u([0-9a-fA-F]{4})|(.?))",
+		re.DOTALL
+	)
+	
+	def __init__(self, src, size=65536, key_cache=None):
+	
+		if isinstance(src, ( bytes, bytearray, memoryview, mmap.mmap )):
+			self.__src = None
+			self.__buf = src
+		else:
+			self.__src = src
+			self.__buf = src.read(size)
+		self.__size = size
+		self.__key_cache = key_cache
+		self.__pos = 0
+		self.__base = 0
+		self.__mark = None
+		self.__kept = []
+		self.__kept_base = 0
+		self.__binary = not isinstance(self.__buf, str)
+		(
+			self.__token,
+			self.__plain,
+			self.__key,
+			self.__number,
+			self.__string,
+			self.__numbers,
+			self.__nested,
+			self.__line
+		) = self.__patterns[self.__binary]
+		if self.__binary:
+			self.__empty = b""
+			self.__quote = ord("\"")
+			self.__opening = ( ord("["), ord("{") )
+		else:
+			self.__empty = ""
+			self.__quote = "\""
+			self.__opening = ( "[", "{" )
+			
+	def __fill(self):
+	
+		if self.__src is None:
+			return False
+		if self.__mark is not None:
+			self.__kept.append(self.__buf)
+		self.__base += len(self.__buf)
+		self.__buf = self.__src.read(self.__size)
+		self.__pos = 0
+		return len(self.__buf) > 0
+		
+	def __ensure(self, count):
+	
+		while len(self.__buf) - self.__pos < count:
+			if self.__src is None:
+				return False
+			more = self.__src.read(self.__size)
+			if len(more) == 0:
+				return False
+			if self.__mark is not None:
+				self.__kept.append(self.__buf[:self.__pos])
+			self.__base += self.__pos
+			self.__buf = self.__buf[self.__pos:] + more
+			self.__pos = 0
+		return True
+		
+	def __char(self, c):
+	
+		if self.__binary:
+			return str(c, "latin-1")
+		return c
+		
+	def __skip_string(self):
+	
+		plain = self.__plain
+		while True:
+			buf = self.__buf
+			end = plain.match(buf, self.__pos).end()
+			self.__pos = end
+			if end < len(buf):
+				self.__pos = end + 1
+				if buf[end] == self.__quote:
+					return
+				if len(self.read(1)) == 0:
+					break
+			elif not self.__fill():
+				break
+		raise ReaderException("Unterminated string")
+		
+	def __skip_nested(self, depth):
+	
+		nested = self.__nested
+		while depth > 0:
+			buf = self.__buf
+			end = nested.match(buf, self.__pos).end()
+			self.__pos = end
+			if end < len(buf):
+				c = buf[end]
+				self.__pos = end + 1
+				if c == self.__quote:
+					self.__skip_string()
+				elif c in self.__opening:
+					depth += 1
+				else:
+					depth -= 1
+			elif not self.__fill():
+				raise ReaderException("Unexpected end of input")
+				
+	def __decode_escape(self, m):
+	
+		high, low, unit, c = m.groups()
+		if high is not None:
+			code = 0x10000 + (int(high, 16) - 0xd800 << 10)
+			return chr(code + int(low, 16) - 0xdc00)
+		elif unit is not None:
+			return chr(int(unit, 16))
+		elif c in _escapes:
+			return _escapes[c]
+		elif len(c) == 0:
+			raise ReaderException("Unterminated string")
+		else:
+			raise ReaderException("Illegal escape '\\{}'".format(c))
+			
+	def __unescape(self):
+	
+		self.__ensure(12)
+		pos = self.__pos
+		text = self.__char(self.__buf[pos:pos + 12])
+		m = self.__escape.match(text)
+		self.__pos = pos + m.end()
+		return self.__decode_escape(m)
+		
+	@property
+	def offset(self):
+	
+		"""
+		Number of characters, or bytes, consumed from source.
+		"""
+		
+		return self.__base + self.__pos
+		
+	def read(self, count):
+	
+		"""
+		Read next *count* characters from source.
+		
+		:param int count:
+		   Number of characters to be read.
+		:rtype:
+		   string or bytes
+		:return:
+		   String containing read characters, or bytes for binary source.
+		"""
+		
+		parts = []
+		while count > 0:
+			if self.__pos >= len(self.__buf) and not self.__fill():
+				break
+			part = self.__buf[self.__pos:self.__pos + count]
+			self.__pos += len(part)
+			count -= len(part)
+			parts.append(part)
+		return self.__empty.join(parts)
+		
+	def peek_char(self):
+	
+		"""
+		Skip whitespace and return next character without consuming it.
+		
+		:rtype:
+		   string
+		:return:
+		   Next non whitespace character, or empty string at end of source.
+		"""
+		
+		while True:
+			m = self.__token.match(self.__buf, self.__pos)
+			if m is not None:
+				self.__pos = m.start(1)
+				return self.__char(m.group(1))
+			if not self.__fill():
+				return ""
+				
+	def next_char(self):
+	
+		"""
+		Skip whitespace and consume next character.
+		
+		:rtype:
+		   string
+		:return:
+		   Next non whitespace character, or empty string at end of source.
+		"""
+		
+		while True:
+			m = self.__token.match(self.__buf, self.__pos)
+			if m is not None:
+				self.__pos = m.end()
+				return self.__char(m.group(1))
+			if not self.__fill():
+				return ""
+				
+	def scan_number(self, first_c):
+	
+		"""
+		Consume the remaining characters of a number.
+		
+		:param string first_c:
+		   First character of the number, already consumed.
+		:rtype:
+		   string
+		:return:
+		   Number text.
+		:raise ReaderException:
+		   If number is not followed by a valid delimiter.
+		"""
+		
+		parts = []
+		while True:
+			buf = self.__buf
+			pos = self.__pos
+			end = self.__number.match(buf, pos).end()
+			parts.append(buf[pos:end])
+			self.__pos = end
+			if end < len(buf):
+				c = self.__char(buf[end:end + 1])
+				break
+			if not self.__fill():
+				c = ""
+				break
+		if not (c in ( "", ",", "]", "}" ) or c.isspace()):
+			raise ReaderException("Illegal character '{}'".format(c))
+		return first_c + self.__char(self.__empty.join(parts))
+		
+	def string_chunks(self):
+	
+		"""
+		Consume the remaining characters of a string, whose opening quote has
+		already been consumed.
+		
+		:yield:
+		   Decoded chunks of the string.
+		:raise ReaderException:
+		   If the string is not terminated.
+		"""
+		
+		if self.__binary:
+			decode = codecs.getincrementaldecoder("utf-8")().decode
+		else:
+			decode = None
+		plain = self.__plain
+		while True:
+			buf = self.__buf
+			pos = self.__pos
+			end = plain.match(buf, pos).end()
+			self.__pos = end
+			if end > pos:
+				yield buf[pos:end] if decode is None else decode(buf[pos:end])
+			if end < len(buf):
+				self.__pos = end + 1
+				if buf[end] == self.__quote:
+					if decode is not None:
+						decode(b"", True)
+					return
+				self.__pos = end
+				yield self.__unescape()
+			elif not self.__fill():
+				break
+		raise ReaderException("Unterminated string")
+		
+	def scan_string(self):
+	
+		"""
+		Consume the remaining characters of a string, whose opening quote has
+		already been consumed.
+		
+		:rtype:
+		   string
+		:return:
+		   Decoded string.
+		:raise ReaderException:
+		   If the string is not terminated.
+		"""
+		
+		buf = self.__buf
+		pos = self.__pos
+		end = self.__plain.match(buf, pos).end()
+		if end < len(buf) and buf[end] == self.__quote:
+			self.__pos = end + 1
+			if self.__binary:
+				return str(buf[pos:end], "utf-8")
+			return buf[pos:end]
+		m = self.__string.match(buf, pos)
+		if m is not None:
+			self.__pos = m.end()
+			text = buf[pos:m.end() - 1]
+			if self.__binary:
+				text = str(text, "utf-8")
+			return self.__escape.sub(self.__decode_escape, text)
+		return "".join(self.string_chunks())
+		
+	def number_runs(self):
+	
+		"""
+		Consume the remaining items of a list holding only numbers, up to its
+		closing bracket.
+		
+		:yield:
+		   Lists with the text of the next numbers.
+		:raise ReaderException:
+		   If some item is not a number.
+		"""
+		
+		numbers = self.__numbers
+		tail = ""
+		while True:
+			buf = self.__buf
+			pos = self.__pos
+			end = numbers.match(buf, pos).end()
+			self.__pos = end
+			text = tail + self.__char(buf[pos:end])
+			if end < len(buf):
+				c = self.__char(buf[end:end + 1])
+				self.__pos = end + 1
+				break
+			if not self.__fill():
+				c = ""
+				break
+			sep = text.rfind(",")
+			if sep >= 0:
+				yield text[:sep].split(",")
+				tail = text[sep + 1:]
+			else:
+				tail = text
+		if c != "]":
+			if len(c) == 0:
+				raise ReaderException("Unexpected end of input")
+			raise ReaderException("Illegal character '{}'".format(c))
+		if len(text) > 0 and not text.isspace():
+			yield text.split(",")
+			
+	def skip_value(self, first_c):
+	
+		"""
+		Consume the remaining characters of a value without decoding it.
+		
+		Only quotes, escapes and brackets are taken into account, so nested
+		values are not validated. For lists and dictionaries, it may be called
+		at any point between two items.
+		
+		:param string first_c:
+		   First character of the value, already consumed.
+		:raise ReaderException:
+		   If the value is not terminated.
+		"""
+		
+		if first_c == "\"":
+			self.__skip_string()
+		elif first_c in ( "[", "{" ):
+			self.__skip_nested(1)
+		else:
+			self.scan_number(first_c)
+			
+	def mark(self):
+	
+		"""
+		Mark the current position, so it can be restored by :meth:`rewind`.
+		
+		Characters consumed from the mark on are kept until :meth:`unmark`
+		or :meth:`rewind` are called, or another mark is set.
+		"""
+		
+		self.__mark = self.__base + self.__pos
+		self.__kept = []
+		self.__kept_base = self.__base
+		
+	def unmark(self):
+	
+		"""
+		Discard the mark, and the characters kept for it.
+		"""
+		
+		self.__mark = None
+		self.__kept = []
+		
+	def rewind(self):
+	
+		"""
+		Restore the marked position, and discard the mark.
+		
+		:raise ReaderException:
+		   If no position has been marked.
+		"""
+		
+		if self.__mark is None:
+			raise ReaderException("No position has been marked")
+		if len(self.__kept) > 0:
+			self.__kept.append(self.__buf)
+			self.__buf = self.__empty.join(self.__kept)
+			self.__base = self.__kept_base
+		self.__pos = self.__mark - self.__base
+		self.unmark()
+		
+	def read_line(self):
+	
+		"""
+		Consume the remaining characters of the current line, including its
+		line feed.
+		
+		:rtype:
+		   string or bytes
+		:return:
+		   Consumed characters, or bytes for binary source.
+		"""
+		
+		parts = []
+		while True:
+			buf = self.__buf
+			pos = self.__pos
+			end = self.__line.match(buf, pos).end()
+			if end < len(buf):
+				parts.append(buf[pos:end + 1])
+				self.__pos = end + 1
+				break
+			parts.append(buf[pos:end])
+			self.__pos = end
+			if not self.__fill():
+				break
+		return self.__empty.join(parts)
+		
+	def scan_escape(self):
+	
+		"""
+		Consume the remaining characters of a string escape sequence, whose
+		backslash has already been consumed.
+		
+		:rtype:
+		   string
+		:return:
+		   Decoded characters.
+		:raise ReaderException:
+		   If escape sequence is not valid.
+		"""
+		
+		self.__ensure(11)
+		pos = self.__pos
+		text = "\\" + self.__char(self.__buf[pos:pos + 11])
+		m = self.__escape.match(text)
+		self.__pos = pos + m.end() - 1
+		return self.__decode_escape(m)
+		
+	def scan_key(self):
+	
+		"""
+		Consume the remaining characters of a dictionary key, whose opening
+		quote has already been consumed, and the first character of its value.
+		
+		:rtype:
+		   tuple
+		:return:
+		   Decoded key and first character of its value.
+		:raise ReaderException:
+		   If key is not followed by a colon.
+		"""
+		
+		m = self.__key.match(self.__buf, self.__pos)
+		if m is not None:
+			self.__pos = m.end()
+			if self.__key_cache is not None:
+				key = self.__key_cache.intern(m.group(1))
+				return ( key, self.__char(m.group(2)) )
+			if self.__binary:
+				return ( str(m.group(1), "utf-8"), self.__char(m.group(2)) )
+			return m.groups()
+		key = self.scan_string()
+		if self.__key_cache is not None:
+			key = self.__key_cache.intern(key)
+		c = self.next_char()
+		if c != ":":
+			if len(c) == 0:
+				raise ReaderException("Unexpected end of input")
+			raise ReaderException("Illegal character '{}'".format(c))
+		return ( key, self.next_char() )
+		
 class Reader:
 
 	"""
@@ -43,20 +643,31 @@ class Reader:
 	It can be iterated in order to fetch its child :class:`Reader` items.
 	
 	:param src:
-	   JSON source.
+	   JSON source, :class:`Scanner` or parent :class:`Reader`.
 	"""
 	
 	def __init__(self, src):
 	
-		self.__src = src
-		
+		if isinstance(src, Reader):
+			self.__scanner = src.scanner
+		elif isinstance(src, Scanner):
+			self.__scanner = src
+		else:
+			self.__scanner = Scanner(src)
+			
 	def __iter__(self):
 	
-		c = self.read(1)
-		while len(c) > 0:
-			yield from self.next(c)
-			c = self.read(1)
-			
+		yield from ()
+		
+	@property
+	def scanner(self):
+	
+		"""
+		Scanner shared by this reader and its children.
+		"""
+		
+		return self.__scanner
+		
 	def isnumber(self):
 	
 		"""
@@ -122,75 +733,65 @@ class Reader:
 		   String containing read characters.
 		"""
 		
-		return self.__src.read(count)
+		return self.__scanner.read(count)
+		
+	def next(self, c):
+	
+		"""
+		Yield next item, if any, after reading the given character.
+		
+		It is kept for reading character by character, passing every
+		character given by :meth:`read` to this method. Iterating the reader
+		is much faster.
+		
+		:param string c:
+		   Read character.
+		:yield:
+		   Next item, if any.
+		"""
+		
+		yield from ()
+		
+	def skip(self):
+	
+		"""
+		Discard the rest of this value.
+		"""
+		
+		pass
 		
 class NumberReader(Reader):
 
 	"""
 	Reader for JSON numbers.
 	
+	It can be iterated in order to fetch its characters.
+	
 	:param src:
 	   JSON source.
 	:param string first_c:
 	   First character.
-	:param concluded_fn:
-	   Function called when number reading has been concluded.
 	"""
 	
-	def __init__(self, src, first_c, concluded_fn=None):
+	def __init__(self, src, first_c):
 	
 		super().__init__(src)
+		self.__parent = weakref.ref(src) if isinstance(src, Reader) else None
 		self.__first_c = first_c
-		if concluded_fn is None:
-			self.__concluded_fn = self.__concluded_pass
-		else:
-			self.__concluded_fn = concluded_fn
-		self.__read = self.__read_first
-		self.__next = self.__next_default
-		self.__dot_valid = True
-		
-	def __concluded_pass(self, c):
-	
-		pass
-		
-	def __read_first(self, count):
-	
-		self.__read = self.__read_default
-		result = io.StringIO()
-		result.write(self.__first_c)
-		if count > 1:
-			result.write(super().read(count - 1))
-		return result.getvalue()
-		
-	def __read_default(self, count):
-	
-		return super().read(count)
-		
-	def __read_concluded(self, count):
-	
-		return ""
+		self.__text = None
+		self.__concluded = False
 		
-	def __next_default(self, c):
+	def __iter__(self):
 	
-		if c.isspace() or c in ( ",", ")", "}" ):
-			self.__read = self.__read_concluded
-			self.__concluded_fn(c)
-			yield from ()
-		elif c.isdigit():
-			yield c
-		elif c == ".":
-			if self.__dot_valid:
-				self.__dot_valid = False
-				self.__value.write(c)
-				yield c
-			else:
-				self.__raise_illegal_char(c)
-		else:
-			self.__raise_illegal_char(c)
+		if not self.__concluded:
+			self.__concluded = True
+			yield from self.__scan()
 			
-	def __raise_illegal_char(self, c):
+	def __scan(self):
 	
-		raise ReaderException("Illegal character '{}'".format(c))
+		if self.__text is None:
+			self.__text = self.scanner.scan_number(self.__first_c)
+		return self.__text
 		
 	def isnumber(self):
 	
@@ -214,48 +815,79 @@ class NumberReader(Reader):
 		   The number value.
 		"""
 		
-		val_io = io.StringIO()
-		for c in self:
-			val_io.write(c)
-		val = val_io.getvalue()
-		num = eval(val)
-		if type(num) not in ( int, float ):
-			raise ReaderException("Not a number: '{}'".format(val))
-		return num
+		self.__concluded = True
+		return decode_number(self.__scan())
 		
 	def read(self, count):
 	
 		"""
-		Read next *count* characters from source.
+		Read next *count* characters from source, or nothing once this
+		number has been concluded.
 		
 		:param int count:
 		   Number of characters to be read.
 		:rtype:
-		   string
+		   string or bytes
 		:return:
-		   String containing read characters.
+		   String containing read characters, or bytes for binary source.
 		"""
 		
-		return self.__read(count)
+		if self.__concluded or count <= 0:
+			return ""
+		if self.__text is None:
+			self.__text = ""
+			text = super().read(count - 1)
+			if isinstance(text, bytes):
+				return self.__first_c.encode() + text
+			return self.__first_c + text
+		return super().read(count)
 		
 	def next(self, c):
 	
 		"""
 		Yield next item, if any, after reading the given character.
 		
+		Character concluding the number is passed to the parent reader.
+		
 		:param string c:
 		   Read character.
 		:yield:
 		   Next item, if any.
 		"""
 		
-		yield from self.__next(c)
+		if isinstance(c, bytes):
+			c = str(c, "latin-1")
+		if self.__concluded:
+			return
+		if self.__text is None:
+			self.__text = self.__first_c
+		if c.isdigit() or c in ( ".", "e", "E", "+", "-" ):
+			self.__text += c
+			yield c
+		elif len(c) == 0 or c.isspace() or c in ( ",", "]", "}" ):
+			self.__concluded = True
+			parent = None if self.__parent is None else self.__parent()
+			if parent is not None and len(c) > 0:
+				yield from parent.next(c)
+		else:
+			raise ReaderException("Illegal character '{}'".format(c))
+			
+	def skip(self):
+	
+		"""
+		Discard the rest of this number.
+		"""
+		
+		self.__concluded = True
+		self.__scan()
 		
 class StringReader(Reader):
 
 	"""
 	Reader for JSON strings.
 	
+	It can be iterated in order to fetch its characters.
+	
 	:param src:
 	   JSON source.
 	"""
@@ -263,33 +895,15 @@ class StringReader(Reader):
 	def __init__(self, src):
 	
 		super().__init__(src)
-		self.__read = self.__read_default
-		self.__next = self.__next_default
+		self.__concluded = False
 		
-	def __read_default(self, count):
-	
-		return super().read(count)
-		
-	def __read_concluded(self, count):
-	
-		return ""
-		
-	def __next_default(self, c):
+	def __iter__(self):
 	
-		if c == "\\":
-			self.__next = self.__next_backslash
-			yield from ()
-		elif c == "\"":
-			self.__read = self.__read_concluded
-			yield from ()
-		else:
-			yield c
+		if not self.__concluded:
+			for chunk in self.scanner.string_chunks():
+				yield from chunk
+			self.__concluded = True
 			
-	def __next_backslash(self, c):
-	
-		self.__next = self.__next_default
-		yield eval("\"\\{}\"".format(c))
-		
 	def isstr(self):
 	
 		"""
@@ -314,25 +928,28 @@ class StringReader(Reader):
 		   The string value.
 		"""
 		
-		val_io = io.StringIO()
-		for c in self:
-			val_io.write(c)
-		return val_io.getvalue()
+		if self.__concluded:
+			return ""
+		self.__concluded = True
+		return self.scanner.scan_string()
 		
 	def read(self, count):
 	
 		"""
-		Read next *count* characters from source.
+		Read next *count* characters from source, or nothing once this
+		string has been concluded.
 		
 		:param int count:
 		   Number of characters to be read.
 		:rtype:
-		   string
+		   string or bytes
 		:return:
-		   String containing read characters.
+		   String containing read characters, or bytes for binary source.
 		"""
 		
-		return self.__read(count)
+		if self.__concluded:
+			return ""
+		return super().read(count)
 		
 	def next(self, c):
 	
@@ -345,13 +962,37 @@ class StringReader(Reader):
 		   Next item, if any.
 		"""
 		
-		yield from self.__next(c)
+		if self.__concluded:
+			return
+		if c in ( "\"", b"\"" ):
+			self.__concluded = True
+		elif c == "\\":
+			yield self.scanner.scan_escape()
+		elif c == b"\\":
+			yield self.scanner.scan_escape().encode("utf-8", "surrogatepass")
+		elif len(c) == 0:
+			raise ReaderException("Unterminated string")
+		else:
+			yield c
+			
+	def skip(self):
+	
+		"""
+		Discard the rest of this string.
+		"""
+		
+		if not self.__concluded:
+			self.__concluded = True
+			self.scanner.skip_value("\"")
 		
 class ListReader(Reader):
 
 	"""
 	Reader for JSON lists.
 	
+	Child readers not consumed by the caller are skipped before fetching the
+	next one, as if :meth:`Reader.skip` had been called.
+	
 	:param src:
 	   JSON source.
 	"""
@@ -359,56 +1000,34 @@ class ListReader(Reader):
 	def __init__(self, src):
 	
 		super().__init__(src)
-		self.__read = self.__read_default
-		self.__next = self.__next_value
-		
-	def __read_default(self, count):
-	
-		return super().read(count)
-		
-	def __read_concluded(self, count):
-	
-		return ""
+		self.__concluded = False
+		self.__sep = False
+		self.__child = None
 		
-	def __value_concluded(self, c):
+	def __iter__(self):
 	
-		if not c.isspace():
-			if c == ",":
-				self.__next = self.__next_value
-			elif c == "]":
-				self.__read = self.__read_concluded
+		scanner = self.scanner
+		while not self.__concluded:
+			if self.__child is not None:
+				self.__child.skip()
+				self.__child = None
+			c = scanner.next_char()
+			if c == "]":
+				self.__concluded = True
+			elif self.__sep:
+				if c == ",":
+					self.__sep = False
+				else:
+					self.__raise_illegal_char(c)
 			else:
-				self.__raise_illegal_char(c)
+				self.__child = value_reader(self, c)
+				self.__sep = True
+				yield self.__child
 				
-	def __next_value(self, c):
-	
-		if c.isspace():
-			yield from ()
-		elif c == "]":
-			self.__read = self.__read_concluded
-			yield from ()
-		elif c.isdigit() or c in ( "+", "-", "." ):
-			self.__next = self.__next_value_ended
-			yield NumberReader(self, c, self.__value_concluded)
-		elif c == "\"":
-			self.__next = self.__next_value_ended
-			yield StringReader(self)
-		elif c == "[":
-			self.__next = self.__next_value_ended
-			yield ListReader(self)
-		elif c == "{":
-			self.__next = self.__next_value_ended
-			yield DictionaryReader(self)
-		else:
-			self.__raise_illegal_char(c)
-			
-	def __next_value_ended(self, c):
-	
-		self.__value_concluded(c)
-		yield from ()
-		
 	def __raise_illegal_char(self, c):
 	
+		if len(c) == 0:
+			raise ReaderException("Unexpected end of input")
 		raise ReaderException("Illegal character '{}'".format(c))
 		
 	def islist(self):
@@ -443,17 +1062,20 @@ class ListReader(Reader):
 	def read(self, count):
 	
 		"""
-		Read next *count* characters from source.
+		Read next *count* characters from source, or nothing once this
+		list has been concluded.
 		
 		:param int count:
 		   Number of characters to be read.
 		:rtype:
-		   string
+		   string or bytes
 		:return:
-		   String containing read characters.
+		   String containing read characters, or bytes for binary source.
 		"""
 		
-		return self.__read(count)
+		if self.__concluded:
+			return ""
+		return super().read(count)
 		
 	def next(self, c):
 	
@@ -466,13 +1088,94 @@ class ListReader(Reader):
 		   Next item, if any.
 		"""
 		
-		yield from self.__next(c)
-		
-class DictionaryReader(Reader):
+		if isinstance(c, bytes):
+			c = str(c, "latin-1")
+		if self.__concluded or c.isspace():
+			return
+		if c == "]":
+			self.__concluded = True
+		elif self.__sep:
+			if c == ",":
+				self.__sep = False
+			else:
+				self.__raise_illegal_char(c)
+		else:
+			self.__sep = True
+			yield value_reader(self, c)
+			
+	def value_array(self, typecode="d", ndarray=False):
+	
+		"""
+		List value, for lists holding only numbers.
+		
+		Numbers are decoded straight into a compact buffer, without creating
+		a reader for every item.
+		
+		:param string typecode:
+		   Type code of the items, as used by :mod:`array`.
+		:param bool ndarray:
+		   Return a NumPy array instead of an :class:`array.array`.
+		:rtype:
+		   array.array or numpy.ndarray
+		:return:
+		   The list value.
+		:raise ReaderException:
+		   If some item is not a number of the given type.
+		:raise ImportError:
+		   If a NumPy array is requested but NumPy is not available.
+		"""
+		
+		if ndarray and numpy is None:
+			raise ImportError("NumPy is not available")
+		val = array.array(typecode)
+		convert = float if typecode in ( "f", "d" ) else int
+		if self.__child is not None:
+			self.__child.skip()
+			self.__child = None
+		if not self.__concluded:
+			self.__concluded = True
+			if self.__sep:
+				c = self.scanner.next_char()
+				if c != ",":
+					if c == "]":
+						return self.__array(val, ndarray)
+					self.__raise_illegal_char(c)
+			try:
+				for texts in self.scanner.number_runs():
+					val.extend(map(convert, texts))
+			except ( ValueError, OverflowError ) as e:
+				raise ReaderException("Not a number list: {}".format(e))
+		return self.__array(val, ndarray)
+		
+	def __array(self, val, ndarray):
+	
+		if ndarray:
+			return numpy.frombuffer(val, dtype=val.typecode)
+		return val
+		
+	def skip(self):
+	
+		"""
+		Discard the rest of this list.
+		"""
+		
+		if not self.__concluded:
+			if self.__child is not None:
+				self.__child.skip()
+				self.__child = None
+			self.scanner.skip_value("[")
+			self.__concluded = True
+		
+class DictionaryReader(Reader):
 
 	"""
 	Reader for JSON dictionaries.
 	
+	Child readers not consumed by the caller are skipped before fetching the
+	next one, as if :meth:`Reader.skip` had been called.
+	
+	Keys are interned when the scanner has been given a :class:`KeyCache`.
+	
 	:param src:
 	   JSON source.
 	"""
@@ -480,98 +1183,591 @@ class DictionaryReader(Reader):
 	def __init__(self, src):
 	
 		super().__init__(src)
-		self.__read = self.__read_default
-		self.__next = self.__next_key
-		self.__key = None
+		self.__concluded = False
+		self.__sep = False
+		self.__child = None
 		
-	def __read_default(self, count):
+	def __iter__(self):
 	
-		return super().read(count)
+		scanner = self.scanner
+		while not self.__concluded:
+			if self.__child is not None:
+				self.__child.skip()
+				self.__child = None
+			c = scanner.next_char()
+			if c == "}":
+				self.__concluded = True
+			elif self.__sep:
+				if c == ",":
+					self.__sep = False
+				else:
+					self.__raise_illegal_char(c)
+			elif c == "\"":
+				key, c = scanner.scan_key()
+				self.__child = value_reader(self, c)
+				self.__sep = True
+				yield ( key, self.__child )
+			else:
+				self.__raise_illegal_char(c)
+				
+	def __raise_illegal_char(self, c):
+	
+		if len(c) == 0:
+			raise ReaderException("Unexpected end of input")
+		raise ReaderException("Illegal character '{}'".format(c))
 		
-	def __read_concluded(self, count):
+	def isdict(self):
 	
-		return ""
+		"""
+		Determines if it is a dictionary reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True because it is a dictionary reader.
+		"""
 		
-	def __value_concluded(self, c):
+		return True
+		
+	def value(self):
 	
-		if not c.isspace():
+		"""
+		Dictionary value.
+		
+		:rtype:
+		   dict
+		:return:
+		   The dictionary value.
+		"""
+		
+		val = {}
+		for r_k, r_v in self:
+			val[r_k] = r_v.value()
+		return val
+		
+	def read(self, count):
+	
+		"""
+		Read next *count* characters from source, or nothing once this
+		dictionary has been concluded.
+		
+		:param int count:
+		   Number of characters to be read.
+		:rtype:
+		   string or bytes
+		:return:
+		   String containing read characters, or bytes for binary source.
+		"""
+		
+		if self.__concluded:
+			return ""
+		return super().read(count)
+		
+	def next(self, c):
+	
+		"""
+		Yield next item, if any, after reading the given character.
+		
+		:param string c:
+		   Read character.
+		:yield:
+		   Next item, if any.
+		"""
+		
+		if isinstance(c, bytes):
+			c = str(c, "latin-1")
+		if self.__concluded or c.isspace():
+			return
+		if c == "}":
+			self.__concluded = True
+		elif self.__sep:
 			if c == ",":
-				self.__next = self.__next_key
-			elif c == "}":
-				self.__read = self.__read_concluded
+				self.__sep = False
 			else:
 				self.__raise_illegal_char(c)
-				
-	def __next_key(self, c):
-	
-		if c.isspace():
-			yield from ()
 		elif c == "\"":
-			self.__next = self.__next_key_value
-			self.__key = io.StringIO()
-			yield from ()
-		elif c == "}":
-			self.__read = self.__read_concluded
-			yield from ()
+			key, c = self.scanner.scan_key()
+			self.__sep = True
+			yield ( key, value_reader(self, c) )
 		else:
 			self.__raise_illegal_char(c)
 			
-	def __next_key_value(self, c):
+	def skip(self):
 	
-		if c == "\\":
-			self.__next = self.__next_key_value_backslash
-		elif c == "\"":
-			self.__next = self.__next_key_ended
-		else:
-			self.__key.write(c)
-		yield from ()
+		"""
+		Discard the rest of this dictionary.
+		"""
+		
+		if not self.__concluded:
+			if self.__child is not None:
+				self.__child.skip()
+				self.__child = None
+			self.scanner.skip_value("{")
+			self.__concluded = True
+		
+class AsyncScanner:
+
+	"""
+	Buffered scanner for asynchronous JSON source.
+	
+	Received data is scanned by a single :class:`Scanner` without blocking.
+	When it runs out of data in the middle of a token, or of a whole string
+	or number, it goes back to the start of it and scans it again once more
+	data has been awaited from the source. Awaited data is doubled on every
+	retry, so long values are scanned again only a few times.
+	
+	:param stream:
+	   Asynchronous JSON source, with a ``read`` coroutine like
+	   :class:`asyncio.StreamReader`.
+	:param int size:
+	   Number of bytes awaited from source at once.
+	"""
+	
+	def __init__(self, stream, size=65536):
+	
+		self.__stream = stream
+		self.__size = size
+		self.__chunks = collections.deque()
+		self.__starved = False
+		self.__eof = False
+		self.__scanner = Scanner(types.SimpleNamespace(read=self.__take), size)
+		
+	def __take(self, size):
+	
+		if len(self.__chunks) == 0:
+			self.__starved = True
+			return b""
+		return self.__chunks.popleft()
+		
+	async def __more(self, count):
+	
+		received = 0
+		while received < count and not self.__eof:
+			data = await self.__stream.read(self.__size)
+			if len(data) == 0:
+				self.__eof = True
+				break
+			if isinstance(data, str):
+				data = data.encode("utf-8")
+			self.__chunks.append(data)
+			received += len(data)
+			if len(data) < self.__size:
+				break
+				
+	async def __scan(self, scan_fn):
+	
+		scanner = self.__scanner
+		count = self.__size
+		while True:
+			self.__starved = False
+			scanner.mark()
+			try:
+				result, complete = scan_fn(scanner)
+			except ReaderException:
+				if self.__eof or not self.__starved:
+					raise
+				complete = False
+			if complete or self.__eof:
+				scanner.unmark()
+				return result
+			scanner.rewind()
+			await self.__more(count)
+			count *= 2
 			
-	def __next_key_value_backslash(self, c):
+	def __scan_peek(self, scanner):
 	
-		self.__next = self.__next_key_value
-		self.__key.write(eval("\"\\{}\"".format(c)))
-		yield from ()
+		c = scanner.peek_char()
+		return ( c, len(c) > 0 )
 		
-	def __next_key_ended(self, c):
+	def __scan_next(self, scanner):
 	
-		if c.isspace():
-			yield from ()
-		elif c == ":":
-			self.__next = self.__next_value
-			yield from ()
-		else:
-			self.__raise_illegal_char(c)
-			
-	def __next_value(self, c):
+		c = scanner.next_char()
+		return ( c, len(c) > 0 )
+		
+	def __scan_key(self, scanner):
 	
-		if c.isspace():
-			yield from ()
-		elif c.isdigit() or c in ( "+", "-", "." ):
-			self.__next = self.__next_value_ended
-			key = self.__key.getvalue()
-			yield ( key, NumberReader(self, c, self.__value_concluded) )
-		elif c == "\"":
-			self.__next = self.__next_value_ended
-			key = self.__key.getvalue()
-			yield ( key, StringReader(self) )
-		elif c == "[":
-			self.__next = self.__next_value_ended
-			key = self.__key.getvalue()
-			yield ( key, ListReader(self) )
+		key = scanner.scan_string()
+		c = scanner.next_char()
+		if c != ":":
+			if len(c) == 0:
+				raise ReaderException("Unexpected end of input")
+			raise ReaderException("Illegal character '{}'".format(c))
+		return ( key, True )
+		
+	def __scan_value(self, scanner):
+	
+		c = scanner.next_char()
+		value = value_reader(scanner, c).value()
+		return ( value, c == "\"" or not self.__starved )
+		
+	def __scan_skip(self, scanner, first_c):
+	
+		scanner.skip_value(first_c)
+		return ( None, True )
+		
+	async def peek_char(self):
+	
+		"""
+		Skip whitespace and return next character without consuming it.
+		
+		:rtype:
+		   string
+		:return:
+		   Next non whitespace character, or empty string at end of source.
+		"""
+		
+		c = self.__scanner.peek_char()
+		if len(c) > 0 or self.__eof:
+			return c
+		return await self.__scan(self.__scan_peek)
+		
+	async def next_char(self):
+	
+		"""
+		Skip whitespace and consume next character.
+		
+		:rtype:
+		   string
+		:return:
+		   Next non whitespace character, or empty string at end of source.
+		"""
+		
+		c = self.__scanner.next_char()
+		if len(c) > 0 or self.__eof:
+			return c
+		return await self.__scan(self.__scan_next)
+		
+	async def scan_key(self):
+	
+		"""
+		Consume the remaining characters of a dictionary key, whose opening
+		quote has already been consumed, and its colon.
+		
+		:rtype:
+		   string
+		:return:
+		   Decoded key.
+		:raise ReaderException:
+		   If key is not followed by a colon.
+		"""
+		
+		return await self.__scan(self.__scan_key)
+		
+	async def skip_value(self, first_c):
+	
+		"""
+		Consume the remaining characters of a value without decoding it.
+		
+		:param string first_c:
+		   First character of the value, already consumed.
+		:raise ReaderException:
+		   If the value is not terminated.
+		"""
+		
+		await self.__scan(functools.partial(self.__scan_skip, first_c=first_c))
+		
+	async def next_reader(self):
+	
+		"""
+		Reader for the next value.
+		
+		Lists and dictionaries are read asynchronously item by item, while
+		numbers and strings are awaited as a whole.
+		
+		:rtype:
+		   AsyncReader
+		:return:
+		   Asynchronous JSON reader.
+		:raise ReaderException:
+		   If some error has been ocurred at reading.
+		"""
+		
+		c = await self.peek_char()
+		if c == "[":
+			await self.next_char()
+			return AsyncListReader(self)
 		elif c == "{":
-			self.__next = self.__next_value_ended
-			key = self.__key.getvalue()
-			yield ( key, DictionaryReader(self) )
+			await self.next_char()
+			return AsyncDictionaryReader(self)
 		else:
-			self.__raise_illegal_char(c)
+			value = await self.__scan(self.__scan_value)
+			return AsyncValueReader(self, value)
 			
-	def __next_value_ended(self, c):
+class AsyncReader:
+
+	"""
+	Abstract reader for asynchronous JSON source.
 	
-		self.__value_concluded(c)
-		yield from ()
+	:param AsyncScanner scanner:
+	   Scanner shared by this reader and its children.
+	"""
+	
+	def __init__(self, scanner):
+	
+		self.__scanner = scanner
+		
+	@property
+	def scanner(self):
+	
+		"""
+		Scanner shared by this reader and its children.
+		"""
+		
+		return self.__scanner
+		
+	def isnumber(self):
+	
+		"""
+		Determines if it is a number reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if it is a number reader. False otherwise.
+		"""
+		
+		return False
+		
+	def isstr(self):
+	
+		"""
+		Determines if it is an string reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if it is an string reader. False otherwise.
+		"""
+		
+		return False
+		
+	def islist(self):
+	
+		"""
+		Determines if it is a list reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if it is a list reader. False otherwise.
+		"""
+		
+		return False
+		
+	def isdict(self):
+	
+		"""
+		Determines if it is a dictionary reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if it is a dictionary reader. False otherwise.
+		"""
 		
+		return False
+		
+	async def skip(self):
+	
+		"""
+		Discard the rest of this value.
+		"""
+		
+		pass
+		
+class AsyncValueReader(AsyncReader):
+
+	"""
+	Reader for numbers and strings of asynchronous JSON source, whose text
+	has already been received and decoded as a whole.
+	
+	:param AsyncScanner scanner:
+	   Scanner shared by this reader and its parent.
+	:param value:
+	   Decoded number or string.
+	"""
+	
+	def __init__(self, scanner, value):
+	
+		super().__init__(scanner)
+		self.__value = value
+		
+	def isnumber(self):
+	
+		"""
+		Determines if it is a number reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if it is a number reader. False otherwise.
+		"""
+		
+		return type(self.__value) in ( int, float )
+		
+	def isstr(self):
+	
+		"""
+		Determines if it is an string reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True if it is an string reader. False otherwise.
+		"""
+		
+		return type(self.__value) == str
+		
+	async def value(self):
+	
+		"""
+		Number or string value.
+		
+		:return:
+		   The value.
+		"""
+		
+		return self.__value
+		
+class AsyncListReader(AsyncReader):
+
+	"""
+	Reader for lists of asynchronous JSON source.
+	
+	It can be iterated with ``async for`` in order to fetch its child
+	:class:`AsyncReader` items. Child readers not consumed by the caller are
+	skipped before fetching the next one.
+	
+	:param AsyncScanner scanner:
+	   Scanner shared by this reader and its children.
+	"""
+	
+	def __init__(self, scanner):
+	
+		super().__init__(scanner)
+		self.__concluded = False
+		self.__sep = False
+		self.__child = None
+		
+	async def __aiter__(self):
+	
+		scanner = self.scanner
+		while not self.__concluded:
+			if self.__child is not None:
+				await self.__child.skip()
+				self.__child = None
+			c = await scanner.peek_char()
+			if c == "]":
+				await scanner.next_char()
+				self.__concluded = True
+			elif self.__sep:
+				if c == ",":
+					await scanner.next_char()
+					self.__sep = False
+				else:
+					self.__raise_illegal_char(c)
+			elif len(c) == 0:
+				self.__raise_illegal_char(c)
+			else:
+				self.__child = await scanner.next_reader()
+				self.__sep = True
+				yield self.__child
+				
+	def __raise_illegal_char(self, c):
+	
+		if len(c) == 0:
+			raise ReaderException("Unexpected end of input")
+		raise ReaderException("Illegal character '{}'".format(c))
+		
+	def islist(self):
+	
+		"""
+		Determines if it is a list reader.
+		
+		:rtype:
+		   bool
+		:return:
+		   True because it is a list reader.
+		"""
+		
+		return True
+		
+	async def value(self):
+	
+		"""
+		List value.
+		
+		:rtype:
+		   list
+		:return:
+		   The list value.
+		"""
+		
+		val = []
+		async for r in self:
+			val.append(await r.value())
+		return val
+		
+	async def skip(self):
+	
+		"""
+		Discard the rest of this list.
+		"""
+		
+		if not self.__concluded:
+			if self.__child is not None:
+				await self.__child.skip()
+				self.__child = None
+			await self.scanner.skip_value("[")
+			self.__concluded = True
+			
+class AsyncDictionaryReader(AsyncReader):
+
+	"""
+	Reader for dictionaries of asynchronous JSON source.
+	
+	It can be iterated with ``async for`` in order to fetch its child
+	:class:`AsyncReader` items along with their keys. Child readers not
+	consumed by the caller are skipped before fetching the next one.
+	
+	:param AsyncScanner scanner:
+	   Scanner shared by this reader and its children.
+	"""
+	
+	def __init__(self, scanner):
+	
+		super().__init__(scanner)
+		self.__concluded = False
+		self.__sep = False
+		self.__child = None
+		
+	async def __aiter__(self):
+	
+		scanner = self.scanner
+		while not self.__concluded:
+			if self.__child is not None:
+				await self.__child.skip()
+				self.__child = None
+			c = await scanner.next_char()
+			if c == "}":
+				self.__concluded = True
+			elif self.__sep:
+				if c == ",":
+					self.__sep = False
+				else:
+					self.__raise_illegal_char(c)
+			elif c == "\"":
+				key = await scanner.scan_key()
+				self.__child = await scanner.next_reader()
+				self.__sep = True
+				yield ( key, self.__child )
+			else:
+				self.__raise_illegal_char(c)
+				
 	def __raise_illegal_char(self, c):
 	
+		if len(c) == 0:
+			raise ReaderException("Unexpected end of input")
 		raise ReaderException("Illegal character '{}'".format(c))
 		
 	def isdict(self):
@@ -587,7 +1783,7 @@ class DictionaryReader(Reader):
 		
 		return True
 		
-	def value(self):
+	async def value(self):
 	
 		"""
 		Dictionary value.
@@ -599,73 +1795,641 @@ class DictionaryReader(Reader):
 		"""
 		
 		val = {}
-		for r_k, r_v in self:
-			val[r_k] = r_v.value()
+		async for r_k, r_v in self:
+			val[r_k] = await r_v.value()
 		return val
 		
-	def read(self, count):
+	async def skip(self):
 	
 		"""
-		Read next *count* characters from source.
+		Discard the rest of this dictionary.
+		"""
+		
+		if not self.__concluded:
+			if self.__child is not None:
+				await self.__child.skip()
+				self.__child = None
+			await self.scanner.skip_value("{")
+			self.__concluded = True
+			
+class FeedParser:
+
+	"""
+	Push parser for JSON source arriving in chunks.
+	
+	Chunks are given to :meth:`feed` as they arrive and parsed at once, and
+	the resulting events are taken by :meth:`events`. Parsing resumes where
+	the previous chunk stopped, even inside a string, a number or an escape
+	sequence, so the whole source is never buffered and nothing waits for
+	more data.
+	
+	Events are the same as those of :func:`events`. Successive values, such
+	as newline delimited JSON, are accepted. As with :func:`events`,
+	trailing commas are rejected, unlike :func:`read`.
+	
+	Parsing state is kept in a few attributes: the current state, the stack
+	of closing characters of open containers and the pending text of an
+	unfinished string or number. After a :class:`ReaderException` has been
+	raised, the parser may not be used anymore.
+	"""
+	
+	__VALUE = 0
+	__FIRST_ITEM = 1
+	__FIRST_KEY = 2
+	__KEY = 3
+	__COLON = 4
+	__NEXT = 5
+	__STRING = 6
+	__ESCAPE = 7
+	__UNICODE = 8
+	__NUMBER = 9
+	
+	__token = re.compile(_token_source)
+	__plain = re.compile(_plain_source)
+	__number = re.compile(_number_source)
+	__unit = re.compile(r"[0-9a-fA-F]{4}")
+	
+	def __init__(self):
+	
+		self.__decoder = codecs.getincrementaldecoder("utf-8")()
+		self.__state = self.__VALUE
+		self.__stack = []
+		self.__parts = []
+		self.__key = False
+		self.__surrogates = False
+		self.__events = []
+		
+	def __raise_illegal_char(self, c):
+	
+		raise ReaderException("Illegal character '{}'".format(c))
+		
+	def __conclude_string(self):
+	
+		text = "".join(self.__parts)
+		self.__parts.clear()
+		if self.__surrogates:
+			text = text.encode("utf-16-le", "surrogatepass").decode(
+				"utf-16-le",
+				"surrogatepass"
+			)
+			self.__surrogates = False
+		if self.__key:
+			self.__events.append(( "map_key", text ))
+			return self.__COLON
+		self.__events.append(( "string", text ))
+		return self.__NEXT
+		
+	def __conclude_number(self):
+	
+		text = "".join(self.__parts)
+		self.__parts.clear()
+		self.__events.append(( "number", decode_number(text) ))
+		return self.__NEXT
+		
+	def feed(self, chunk):
+	
+		"""
+		Parse the next chunk of source.
+		
+		:param chunk:
+		   JSON text, or UTF-8 encoded bytes-like object. Multibyte
+		   characters may be split between chunks.
+		:raise ReaderException:
+		   If some error has been ocurred at parsing.
+		"""
+		
+		if not isinstance(chunk, str):
+			try:
+				chunk = self.__decoder.decode(chunk)
+			except UnicodeDecodeError as e:
+				raise ReaderException(str(e))
+		state = self.__state
+		stack = self.__stack
+		parts = self.__parts
+		events = self.__events
+		pos = 0
+		end = len(chunk)
+		while pos < end:
+			if state == self.__STRING:
+				run_end = self.__plain.match(chunk, pos).end()
+				if run_end > pos:
+					parts.append(chunk[pos:run_end])
+				pos = run_end
+				if pos < end:
+					if chunk[pos] == "\"":
+						state = self.__conclude_string()
+					else:
+						state = self.__ESCAPE
+					pos += 1
+			elif state == self.__ESCAPE:
+				c = chunk[pos]
+				pos += 1
+				if c == "u":
+					parts.append("\\u")
+					state = self.__UNICODE
+				elif c in _escapes:
+					parts.append(_escapes[c])
+					state = self.__STRING
+				else:
+					raise ReaderException("Illegal escape '\\{}'".format(c))
+			elif state == self.__UNICODE:
+				unit = parts.pop()
+				count = 6 - len(unit)
+				unit += chunk[pos:pos + count]
+				pos += count
+				if len(unit) < 6:
+					parts.append(unit)
+				elif self.__unit.fullmatch(unit, 2) is None:
+					raise ReaderException("Illegal escape '{}'".format(unit))
+				else:
+					code = int(unit[2:], 16)
+					if 0xd800 <= code < 0xe000:
+						self.__surrogates = True
+					parts.append(chr(code))
+					state = self.__STRING
+			elif state == self.__NUMBER:
+				run_end = self.__number.match(chunk, pos).end()
+				parts.append(chunk[pos:run_end])
+				pos = run_end
+				if pos < end:
+					c = chunk[pos]
+					if not (c in ( ",", "]", "}" ) or c.isspace()):
+						self.__raise_illegal_char(c)
+					state = self.__conclude_number()
+			else:
+				m = self.__token.match(chunk, pos)
+				if m is None:
+					break
+				c = m.group(1)
+				pos = m.end()
+				if state == self.__NEXT:
+					if len(stack) == 0:
+						state = self.__VALUE
+					elif c == ",":
+						state = self.__KEY if stack[-1] == "}" else self.__VALUE
+						continue
+					elif c == stack[-1]:
+						stack.pop()
+						if c == "}":
+							events.append(_end_map_event)
+						else:
+							events.append(_end_array_event)
+						continue
+					else:
+						self.__raise_illegal_char(c)
+				elif state == self.__COLON:
+					if c != ":":
+						self.__raise_illegal_char(c)
+					state = self.__VALUE
+					continue
+				elif state == self.__FIRST_KEY or state == self.__KEY:
+					if c == "\"":
+						self.__key = True
+						state = self.__STRING
+					elif c == "}" and state == self.__FIRST_KEY:
+						stack.pop()
+						events.append(_end_map_event)
+						state = self.__NEXT
+					else:
+						self.__raise_illegal_char(c)
+					continue
+				elif state == self.__FIRST_ITEM and c == "]":
+					stack.pop()
+					events.append(_end_array_event)
+					state = self.__NEXT
+					continue
+				if c == "\"":
+					self.__key = False
+					state = self.__STRING
+				elif c == "{":
+					events.append(_start_map_event)
+					stack.append("}")
+					state = self.__FIRST_KEY
+				elif c == "[":
+					events.append(_start_array_event)
+					stack.append("]")
+					state = self.__FIRST_ITEM
+				elif c.isdigit() or c in ( "+", "-", "." ):
+					parts.append(c)
+					state = self.__NUMBER
+				else:
+					self.__raise_illegal_char(c)
+		self.__state = state
+		
+	def events(self):
+	
+		"""
+		Take the events of the chunks parsed so far.
 		
-		:param int count:
-		   Number of characters to be read.
 		:rtype:
-		   string
+		   list
 		:return:
-		   String containing read characters.
+		   Event tuples, in order, which have not been taken before.
 		"""
 		
-		return self.__read(count)
+		events = self.__events
+		self.__events = []
+		return events
 		
-	def next(self, c):
+	def close(self):
 	
 		"""
-		Yield next item, if any, after reading the given character.
+		Conclude parsing at the end of source.
 		
-		:param string c:
-		   Read character.
-		:yield:
-		   Next item, if any.
+		A number at the end of source is concluded, since no delimiter can
+		follow it anymore.
+		
+		:raise ReaderException:
+		   If source ends in the middle of a value.
+		"""
+		
+		try:
+			self.feed(self.__decoder.decode(b"", True))
+		except UnicodeDecodeError as e:
+			raise ReaderException(str(e))
+		if self.__state == self.__NUMBER and len(self.__stack) == 0:
+			self.__state = self.__conclude_number()
+		if len(self.__stack) > 0 or self.__state not in (
+			self.__VALUE,
+			self.__NEXT
+		):
+			raise ReaderException("Unexpected end of input")
+			
+class Index:
+
+	"""
+	Random access index of a JSON document.
+	
+	Offsets of every dictionary value and list item are recorded in one pass
+	down to the given depth, so a value can be decoded later without parsing
+	anything else. Deeper values are found by scanning only the span of their
+	deepest indexed ancestor.
+	
+	:param buf:
+	   Bytes-like object holding the JSON document, such as
+	   :class:`mmap.mmap`.
+	:param int depth:
+	   Maximum depth of indexed values, or None for no limit.
+	:raise ReaderException:
+	   If some error has been ocurred at reading.
+	"""
+	
+	def __init__(self, buf, depth=None):
+	
+		self.__buf = buf
+		reader = read(buf)
+		if reader is None:
+			raise ReaderException("Unexpected end of input")
+		self.__root = self.__node(reader, depth)
+		
+	def __node(self, reader, depth):
+	
+		scanner = reader.scanner
+		start = scanner.offset - 1
+		next_depth = None if depth is None else depth - 1
+		if depth != 0 and reader.isdict():
+			children = {}
+			for r_k, r_v in reader:
+				children[r_k] = self.__node(r_v, next_depth)
+		elif depth != 0 and reader.islist():
+			children = []
+			for r in reader:
+				children.append(self.__node(r, next_depth))
+		else:
+			children = None
+			reader.skip()
+		return ( start, scanner.offset, children )
+		
+	def __raise_missing(self, path):
+	
+		raise KeyError("Missing path {}".format(list(path)))
+		
+	def span(self, *path):
+	
+		"""
+		Span of the deepest indexed value along the given path.
+		
+		:param path:
+		   Dictionary keys and list indexes.
+		:rtype:
+		   tuple
+		:return:
+		   Start and end offsets of the value, and the path elements below it
+		   that are not indexed.
+		:raise KeyError:
+		   If path does not exist.
+		"""
+		
+		start, end, children = self.__root
+		for i, key in enumerate(path):
+			if children is None:
+				return ( start, end, path[i:] )
+			try:
+				start, end, children = children[key]
+			except ( KeyError, IndexError, TypeError ):
+				self.__raise_missing(path)
+		return ( start, end, () )
+		
+	def reader(self, *path):
+	
+		"""
+		Reader for the value at the given path.
+		
+		It reads from a view of the indexed buffer, so the buffer must not be
+		closed while the reader is in use.
+		
+		:param path:
+		   Dictionary keys and list indexes.
+		:rtype:
+		   Reader
+		:return:
+		   JSON reader.
+		:raise KeyError:
+		   If path does not exist.
+		"""
+		
+		start, end, rest = self.span(*path)
+		reader = read(memoryview(self.__buf)[start:end])
+		for key in rest:
+			if reader.isdict():
+				found = next(( r_v for r_k, r_v in reader if r_k == key ), None)
+			elif reader.islist() and type(key) == int:
+				found = next(( r for r_i, r in enumerate(reader) if r_i == key ), None)
+			else:
+				found = None
+			if found is None:
+				self.__raise_missing(path)
+			reader = found
+		return reader
+		
+	def get(self, *path):
+	
+		"""
+		Value at the given path.
+		
+		:param path:
+		   Dictionary keys and list indexes.
+		:return:
+		   The value.
+		:raise KeyError:
+		   If path does not exist.
+		"""
+		
+		return self.reader(*path).value()
+		
+	def close(self):
+	
+		"""
+		Close the indexed buffer, if it is a memory map.
+		"""
+		
+		if isinstance(self.__buf, mmap.mmap):
+			self.__buf.close()
+			
+class LazyMapping(collections.abc.Mapping):
+
+	"""
+	Read-only mapping for a JSON dictionary, whose values are decoded on
+	first access.
+	
+	Keys and spans of values are recorded by a structural scan that skips
+	the values themselves, when some key is first requested. Every value is
+	decoded when first accessed and cached, so nested dictionaries and
+	lists become lazy too.
+	
+	:param buf:
+	   Bytes-like object holding the JSON document.
+	:param int start:
+	   Offset of the opening brace.
+	:param int end:
+	   Offset after the closing brace.
+	"""
+	
+	def __init__(self, buf, start, end):
+	
+		self.__buf = buf
+		self.__start = start
+		self.__end = end
+		self.__spans = None
+		self.__values = {}
+		
+	def __scan(self):
+	
+		if self.__spans is None:
+			self.__spans = {}
+			start = self.__start
+			reader = read(memoryview(self.__buf)[start:self.__end])
+			scanner = reader.scanner
+			for r_k, r_v in reader:
+				child_start = start + scanner.offset - 1
+				r_v.skip()
+				self.__spans[r_k] = ( child_start, start + scanner.offset )
+		return self.__spans
+		
+	def __getitem__(self, key):
+	
+		if key in self.__values:
+			return self.__values[key]
+		start, end = self.__scan()[key]
+		val = lazy_value(self.__buf, start, end)
+		self.__values[key] = val
+		return val
+		
+	def __iter__(self):
+	
+		return iter(self.__scan())
+		
+	def __len__(self):
+	
+		return len(self.__scan())
+		
+	def __contains__(self, key):
+	
+		return key in self.__scan()
+		
+class LazySequence(collections.abc.Sequence):
+
+	"""
+	Read-only sequence for a JSON list, whose items are decoded on first
+	access.
+	
+	Spans of items are recorded by a structural scan that skips the items
+	themselves, when some item is first requested. Every item is decoded
+	when first accessed and cached, so nested dictionaries and lists become
+	lazy too.
+	
+	:param buf:
+	   Bytes-like object holding the JSON document.
+	:param int start:
+	   Offset of the opening bracket.
+	:param int end:
+	   Offset after the closing bracket.
+	"""
+	
+	__missing = object()
+	
+	def __init__(self, buf, start, end):
+	
+		self.__buf = buf
+		self.__start = start
+		self.__end = end
+		self.__spans = None
+		self.__values = None
+		
+	def __scan(self):
+	
+		if self.__spans is None:
+			self.__spans = []
+			start = self.__start
+			reader = read(memoryview(self.__buf)[start:self.__end])
+			scanner = reader.scanner
+			for r in reader:
+				child_start = start + scanner.offset - 1
+				r.skip()
+				self.__spans.append(( child_start, start + scanner.offset ))
+			self.__values = [ self.__missing ] * len(self.__spans)
+		return self.__spans
+		
+	def __getitem__(self, index):
+	
+		spans = self.__scan()
+		if isinstance(index, slice):
+			return [ self[i] for i in range(*index.indices(len(spans))) ]
+		val = self.__values[index]
+		if val is self.__missing:
+			start, end = spans[index]
+			val = lazy_value(self.__buf, start, end)
+			self.__values[index] = val
+		return val
+		
+	def __len__(self):
+	
+		return len(self.__scan())
+		
+	def __eq__(self, other):
+	
+		if not isinstance(other, collections.abc.Sequence):
+			return NotImplemented
+		if isinstance(other, ( str, bytes )) or len(self) != len(other):
+			return False
+		return all(a == b for a, b in zip(self, other))
+		
+class WriterException(BaseException):
+
+	"""
+	Writer exception.
+	
+	:param args:
+	   Exception arguments.
+	"""
+	
+	def __init__(self, args):
+	
+		super().__init__(args)
+		
+class OutputBuffer:
+
+	"""
+	Output buffer for JSON target.
+	
+	Text fragments are gathered and written to the target in large blocks.
+	Writers sharing the same buffer keep writing to it in order.
+	
+	:param tgt:
+	   JSON target.
+	:param int size:
+	   Number of characters gathered before writing them to target.
+	:param bool ascii:
+	   Whether non ASCII characters of strings are escaped, or written as
+	   they are.
+	"""
+	
+	def __init__(self, tgt, size=65536, ascii=False):
+	
+		self.__tgt = tgt
+		self.__size = size
+		self.__ascii = ascii
+		self.__parts = []
+		self.__length = 0
+		
+	@property
+	def ascii(self):
+	
+		"""
+		Whether non ASCII characters of strings are escaped.
+		"""
+		
+		return self.__ascii
+		
+	def write(self, text):
+	
+		"""
+		Gather text, and write gathered text to target once the buffer size
+		has been reached.
+		
+		:param text:
+		   Text to be written.
+		:rtype:
+		   int
+		:return:
+		   Number of written characters.
 		"""
 		
-		yield from self.__next(c)
+		self.__parts.append(text)
+		self.__length += len(text)
+		if self.__length >= self.__size:
+			self.flush()
+		return len(text)
 		
-class WriterException(BaseException):
-
-	"""
-	Writer exception.
-	
-	:param args:
-	   Exception arguments.
-	"""
-	
-	def __init__(self, args):
+	def flush(self):
 	
-		super().__init__(args)
+		"""
+		Write gathered text to target.
+		"""
 		
+		if len(self.__parts) > 0:
+			self.__tgt.write("".join(self.__parts))
+			self.__parts.clear()
+			self.__length = 0
+			
 class Writer:
 
 	"""
 	Abstract writer for JSON target.
 	
+	Writers created on a JSON target share their :class:`OutputBuffer` with
+	their children, and flush it when they are closed.
+	
 	:param tgt:
-	   JSON target.
+	   JSON target, :class:`OutputBuffer` or parent :class:`Writer`.
 	"""
 	
 	def __init__(self, tgt):
 	
-		self.__tgt = tgt
-		self.__write = self.__write_default
-		
-	def __write_default(self, text):
-	
-		return self.__tgt.write(text)
+		if isinstance(tgt, Writer):
+			self.__buffer = tgt.buffer
+			self.__root = False
+		elif isinstance(tgt, OutputBuffer):
+			self.__buffer = tgt
+			self.__root = True
+		else:
+			self.__buffer = OutputBuffer(tgt)
+			self.__root = True
+		self.__write = self.__buffer.write
 		
 	def __write_closed(self, text):
 	
 		raise WriterException("Writer already closed")
 		
+	@property
+	def buffer(self):
+	
+		"""
+		Output buffer shared by this writer and its children.
+		"""
+		
+		return self.__buffer
+		
 	def write(self, text):
 	
 		"""
@@ -693,7 +2457,9 @@ class Writer:
 		"""
 		
 		self.__write = self.__write_closed
-		
+		if self.__root:
+			self.__buffer.flush()
+			
 class NumberWriter(Writer):
 
 	"""
@@ -724,6 +2490,8 @@ class StringWriter(Writer):
 	"""
 	Writer for JSON strings.
 	
+	Written text is escaped as needed.
+	
 	:param tgt:
 	   JSON target.
 	"""
@@ -732,6 +2500,23 @@ class StringWriter(Writer):
 	
 		super().__init__(tgt)
 		
+	def write(self, text):
+	
+		"""
+		Write escaped text to target.
+		
+		:param text:
+		   Text to be written.
+		:rtype:
+		   int
+		:return:
+		   Number of written characters.
+		:raise WriterExeption:
+		   If writer is already closed.
+		"""
+		
+		return super().write(escape(text, self.buffer.ascii))
+		
 	def close(self):
 	
 		"""
@@ -741,7 +2526,7 @@ class StringWriter(Writer):
 		   If writer is already closed.
 		"""
 		
-		self.write("\"")
+		super().write("\"")
 		super().close()
 		
 class ListWriter(Writer):
@@ -759,26 +2544,24 @@ class ListWriter(Writer):
 	
 		super().__init__(tgt)
 		self.__depth = depth
-		self.__write_sep = self.__write_sep_first
-		
+		if depth is None:
+			self.__sep = ""
+			self.__sep_default = ","
+			self.__end = "]"
+		else:
+			indent = "\n" + "\t" * (depth + 1)
+			self.__sep = indent
+			self.__sep_default = "," + indent
+			self.__end = indent[:-1] + "]"
+			
 	def __next_depth(self):
 	
 		return None if self.__depth is None else self.__depth + 1
 		
-	def __write_next(self, n):
-	
-		if self.__depth is not None:
-			self.write("\n")
-			for i in range(self.__depth + n):
-				self.write("\t")
-				
-	def __write_sep_first(self):
-	
-		self.__write_sep = self.__write_sep_default
-		
-	def __write_sep_default(self):
+	def __write_sep(self, text):
 	
-		self.write(",")
+		self.write(self.__sep + text)
+		self.__sep = self.__sep_default
 		
 	def append(self, value):
 	
@@ -791,30 +2574,10 @@ class ListWriter(Writer):
 		   If value type is not supported.
 		"""
 		
-		self.__write_sep()
-		self.__write_next(1)
-		if type(value) in ( int, float ):
-			writer = NumberWriter(self)
-			writer.write(str(value))
-		elif type(value) == str:
-			self.write("\"")
-			writer = StringWriter(self)
-			writer.write(value)
-		elif type(value) == list:
-			self.write("[")
-			writer = ListWriter(self, self.__next_depth())
-			for item in value:
-				writer.append(item)
-		elif type(value) == dict:
-			self.write("{")
-			writer = DictionaryWriter(self, self.__next_depth())
-			for k, v in value.items():
-				writer.put(k, v)
-		else:
-			msg = "Value type '{}' is not supported"
-			raise WriterException(msg.format(type(value)))
-		writer.close()
-		
+		self.__write_sep("")
+		for chunk in encode(value, self.__next_depth(), self.buffer.ascii):
+			self.write(chunk)
+			
 	def append_number(self):
 	
 		"""
@@ -826,8 +2589,7 @@ class ListWriter(Writer):
 		   The appended number writer.
 		"""
 		
-		self.__write_sep()
-		self.__write_next(1)
+		self.__write_sep("")
 		return NumberWriter(self)
 		
 	def append_str(self):
@@ -841,9 +2603,7 @@ class ListWriter(Writer):
 		   The appended string writer.
 		"""
 		
-		self.__write_sep()
-		self.__write_next(1)
-		self.write("\"")
+		self.__write_sep("\"")
 		return StringWriter(self)
 		
 	def append_list(self):
@@ -857,9 +2617,7 @@ class ListWriter(Writer):
 		   The appended list writer.
 		"""
 		
-		self.__write_sep()
-		self.__write_next(1)
-		self.write("[")
+		self.__write_sep("[")
 		return ListWriter(self, self.__next_depth())
 		
 	def append_dict(self):
@@ -873,9 +2631,7 @@ class ListWriter(Writer):
 		   The appended dictionary writer.
 		"""
 		
-		self.__write_sep()
-		self.__write_next(1)
-		self.write("{")
+		self.__write_sep("{")
 		return DictionaryWriter(self, self.__next_depth())
 		
 	def close(self):
@@ -887,8 +2643,7 @@ class ListWriter(Writer):
 		   If writer is already closed.
 		"""
 		
-		self.__write_next(0)
-		self.write("]")
+		self.write(self.__end)
 		super().close()
 		
 class DictionaryWriter(Writer):
@@ -906,35 +2661,28 @@ class DictionaryWriter(Writer):
 	
 		super().__init__(tgt)
 		self.__depth = depth
-		self.__write_sep = self.__write_sep_first
-		
+		if depth is None:
+			self.__sep = "\""
+			self.__sep_default = ",\""
+			self.__colon = "\":"
+			self.__end = "}"
+		else:
+			indent = "\n" + "\t" * (depth + 1)
+			self.__sep = indent + "\""
+			self.__sep_default = "," + indent + "\""
+			self.__colon = "\": "
+			self.__end = indent[:-1] + "}"
+			
 	def __next_depth(self):
 	
 		return None if self.__depth is None else self.__depth + 1
 		
-	def __write_next(self, n):
-	
-		if self.__depth is not None:
-			self.write("\n")
-			for i in range(self.__depth + n):
-				self.write("\t")
-				
-	def __write_sep_first(self):
-	
-		self.__write_sep = self.__write_sep_default
-		
-	def __write_sep_default(self):
+	def __write_key(self, key, text):
 	
-		self.write(",")
+		key = escape(key, self.buffer.ascii)
+		self.write(self.__sep + key + self.__colon + text)
+		self.__sep = self.__sep_default
 		
-	def __write_key(self, key):
-	
-		self.write("\"")
-		self.write(key)
-		self.write("\":")
-		if self.__depth is not None:
-			self.write(" ")
-			
 	def put(self, key, value):
 	
 		"""
@@ -948,31 +2696,10 @@ class DictionaryWriter(Writer):
 		   If value type is not supported.
 		"""
 		
-		self.__write_sep()
-		self.__write_next(1)
-		self.__write_key(key)
-		if type(value) in ( int, float ):
-			writer = NumberWriter(self)
-			writer.write(str(value))
-		elif type(value) == str:
-			self.write("\"")
-			writer = StringWriter(self)
-			writer.write(value)
-		elif type(value) == list:
-			self.write("[")
-			writer = ListWriter(self, self.__next_depth())
-			for item in value:
-				writer.append(item)
-		elif type(value) == dict:
-			self.writer("{")
-			writer = DictionaryWriter(self, self.__next_depth())
-			for k, v in value.items():
-				writer.put(k, v)
-		else:
-			msg = "Value type '{}' is not supported"
-			raise WriterException(msg.format(type(value)))
-		writer.close()
-		
+		self.__write_key(key, "")
+		for chunk in encode(value, self.__next_depth(), self.buffer.ascii):
+			self.write(chunk)
+			
 	def put_number(self, key):
 	
 		"""
@@ -986,9 +2713,7 @@ class DictionaryWriter(Writer):
 		   The put number writer.
 		"""
 		
-		self.__write_sep()
-		self.__write_next(1)
-		self.__write_key(key)
+		self.__write_key(key, "")
 		return NumberWriter(self)
 		
 	def put_str(self, key):
@@ -1004,10 +2729,7 @@ class DictionaryWriter(Writer):
 		   The put string writer.
 		"""
 		
-		self.__write_sep()
-		self.__write_next(1)
-		self.__write_key(key)
-		self.write("\"")
+		self.__write_key(key, "\"")
 		return StringWriter(self)
 		
 	def put_list(self, key):
@@ -1023,10 +2745,7 @@ class DictionaryWriter(Writer):
 		   The put list writer.
 		"""
 		
-		self.__write_sep()
-		self.__write_next(1)
-		self.__write_key(key)
-		self.write("[")
+		self.__write_key(key, "[")
 		return ListWriter(self, self.__next_depth())
 		
 	def put_dict(self, key):
@@ -1042,10 +2761,7 @@ class DictionaryWriter(Writer):
 		   The put dictionary writer.
 		"""
 		
-		self.__write_sep()
-		self.__write_next(1)
-		self.__write_key(key)
-		self.write("{")
+		self.__write_key(key, "{")
 		return DictionaryWriter(self, self.__next_depth())
 		
 	def close(self):
@@ -1057,26 +2773,80 @@ class DictionaryWriter(Writer):
 		   If writer is already closed.
 		"""
 		
-		self.__write_next(0)
-		self.write("}")
+		self.write(self.__end)
 		super().close()
 		
-def __write_depth(str_out, depth):
+__number = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
 
-	if depth is None:
-		return None
-		
-	for i in range(depth):
-		str_out.write("\t")
-	return depth
+def decode_number(text):
+
+	"""
+	Decode the text of a JSON number.
+	
+	Besides standard JSON numbers, leading plus sign and leading or trailing
+	decimal dot are accepted.
+	
+	:param string text:
+	   Number text.
+	:rtype:
+	   int or float
+	:return:
+	   The number value.
+	:raise ReaderException:
+	   If text is not a valid number.
+	"""
+	
+	if __number.fullmatch(text) is None:
+		raise ReaderException("Not a number: '{}'".format(text))
+	if "." in text or "e" in text or "E" in text:
+		return float(text)
+	return int(text)
+	
+def value_reader(src, c):
+
+	"""
+	Reader for the JSON value starting with the given character, which has
+	already been consumed.
 	
-def read(str_in):
+	:param src:
+	   JSON source, :class:`Scanner` or parent :class:`Reader`.
+	:param string c:
+	   First character of the value.
+	:rtype:
+	   Reader
+	:return:
+	   JSON reader.
+	:raise ReaderException:
+	   If character does not start a value.
+	"""
+	
+	if c == "\"":
+		return StringReader(src)
+	elif c == "[":
+		return ListReader(src)
+	elif c == "{":
+		return DictionaryReader(src)
+	elif c.isdigit() or c in ( "+", "-", "." ):
+		return NumberReader(src, c)
+	elif len(c) == 0:
+		raise ReaderException("Unexpected end of input")
+	else:
+		raise ReaderException("Illegal character '{}'".format(c))
+		
+def read(str_in, key_cache=None):
 
 	"""
 	Read from JSON source.
 	
+	Source is read in large chunks, so it may be consumed beyond the end of
+	the value.
+	
 	:param str_in:
-	   JSON string input.
+	   JSON string input, binary input, bytes-like object or
+	   :class:`Scanner`.
+	:param KeyCache key_cache:
+	   Cache for interning dictionary keys, if any. Ignored when a
+	   :class:`Scanner` is given.
 	:rtype:
 	   Reader
 	:return:
@@ -1085,22 +2855,595 @@ def read(str_in):
 	   If some error has been ocurred at reading.
 	"""
 	
-	c = str_in.read(1)
-	while len(c) > 0:
-		if not c.isspace():
-			if c.isdigit() or c in ( "+", "-", "." ):
-				return NumberReader(str_in, c)
-			elif c == "\"":
-				return StringReader(str_in)
-			elif c == "[":
-				return ListReader(str_in)
-			elif c == "{":
-				return DictionaryReader(str_in)
+	if isinstance(str_in, Scanner):
+		scanner = str_in
+	else:
+		scanner = Scanner(str_in, key_cache=key_cache)
+	c = scanner.next_char()
+	if len(c) == 0:
+		return None
+	return value_reader(scanner, c)
+	
+def __raise_illegal_char(c):
+
+	if len(c) == 0:
+		raise ReaderException("Unexpected end of input")
+	raise ReaderException("Illegal character '{}'".format(c))
+	
+def events(str_in):
+
+	"""
+	Read events from JSON source.
+	
+	Unlike :func:`read`, no reader hierarchy is built. Every value of the
+	document is reported by a flat sequence of ``(event, value)`` tuples where
+	*event* is one of ``start_map``, ``map_key``, ``end_map``,
+	``start_array``, ``end_array``, ``number`` and ``string``. Tuples of
+	events without value are shared between calls.
+	
+	Grammar is strict JSON, so trailing commas such as ``[1, 2,]`` or
+	``{"a": 1,}`` are rejected, while :func:`read` and :func:`load_lazy`
+	accept them.
+	
+	:param str_in:
+	   JSON string input or :class:`Scanner`.
+	:yield:
+	   Event tuples.
+	:raise ReaderException:
+	   If some error has been ocurred at reading.
+	"""
+	
+	if isinstance(str_in, Scanner):
+		scanner = str_in
+	else:
+		scanner = Scanner(str_in)
+	stack = []
+	c = scanner.next_char()
+	if len(c) == 0:
+		return
+	while True:
+		if c == "{":
+			yield _start_map_event
+			c = scanner.next_char()
+			if c == "\"":
+				key, c = scanner.scan_key()
+				yield ( "map_key", key )
+				stack.append("}")
+				continue
+			elif c == "}":
+				yield _end_map_event
+			else:
+				__raise_illegal_char(c)
+		elif c == "[":
+			yield _start_array_event
+			c = scanner.next_char()
+			if c != "]":
+				stack.append("]")
+				continue
+			yield _end_array_event
+		elif c == "\"":
+			yield ( "string", scanner.scan_string() )
+		elif c.isdigit() or c in ( "+", "-", "." ):
+			yield ( "number", decode_number(scanner.scan_number(c)) )
+		else:
+			__raise_illegal_char(c)
+		while len(stack) > 0:
+			c = scanner.next_char()
+			if c == ",":
+				if stack[-1] == "}":
+					c = scanner.next_char()
+					if c != "\"":
+						__raise_illegal_char(c)
+					key, c = scanner.scan_key()
+					yield ( "map_key", key )
+				else:
+					c = scanner.next_char()
+				break
+			elif c == "}" and stack[-1] == "}":
+				stack.pop()
+				yield _end_map_event
+			elif c == "]" and stack[-1] == "]":
+				stack.pop()
+				yield _end_array_event
+			else:
+				__raise_illegal_char(c)
+		else:
+			return
+			
+__path_segment = re.compile(
+	r"\.?([^.\[\]\"']+)|\[(\*|\d+|\"[^\"]*\"|'[^']*')\]"
+)
+
+def __parse_path(path_expr):
+
+	path = []
+	pos = 1 if path_expr.startswith("$") else 0
+	while pos < len(path_expr):
+		m = __path_segment.match(path_expr, pos)
+		if m is None:
+			msg = "Illegal path expression '{}'"
+			raise ReaderException(msg.format(path_expr))
+		name, sub = m.groups()
+		if name is not None:
+			path.append(None if name == "*" else name)
+		elif sub == "*":
+			path.append(None)
+		elif sub.isdigit():
+			path.append(int(sub))
+		else:
+			path.append(sub[1:-1])
+		pos = m.end()
+	return path
+	
+def __select(reader, path, index):
+
+	if index == len(path):
+		yield reader.value()
+	elif reader.isdict():
+		seg = path[index]
+		for r_k, r_v in reader:
+			if seg is None or seg == r_k:
+				yield from __select(r_v, path, index + 1)
+	elif reader.islist():
+		seg = path[index]
+		for r_i, r in enumerate(reader):
+			if seg is None or seg == r_i:
+				yield from __select(r, path, index + 1)
+				
+def select(str_in, path_expr):
+
+	"""
+	Select values from JSON source matching the given path expression.
+	
+	Path expressions are a subset of JSONPath, like
+	``$.layout.executions[*].platform``. Segments are dictionary keys, either
+	dotted or quoted between brackets, list indexes between brackets and
+	``*`` wildcards. Values not matching the expression are skipped without
+	being decoded.
+	
+	:param str_in:
+	   JSON string input or :class:`Scanner`.
+	:param string path_expr:
+	   Path expression.
+	:yield:
+	   Matching values.
+	:raise ReaderException:
+	   If path expression is not valid or some error has been ocurred at
+	   reading.
+	"""
+	
+	path = __parse_path(path_expr)
+	reader = read(str_in)
+	if reader is not None:
+		yield from __select(reader, path, 0)
+		
+def read_many(str_in, error_fn=None, key_cache=None):
+
+	"""
+	Read successive values from JSON source, such as newline delimited JSON.
+	
+	When a value can not be read and an error function is given, it is
+	called and reading goes on from the first line boundary after the start
+	of the failed value, so a truncated line does not make the following
+	lines to be lost. Source is read once, keeping only the characters of
+	the value being read in order to go back to its start.
+	
+	:param str_in:
+	   JSON string input, binary input, bytes-like object or
+	   :class:`Scanner`.
+	:param error_fn:
+	   Function called with the offset of the failed value and the raised
+	   :class:`ReaderException`.
+	:param KeyCache key_cache:
+	   Cache for interning dictionary keys, if any. Ignored when a
+	   :class:`Scanner` is given.
+	:yield:
+	   Tuples with the offset of every value, in characters or bytes, and
+	   the value itself.
+	:raise ReaderException:
+	   If some error has been ocurred at reading and no error function has
+	   been given.
+	"""
+	
+	if isinstance(str_in, Scanner):
+		scanner = str_in
+	else:
+		scanner = Scanner(str_in, key_cache=key_cache)
+	try:
+		while len(scanner.peek_char()) > 0:
+			start = scanner.offset
+			scanner.mark()
+			try:
+				value = value_reader(scanner, scanner.next_char()).value()
+			except ReaderException as e:
+				if error_fn is None:
+					raise
+				error_fn(start, e)
+				scanner.rewind()
+				scanner.read_line()
 			else:
-				raise ReaderException("Illegal character '{}'".format(c))
-		c = str_in.read(1)
-	return None
+				yield ( start, value )
+	finally:
+		scanner.unmark()
+		
+async def aread(stream):
+
+	"""
+	Read from asynchronous JSON source.
+	
+	:param stream:
+	   Asynchronous JSON source, with a ``read`` coroutine like
+	   :class:`asyncio.StreamReader`.
+	:rtype:
+	   AsyncReader
+	:return:
+	   Asynchronous JSON reader.
+	:raise ReaderException:
+	   If some error has been ocurred at reading.
+	"""
+	
+	scanner = AsyncScanner(stream)
+	c = await scanner.peek_char()
+	if len(c) == 0:
+		return None
+	return await scanner.next_reader()
+	
+def index(bin_in, depth=None):
+
+	"""
+	Index JSON binary input for random access.
+	
+	Binary files are memory mapped, so only the spans of the requested values
+	are brought into memory.
+	
+	:param bin_in:
+	   JSON binary file or bytes-like object.
+	:param int depth:
+	   Maximum depth of indexed values, or None for no limit.
+	:rtype:
+	   Index
+	:return:
+	   The document index.
+	:raise ReaderException:
+	   If some error has been ocurred at reading.
+	"""
+	
+	if isinstance(bin_in, ( bytes, bytearray, memoryview, mmap.mmap )):
+		return Index(bin_in, depth)
+	buf = mmap.mmap(bin_in.fileno(), 0, access=mmap.ACCESS_READ)
+	return Index(buf, depth)
+	
+def __load_range(path, start, end):
+
+	with open(path, "rb") as bin_in:
+		buf = mmap.mmap(bin_in.fileno(), 0, access=mmap.ACCESS_READ)
+	try:
+		scanner = Scanner(buf[start:end])
+	finally:
+		buf.close()
+	items = []
+	c = scanner.next_char()
+	while len(c) > 0:
+		items.append(value_reader(scanner, c).value())
+		c = scanner.next_char()
+		if c == ",":
+			c = scanner.next_char()
+		elif len(c) > 0:
+			__raise_illegal_char(c)
+	return items
+	
+def parallel_load(path, workers=None):
+
+	"""
+	Load a JSON file holding a large list, parsing its items in parallel.
+	
+	Boundaries of the items are found by a structural scan of the memory
+	mapped file, which skips the items themselves. Then ranges of items are
+	parsed by a pool of processes, and their results are put together in
+	order. Other values are loaded in this process.
+	
+	:param string path:
+	   Path of the JSON file.
+	:param int workers:
+	   Number of processes, or None for the number of processors.
+	:rtype:
+	   list
+	:return:
+	   The loaded value.
+	:raise ReaderException:
+	   If some error has been ocurred at reading.
+	"""
+	
+	if workers is None:
+		workers = os.cpu_count() or 1
+	with open(path, "rb") as bin_in:
+		size = os.fstat(bin_in.fileno()).st_size
+		if size == 0:
+			raise ReaderException("Unexpected end of input")
+		buf = mmap.mmap(bin_in.fileno(), 0, access=mmap.ACCESS_READ)
+	try:
+		reader = read(buf)
+		if reader is None:
+			raise ReaderException("Unexpected end of input")
+		if workers <= 1 or not reader.islist():
+			return reader.value()
+		scanner = reader.scanner
+		chunk_size = max(size // (workers * 4), 1)
+		ranges = []
+		start = None
+		for r in reader:
+			if start is None:
+				start = scanner.offset - 1
+			r.skip()
+			end = scanner.offset
+			if end - start >= chunk_size:
+				ranges.append(( start, end ))
+				start = None
+		if start is not None:
+			ranges.append(( start, end ))
+	finally:
+		buf.close()
+	if len(ranges) <= 1:
+		return [ item for r in ranges for item in __load_range(path, *r) ]
+	with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+		results = executor.map(
+			__load_range,
+			[ path ] * len(ranges),
+			[ r[0] for r in ranges ],
+			[ r[1] for r in ranges ]
+		)
+		return [ item for items in results for item in items ]
+		
+def lazy_value(buf, start, end):
+
+	"""
+	Value of a span of a JSON document, with dictionaries and lists decoded
+	on first access.
+	
+	:param buf:
+	   Bytes-like object holding the JSON document.
+	:param int start:
+	   Offset of the value.
+	:param int end:
+	   Offset after the value.
+	:return:
+	   :class:`LazyMapping` for dictionaries, :class:`LazySequence` for
+	   lists, or the decoded value otherwise.
+	:raise ReaderException:
+	   If some error has been ocurred at reading.
+	"""
+	
+	c = buf[start:start + 1]
+	if c == b"{":
+		return LazyMapping(buf, start, end)
+	elif c == b"[":
+		return LazySequence(buf, start, end)
+	reader = read(memoryview(buf)[start:end])
+	if reader is None:
+		raise ReaderException("Unexpected end of input")
+	return reader.value()
+	
+def load_lazy(src):
+
+	"""
+	Load a JSON document whose dictionaries and lists are decoded on first
+	access.
+	
+	Files are memory mapped, while other sources are read as a whole. Only
+	the values that are actually accessed are decoded, along with a
+	structural scan of the dictionaries and lists holding them.
+	
+	:param src:
+	   JSON file, string input, binary input or bytes-like object.
+	:return:
+	   :class:`LazyMapping` for dictionaries, :class:`LazySequence` for
+	   lists, or the decoded value otherwise.
+	:raise ReaderException:
+	   If some error has been ocurred at reading.
+	"""
+	
+	if isinstance(src, ( bytes, bytearray, memoryview, mmap.mmap )):
+		buf = src
+	else:
+		try:
+			buf = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+		except ( AttributeError, OSError, ValueError ):
+			buf = src.read()
+			if isinstance(buf, str):
+				buf = buf.encode("utf-8")
+	start = re.match(rb"\s*", buf).end()
+	return lazy_value(buf, start, len(buf))
+	
+__escape_utf8 = re.compile(r"[\"\\\x00-\x1f]")
+__escape_ascii = re.compile(r"[^ !#-\[\]-~]")
+__escape_control = re.compile(r"[\x00-\x1f]")
+__escape_non_ascii = re.compile(r"[^ -~]")
+__escapes = {
+	"\b": "\\b",
+	"\f": "\\f",
+	"\n": "\\n",
+	"\r": "\\r",
+	"\t": "\\t"
+}
+
+def __escape_char(m):
+
+	c = m.group()
+	if c in __escapes:
+		return __escapes[c]
+	code = ord(c)
+	if code > 0xffff:
+		code -= 0x10000
+		high = 0xd800 | code >> 10
+		return "\\u{:04x}\\u{:04x}".format(high, 0xdc00 | code & 0x3ff)
+	return "\\u{:04x}".format(code)
+	
+def escape(text, ascii=False):
+
+	"""
+	Escape text for being written inside a JSON string.
+	
+	Runs of characters not needing escape are kept as they are, so only
+	quotes, backslashes and control characters are replaced, and also non
+	ASCII characters in ASCII mode. Text without any of them is returned
+	as it is.
+	
+	:param string text:
+	   Text to be escaped.
+	:param bool ascii:
+	   Whether non ASCII characters are escaped, or kept as UTF-8 text.
+	:rtype:
+	   string
+	:return:
+	   Escaped text.
+	"""
+	
+	if ascii:
+		if __escape_ascii.search(text) is None:
+			return text
+		other = __escape_non_ascii
+	else:
+		if __escape_utf8.search(text) is None:
+			return text
+		other = __escape_control
+	if "\\" in text:
+		text = text.replace("\\", "\\\\")
+	if "\"" in text:
+		text = text.replace("\"", "\\\"")
+	return other.sub(__escape_char, text)
+	
+__encode_end = object()
+__item_iterator = type(iter({}.items()))
+
+def __stream(value):
+
+	if hasattr(value, "__json_stream__"):
+		return ( iter(value.__json_stream__()), "" )
+	if isinstance(value, collections.abc.Mapping):
+		return ( iter(value.items()), "" )
+	if isinstance(value, ( collections.abc.ItemsView, __item_iterator )):
+		return ( iter(value), "" )
+	if isinstance(value, collections.abc.Iterable) and not isinstance(
+		value,
+		( str, bytes, bytearray, memoryview )
+	):
+		return ( iter(value), None )
+	msg = "Value type '{}' is not supported"
+	raise WriterException(msg.format(type(value)))
+	
+
+def __output_buffer(str_out):
+
+	if isinstance(str_out, OutputBuffer):
+		return str_out
+	return OutputBuffer(str_out)
+	
+def encode(value, depth=None, ascii=False):
+
+	"""
+	Encode a value in a single pass, without creating a writer for every
+	nested value.
+	
+	Nested values of lists and dictionaries are encoded from an explicit
+	stack, and the produced text is yielded in large chunks.
+	
+	Besides lists, any other iterable is encoded as a list. Besides
+	dictionaries, mappings, ``items()`` views and iterators, and objects
+	whose ``__json_stream__`` method returns an iterable of key and value
+	pairs are encoded as dictionaries. Their items are pulled only when
+	they are encoded, so generators are streamed without being gathered
+	first.
+	
+	:param value:
+	   Value to be encoded.
+	:param int depth:
+	   Depth for pretty print.
+	:param bool ascii:
+	   Whether non ASCII characters of strings are escaped.
+	:yield:
+	   Chunks of JSON text.
+	:raise WriterException:
+	   If some value type is not supported.
+	"""
+	
+	return __encode(value, depth, ascii, 4096)
 	
+def __encode(value, depth, ascii, count):
+
+	parts = []
+	append = parts.append
+	stack = []
+	end = __encode_end
+	search = ( __escape_ascii if ascii else __escape_utf8 ).search
+	while True:
+		value_type = type(value)
+		if value_type == str:
+			append("\"")
+			append(value if search(value) is None else escape(value, ascii))
+			append("\"")
+		elif value_type in ( int, float ):
+			append(str(value))
+		else:
+			if value_type == list:
+				items = iter(value)
+				colon = None
+			elif value_type == dict:
+				items = iter(value.items())
+				colon = ""
+			else:
+				items, colon = __stream(value)
+			if depth is None:
+				next_depth = None
+				first = ""
+				sep = ","
+				close = ""
+			else:
+				next_depth = depth + 1
+				first = "\n" + "\t" * next_depth
+				sep = "," + first
+				close = first[:-1]
+			item = next(items, end)
+			if colon is None:
+				if item is end:
+					append("[" + close + "]")
+				else:
+					append("[" + first)
+					stack.append(( items, None, sep, close + "]", next_depth ))
+					value = item
+					depth = next_depth
+					continue
+			else:
+				colon = "\":" if depth is None else "\": "
+				if item is end:
+					append("{" + close + "}")
+				else:
+					append("{" + first + "\"" + escape(item[0], ascii) + colon)
+					stack.append(( items, colon, sep + "\"", close + "}", next_depth ))
+					value = item[1]
+					depth = next_depth
+					continue
+		if len(parts) >= count:
+			yield "".join(parts)
+			parts.clear()
+		while len(stack) > 0:
+			items, colon, sep, close, depth = stack[-1]
+			item = next(items, end)
+			if item is end:
+				append(close)
+				stack.pop()
+			elif colon is None:
+				append(sep)
+				value = item
+				break
+			else:
+				append(sep + escape(item[0], ascii) + colon)
+				value = item[1]
+				break
+		else:
+			break
+	if len(parts) > 0:
+		yield "".join(parts)
+		
 def write(str_out, value, depth=None):
 
 	"""
@@ -1108,36 +3451,74 @@ def write(str_out, value, depth=None):
 	
 	:param str_out:
 	   JSON string output.
+	:param value:
+	   Value to be written. Iterables and mappings are streamed as they
+	   are encoded by :func:`encode`.
+	:param int depth:
+	   Depth for pretty print.
+	:raise WriterException:
+	   If value type is not supported.
+	"""
+	
+	buf = __output_buffer(str_out)
+	if depth is not None:
+		buf.write("\t" * depth)
+	for chunk in encode(value, depth, buf.ascii):
+		buf.write(chunk)
+	buf.flush()
+	
+def write_many(str_out, values):
+
+	"""
+	Write successive values as newline delimited JSON.
+	
+	:param str_out:
+	   JSON string output.
+	:param values:
+	   Iterable of values to be written, one per line.
+	:raise WriterException:
+	   If some value type is not supported.
+	"""
+	
+	for value in values:
+		write(str_out, value)
+		str_out.write("\n")
+		
+async def awrite(stream, value, depth=None, size=65536):
+
+	"""
+	Write a value to asynchronous JSON target.
+	
+	Value is encoded as by :func:`encode`, and its UTF-8 text is gathered
+	in batches of the given size. The target is drained after writing every
+	batch, at any nesting depth, so a large nested value is never held
+	whole in memory.
+	
+	:param stream:
+	   Asynchronous JSON target, with a ``write`` function and a ``drain``
+	   coroutine like :class:`asyncio.StreamWriter`.
 	:param value:
 	   Value to be written.
 	:param int depth:
 	   Depth for pretty print.
+	:param int size:
+	   Number of bytes of every batch.
 	:raise WriterException:
 	   If value type is not supported.
 	"""
 	
-	next_depth = __write_depth(str_out, depth)
-	if type(value) in ( int, float ):
-		writer = NumberWriter(str_out)
-		writer.write(str(value))
-	elif type(value) == str:
-		str_out.write("\"")
-		writer = StringWriter(str_out)
-		writer.write(value)
-	elif type(value) == list:
-		str_out.write("[")
-		writer = ListWriter(str_out, next_depth)
-		for item in value:
-			writer.append(item)
-	elif type(value) == dict:
-		str_out.write("{")
-		writer = DictionaryWriter(str_out, next_depth)
-		for k, v in value.items():
-			writer.put(k, v)
-	else:
-		msg = "Value type '{}' is not supported"
-		raise WriterException(msg.format(type(value)))
-	writer.close()
+	batch = bytearray()
+	if depth is not None:
+		batch += ("\t" * depth).encode("utf-8")
+	for chunk in __encode(value, depth, False, min(size, 4096)):
+		batch += chunk.encode("utf-8")
+		if len(batch) >= size:
+			stream.write(batch)
+			batch = bytearray()
+			await stream.drain()
+	if len(batch) > 0:
+		stream.write(batch)
+		await stream.drain()
 	
 def write_number(str_out, depth=None):
 
@@ -1154,8 +3535,10 @@ def write_number(str_out, depth=None):
 	   The written number writer.
 	"""
 	
-	__write_depth(str_out, depth)
-	return NumberWriter(str_out)
+	writer = NumberWriter(str_out)
+	if depth is not None:
+		writer.write("\t" * depth)
+	return writer
 	
 def write_str(str_out, depth=None):
 
@@ -1172,9 +3555,9 @@ def write_str(str_out, depth=None):
 	   The written string writer.
 	"""
 	
-	__write_depth(str_out, depth)
-	str_out.write("\"")
-	return StringWriter(str_out)
+	buf = __output_buffer(str_out)
+	buf.write("\"" if depth is None else "\t" * depth + "\"")
+	return StringWriter(buf)
 	
 def write_list(str_out, depth=None):
 
@@ -1191,9 +3574,9 @@ def write_list(str_out, depth=None):
 	   The written list writer.
 	"""
 	
-	next_depth = __write_depth(str_out, depth)
-	str_out.write("[")
-	return ListWriter(str_out, next_depth)
+	writer = ListWriter(str_out, depth)
+	writer.write("[" if depth is None else "\t" * depth + "[")
+	return writer
 	
 def write_dict(str_out, depth=None):
 
@@ -1210,7 +3593,7 @@ def write_dict(str_out, depth=None):
 	   The written dictionary writer.
 	"""
 	
-	next_depth = __write_depth(str_out, depth)
-	str_out.write("{")
-	return DictionaryWriter(str_out, next_depth)
+	writer = DictionaryWriter(str_out, depth)
+	writer.write("{" if depth is None else "\t" * depth + "{")
+	return writer
 
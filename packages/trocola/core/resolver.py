@@ -0,0 +1,530 @@
+#
+# This file is part of TROCOLA.
+#
+# TROCOLA is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# TROCOLA is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with TROCOLA.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Resolve ``#{...}`` property expressions inside data documents.
+
+Expressions are property paths, made of a property name followed by dotted
+names or subscripts with string or integer literals, like
+``main_platform['name']``, ``main_platform.name`` or ``hosts[0]``. Nothing
+else is accepted, so resolving a document never executes arbitrary code.
+
+Every expression and every string containing expressions is parsed once
+into a function of the properties, cached by its text.
+"""
+
+import collections.abc
+import functools
+import re
+
+class ResolverException(BaseException):
+
+	"""
+	Resolver exception.
+	
+	:param args:
+	   Exception arguments.
+	"""
+	
+	def __init__(self, args):
+	
+		super().__init__(args)
+		
+class Scope:
+
+	"""
+	Properties shared by the nodes of a resolvable document.
+	
+	Nodes memoize their resolved values for the current generation of the
+	scope, which is increased every time that properties change.
+	
+	Property paths read by resolved values may be recorded, in order to know
+	which values are affected by a change of properties. Paths are tuples of
+	the keys and indexes of the expressions, like ``( "main_platform",
+	"name" )``.
+	
+	:param dict props:
+	   Properties dictionary.
+	"""
+	
+	def __init__(self, props):
+	
+		self.__props = props
+		self.__generation = 0
+		self.__recordings = []
+		
+	@property
+	def props(self):
+	
+		"""
+		Properties dictionary.
+		"""
+		
+		return self.__props
+		
+	@property
+	def generation(self):
+	
+		"""
+		Number of times that properties have changed.
+		"""
+		
+		return self.__generation
+		
+	def update(self, props=None):
+	
+		"""
+		Notify that properties have changed, so every resolved value is
+		discarded.
+		
+		:param dict props:
+		   New properties dictionary, or None if the current one has been
+		   modified in place.
+		"""
+		
+		if props is not None:
+			self.__props = props
+		self.__generation += 1
+		
+	@property
+	def recording(self):
+	
+		"""
+		Whether property paths are being recorded.
+		"""
+		
+		return len(self.__recordings) > 0
+		
+	def start_recording(self):
+	
+		"""
+		Start recording the property paths read by resolved values, memoized
+		or not.
+		
+		Recordings may be nested, and paths recorded by a nested recording
+		are recorded by the enclosing one too.
+		"""
+		
+		self.__recordings.append(set())
+		
+	def stop_recording(self):
+	
+		"""
+		Stop the last started recording.
+		
+		:rtype:
+		   frozenset
+		:return:
+		   The recorded property paths.
+		"""
+		
+		paths = self.__recordings.pop()
+		if len(self.__recordings) > 0:
+			self.__recordings[-1].update(paths)
+		return frozenset(paths)
+		
+	def record(self, value):
+	
+		"""
+		Record the property paths read by a data value, if recording.
+		
+		:param value:
+		   Data value. Only strings with expressions read properties.
+		:raise ResolverException:
+		   If some expression is not a valid property path.
+		"""
+		
+		if len(self.__recordings) > 0 and isinstance(value, str):
+			if "#{" in value:
+				self.__recordings[-1].update(dependencies(value))
+				
+	def record_paths(self, paths):
+	
+		"""
+		Record the given property paths, if recording.
+		
+		It is useful for values built from resolved values which have been
+		recorded before, when those values are reused.
+		
+		:param paths:
+		   Property paths.
+		"""
+		
+		if len(self.__recordings) > 0:
+			self.__recordings[-1].update(paths)
+		
+class ResolvableMapping(collections.abc.Mapping):
+
+	"""
+	Read-only mapping over a data dictionary, whose values are resolved when
+	first accessed.
+	
+	Resolved values are memoized until properties of the scope change.
+	Nested dictionaries and lists become resolvable too, sharing the same
+	scope.
+	
+	:param dict data:
+	   Data dictionary.
+	:param Scope scope:
+	   Scope of the document.
+	"""
+	
+	__missing = object()
+	
+	def __init__(self, data, scope):
+	
+		self.__data = data
+		self.__scope = scope
+		self.__values = {}
+		self.__generation = scope.generation
+		
+	@property
+	def scope(self):
+	
+		"""
+		Scope of the document.
+		"""
+		
+		return self.__scope
+		
+	def __getitem__(self, key):
+	
+		scope = self.__scope
+		if self.__generation != scope.generation:
+			self.__values = {}
+			self.__generation = scope.generation
+		val = self.__values.get(key, self.__missing)
+		if val is self.__missing:
+			val = resolvable_value(self.__data[key], scope)
+			self.__values[key] = val
+		elif scope.recording:
+			scope.record(self.__data[key])
+		return val
+			
+	def __iter__(self):
+	
+		return iter(self.__data)
+		
+	def __len__(self):
+	
+		return len(self.__data)
+		
+	def __contains__(self, key):
+	
+		return key in self.__data
+		
+class ResolvableSequence(collections.abc.Sequence):
+
+	"""
+	Read-only sequence over a data list, whose items are resolved when first
+	accessed.
+	
+	Resolved items are memoized until properties of the scope change.
+	Nested dictionaries and lists become resolvable too, sharing the same
+	scope.
+	
+	:param list data:
+	   Data list.
+	:param Scope scope:
+	   Scope of the document.
+	"""
+	
+	__missing = object()
+	
+	def __init__(self, data, scope):
+	
+		self.__data = data
+		self.__scope = scope
+		self.__values = [ self.__missing ] * len(data)
+		self.__generation = scope.generation
+		
+	@property
+	def scope(self):
+	
+		"""
+		Scope of the document.
+		"""
+		
+		return self.__scope
+		
+	def __getitem__(self, index):
+	
+		if isinstance(index, slice):
+			return [ self[i] for i in range(*index.indices(len(self.__data))) ]
+		scope = self.__scope
+		if self.__generation != scope.generation:
+			self.__values = [ self.__missing ] * len(self.__data)
+			self.__generation = scope.generation
+		val = self.__values[index]
+		if val is self.__missing:
+			val = resolvable_value(self.__data[index], scope)
+			self.__values[index] = val
+		elif scope.recording:
+			scope.record(self.__data[index])
+		return val
+		
+	def __iter__(self):
+	
+		for index in range(len(self.__data)):
+			yield self[index]
+			
+	def __len__(self):
+	
+		return len(self.__data)
+		
+	def __eq__(self, other):
+	
+		if not isinstance(other, collections.abc.Sequence):
+			return NotImplemented
+		if isinstance(other, ( str, bytes )) or len(self) != len(other):
+			return False
+		return all(a == b for a, b in zip(self, other))
+		
+__placeholder = re.compile(r"#\{([^}]*)\}")
+__name = re.compile(r"\s*([A-Za-z_][A-Za-z0-9_]*)")
+__segment = re.compile(
+	r"\s*(?:\.\s*([A-Za-z_][A-Za-z0-9_]*)"
+	r"|\[\s*(?:'([^'\\]*)'|\"([^\"\\]*)\"|(-?[0-9]+))\s*\])"
+)
+__space = re.compile(r"\s*")
+__booleans = {
+	"true": True,
+	"yes": True,
+	"on": True,
+	"1": True,
+	"false": False,
+	"no": False,
+	"off": False,
+	"0": False
+}
+
+def __parse_path(text):
+
+	m = __name.match(text)
+	if m is None:
+		raise ResolverException("Illegal expression '{}'".format(text))
+	path = [ m.group(1) ]
+	pos = m.end()
+	m = __segment.match(text, pos)
+	while m is not None:
+		name, single, double, index = m.groups()
+		if name is not None:
+			path.append(name)
+		elif single is not None:
+			path.append(single)
+		elif double is not None:
+			path.append(double)
+		else:
+			path.append(int(index))
+		pos = m.end()
+		m = __segment.match(text, pos)
+	if __space.match(text, pos).end() < len(text):
+		raise ResolverException("Illegal expression '{}'".format(text))
+	return tuple(path)
+	
+@functools.lru_cache(maxsize=4096)
+def expression(text):
+
+	"""
+	Compiled property expression.
+	
+	:param string text:
+	   Expression text, without the enclosing ``#{`` and ``}``.
+	:rtype:
+	   function
+	:return:
+	   Function evaluating the expression against a properties dictionary.
+	:raise ResolverException:
+	   If expression is not a valid property path.
+	"""
+	
+	path = __parse_path(text)
+	
+	def evaluate(props):
+	
+		value = props
+		try:
+			for key in path:
+				value = value[key]
+		except ( KeyError, IndexError, TypeError ):
+			raise ResolverException("Can not resolve '{}'".format(text))
+		return value
+		
+	return evaluate
+	
+@functools.lru_cache(maxsize=4096)
+def template(text):
+
+	"""
+	Compiled string with property expressions.
+	
+	When the string is a single expression, its value is given as it is.
+	Otherwise, values are converted to strings and interpolated.
+	
+	:param string text:
+	   String with ``#{...}`` expressions.
+	:rtype:
+	   function
+	:return:
+	   Function resolving the string against a properties dictionary.
+	:raise ResolverException:
+	   If some expression is not a valid property path.
+	"""
+	
+	m = __placeholder.fullmatch(text)
+	if m is not None:
+		return expression(m.group(1))
+	parts = []
+	pos = 0
+	for m in __placeholder.finditer(text):
+		if m.start() > pos:
+			parts.append(text[pos:m.start()])
+		parts.append(expression(m.group(1)))
+		pos = m.end()
+	if pos < len(text):
+		parts.append(text[pos:])
+	parts = tuple(parts)
+	
+	def interpolate(props):
+	
+		return "".join(
+			part if isinstance(part, str) else str(part(props))
+			for part in parts
+		)
+		
+	return interpolate
+	
+@functools.lru_cache(maxsize=4096)
+def dependencies(text):
+
+	"""
+	Property paths read by a string with property expressions.
+	
+	:param string text:
+	   String with ``#{...}`` expressions.
+	:rtype:
+	   tuple
+	:return:
+	   Property paths, as tuples of keys and indexes.
+	:raise ResolverException:
+	   If some expression is not a valid property path.
+	"""
+	
+	return tuple(
+		__parse_path(m.group(1))
+		for m in __placeholder.finditer(text)
+	)
+	
+def resolve(value, props):
+
+	"""
+	Resolve the expressions of a value.
+	
+	Strings are resolved by their :func:`template`, and dictionaries and
+	lists are resolved item by item. Dictionary keys are kept as they are.
+	
+	:param value:
+	   Value to be resolved.
+	:param dict props:
+	   Properties dictionary.
+	:return:
+	   The resolved value.
+	:raise ResolverException:
+	   If some expression can not be resolved.
+	"""
+	
+	if isinstance(value, str):
+		if "#{" in value:
+			return template(value)(props)
+		return value
+	elif isinstance(value, dict):
+		return { key: resolve(val, props) for key, val in value.items() }
+	elif isinstance(value, list):
+		return [ resolve(val, props) for val in value ]
+	return value
+	
+def resolvable_value(value, scope):
+
+	"""
+	Resolvable node for a data value.
+	
+	:param value:
+	   Data value.
+	:param Scope scope:
+	   Scope of the document.
+	:return:
+	   A :class:`ResolvableMapping` for dictionaries, a
+	   :class:`ResolvableSequence` for lists, or the resolved value
+	   otherwise.
+	:raise ResolverException:
+	   If some expression can not be resolved.
+	"""
+	
+	if isinstance(value, str):
+		if "#{" in value:
+			scope.record(value)
+			return template(value)(scope.props)
+		return value
+	elif isinstance(value, dict):
+		return ResolvableMapping(value, scope)
+	elif isinstance(value, list):
+		return ResolvableSequence(value, scope)
+	return value
+	
+def resolvable(data, props):
+
+	"""
+	Resolvable view of a data document.
+	
+	Nothing is resolved up front: every value is resolved when it is first
+	accessed, and memoized until :meth:`Scope.update` is called on the
+	scope of the document.
+	
+	:param data:
+	   Data document.
+	:param dict props:
+	   Properties dictionary.
+	:return:
+	   Resolvable node for the document, as given by
+	   :func:`resolvable_value`.
+	:raise ResolverException:
+	   If the document is a string whose expressions can not be resolved.
+	"""
+	
+	return resolvable_value(data, Scope(props))
+	
+def boolean(value):
+
+	"""
+	Boolean value of a resolved flag, such as ``"true"`` or ``"no"``.
+	
+	:param value:
+	   Boolean, or string in any case.
+	:rtype:
+	   bool
+	:return:
+	   The flag value.
+	:raise ResolverException:
+	   If value is not a known flag.
+	"""
+	
+	if isinstance(value, bool):
+		return value
+	try:
+		return __booleans[str(value).strip().lower()]
+	except KeyError:
+		raise ResolverException("Not a boolean: '{}'".format(value))
@@ -0,0 +1,164 @@
+#
+# This file is part of TROCOLA.
+#
+# TROCOLA is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# TROCOLA is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with TROCOLA.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Utilities shared by engine modules.
+"""
+
+import collections.abc
+
+class ChainProps(collections.abc.Mapping):
+
+	"""
+	Read-only view of several property dictionaries laid over each other,
+	with the same values as merging them with :func:`merge_dict`, from the
+	last layer to the first one, but without copying any of them.
+	
+	Nested dictionaries found in several layers are given as nested views,
+	which are memoized, so layers should not be modified while viewed.
+	
+	:param layers:
+	   Property dictionaries, from the highest priority to the lowest one.
+	   None values are ignored.
+	"""
+	
+	def __init__(self, *layers):
+	
+		self.__layers = tuple(
+			layer for layer in layers
+			if layer is not None
+		)
+		self.__children = {}
+		self.__found = {}
+		
+	@property
+	def layers(self):
+	
+		"""
+		Tuple of viewed dictionaries, from the highest priority to the
+		lowest one.
+		"""
+		
+		return self.__layers
+		
+	def __getitem__(self, key):
+	
+		child = self.__children.get(key)
+		if child is not None:
+			return child
+		values = []
+		for layer in self.__layers:
+			if key in layer:
+				value = layer[key]
+				if not isinstance(value, collections.abc.Mapping):
+					if len(values) == 0:
+						return value
+					break
+				values.append(value)
+		if len(values) == 0:
+			raise KeyError(key)
+		if len(values) == 1:
+			child = values[0]
+		else:
+			child = ChainProps(*values)
+		self.__children[key] = child
+		return child
+		
+	def __iter__(self):
+	
+		keys = {}
+		for layer in reversed(self.__layers):
+			keys.update(dict.fromkeys(layer))
+		return iter(keys)
+		
+	def __len__(self):
+	
+		return sum(1 for key in self)
+		
+	def __contains__(self, key):
+	
+		return any(key in layer for layer in self.__layers)
+		
+	def find(self, path):
+	
+		"""
+		Value at the given path.
+		
+		Found values are memoized by path.
+		
+		:param path:
+		   Dotted path string, like ``"main_platform.name"``, or tuple of
+		   keys.
+		:return:
+		   The value.
+		:raise KeyError:
+		   If there is no value at the path.
+		"""
+		
+		value = self.__found.get(path, self.__found)
+		if value is not self.__found:
+			return value
+		keys = path.split(".") if isinstance(path, str) else path
+		value = self
+		for key in keys:
+			if not isinstance(value, collections.abc.Mapping):
+				raise KeyError(key)
+			value = value[key]
+		self.__found[path] = value
+		return value
+		
+	def to_dict(self):
+	
+		"""
+		Merged copy of the viewed dictionaries.
+		
+		:rtype:
+		   dict
+		:return:
+		   Dictionary with the same values as this view.
+		"""
+		
+		props = {}
+		for layer in reversed(self.__layers):
+			merge_dict(props, layer)
+		return props
+		
+def merge_dict(target, source):
+
+	"""
+	Merge a dictionary into another one.
+	
+	Nested dictionaries are merged recursively, and any other value of the
+	source dictionary replaces the target one. Nested dictionaries of the
+	source, or any other mappings such as :class:`ChainProps`, are copied,
+	so they are never shared with the target.
+	
+	:param dict target:
+	   Dictionary to be updated.
+	:param source:
+	   Dictionary, or any other mapping, to be merged.
+	"""
+	
+	for key, value in source.items():
+		if isinstance(value, collections.abc.Mapping):
+			target_value = target.get(key)
+			if not isinstance(target_value, dict):
+				target_value = {}
+				target[key] = target_value
+			merge_dict(target_value, value)
+		else:
+			target[key] = value
@@ -19,10 +19,24 @@
 Module for image definition.
 """
 
-# from trocola.module import resolver
+from trocola.core import resolver
+from trocola.core import util
+
 # from trocola.module import resource
-# from trocola.module import util
 
+class ImageException(BaseException):
+
+	"""
+	Image exception.
+	
+	:param args:
+	   Exception arguments.
+	"""
+	
+	def __init__(self, args):
+	
+		super().__init__(args)
+		
 class Image:
 
 	"""
@@ -175,7 +189,7 @@ class ImagePort:
 		Transport protocol.
 		"""
 		
-		return self.__value
+		return self.__protocol
 		
 class ImageResource:
 
@@ -246,6 +260,173 @@ class ImageCommand:
 		
 		return self.__arguments
 		
+class ImageCatalog:
+
+	"""
+	Catalog of images indexed by name and version.
+	
+	Images extending other images are flattened on demand: ports are
+	inherited unless an image exposes another one with the same name,
+	resources and provision commands are appended to the inherited ones, and
+	execution commands replace the inherited ones when the image has some.
+	
+	Flattened images are memoized for the whole extends chain, so they should
+	not be modified. When an image is added again or removed, only the
+	flattened images of itself and of the images extending it, directly or
+	not, are discarded.
+	"""
+	
+	def __init__(self):
+	
+		self.__images = {}
+		self.__children = {}
+		self.__flattened = {}
+		
+	def __key(self, ref):
+	
+		return ( ref.name, ref.version )
+		
+	def __len__(self):
+	
+		return len(self.__images)
+		
+	def __contains__(self, ref):
+	
+		return self.__key(ref) in self.__images
+		
+	def __link(self, key, image, linked):
+	
+		if image is not None and image.extends is not None:
+			base_key = self.__key(image.extends)
+			if linked:
+				self.__children.setdefault(base_key, set()).add(key)
+			else:
+				self.__children[base_key].discard(key)
+				
+	def __invalidate(self, key):
+	
+		pending = [ key ]
+		visited = set()
+		while len(pending) > 0:
+			key = pending.pop()
+			if key not in visited:
+				visited.add(key)
+				self.__flattened.pop(key, None)
+				pending.extend(self.__children.get(key, ()))
+				
+	def __merge(self, base, image):
+	
+		flat = Image(image.ref, image.extends)
+		if base is None:
+			flat.ports.extend(image.ports)
+			flat.resources.extend(image.resources)
+			flat.provision.extend(image.provision)
+			flat.execution.extend(image.execution)
+		else:
+			ports = { port.name: port for port in base.ports }
+			ports.update((port.name, port) for port in image.ports)
+			flat.ports.extend(ports.values())
+			flat.resources.extend(base.resources)
+			flat.resources.extend(image.resources)
+			flat.provision.extend(base.provision)
+			flat.provision.extend(image.provision)
+			if len(image.execution) > 0:
+				flat.execution.extend(image.execution)
+			else:
+				flat.execution.extend(base.execution)
+		return flat
+		
+	def add(self, image):
+	
+		"""
+		Add an image, replacing the one with the same reference, if any.
+		
+		:param Image image:
+		   Image to be added.
+		"""
+		
+		key = self.__key(image.ref)
+		self.__link(key, self.__images.get(key), False)
+		self.__images[key] = image
+		self.__link(key, image, True)
+		self.__invalidate(key)
+		
+	def remove(self, ref):
+	
+		"""
+		Remove an image.
+		
+		:param ImageRef ref:
+		   Reference of the image to be removed.
+		:raise ImageException:
+		   If there is no image with that reference.
+		"""
+		
+		key = self.__key(ref)
+		image = self.get(ref)
+		self.__link(key, image, False)
+		del self.__images[key]
+		self.__invalidate(key)
+		
+	def get(self, ref):
+	
+		"""
+		Image with the given reference, as it has been added.
+		
+		:param ImageRef ref:
+		   Image reference.
+		:rtype:
+		   Image
+		:return:
+		   The image.
+		:raise ImageException:
+		   If there is no image with that reference.
+		"""
+		
+		key = self.__key(ref)
+		if key not in self.__images:
+			msg = "Image '{}' version '{}' not found"
+			raise ImageException(msg.format(*key))
+		return self.__images[key]
+		
+	def flatten(self, ref):
+	
+		"""
+		Image with the given reference, with the definitions of the images
+		it extends.
+		
+		:param ImageRef ref:
+		   Image reference.
+		:rtype:
+		   Image
+		:return:
+		   The flattened image.
+		:raise ImageException:
+		   If some image of the extends chain is not found, or if the chain
+		   is cyclic.
+		"""
+		
+		key = self.__key(ref)
+		chain = []
+		visited = set()
+		base = None
+		while key not in self.__flattened:
+			if key in visited:
+				msg = "Cyclic extends chain at image '{}' version '{}'"
+				raise ImageException(msg.format(*key))
+			visited.add(key)
+			image = self.get(ImageRef(*key))
+			chain.append(image)
+			if image.extends is None:
+				break
+			key = self.__key(image.extends)
+		else:
+			base = self.__flattened[key]
+		for image in reversed(chain):
+			base = self.__merge(base, image)
+			self.__flattened[self.__key(image.ref)] = base
+		return base
+		
 def __load_ref(data):
 
 	version = data["version"] if "version" in data else None
@@ -323,14 +504,13 @@ def load(base_res, image_data, props=None):
 	Data dictionary will be treated as a resolvable one.
 	"""
 	
-	image_props = {}
 	if "properties" in image_data:
-		util.merge_dict(image_props, image_data["properties"])
-	if props is not None:
-		util.merge_dict(image_props, props)
+		image_props = util.ChainProps(props, image_data["properties"])
+	else:
+		image_props = util.ChainProps(props)
 	image_def = resolver.resolvable(image_data["image"], image_props)
 	
-	image_ref = __load_ref(image_data)
+	image_ref = __load_ref(image_def)
 	if "extends" in image_def:
 		image_extends = __load_ref(image_def["extends"])
 	else:
@@ -357,11 +537,21 @@ def load(base_res, image_data, props=None):
 				res_props
 			))
 			
+	if "ports" in image_def:
+		for port in image_def["ports"]:
+			port_proto = port["protocol"] if "protocol" in port else "tcp"
+			image.ports.append(ImagePort(
+				port["name"],
+				port["value"],
+				port_proto
+			))
+			
 	if "provision" in image_def:
 		for prov in image_def["provision"]:
-			image.provision.append(ImageCommand(prov))
+			image.provision.append(ImageCommand(list(prov["arguments"])))
 			
 	if "execution" in image_def:
 		for execut in image_def["execution"]:
-			image.execution.append(ImageCommand(execut))
+			image.execution.append(ImageCommand(list(execut["arguments"])))
+	return image
 
@@ -19,20 +19,36 @@
 Module for layout definition.
 """
 
+from trocola.core import resolver
+from trocola.core import util
 from trocola.engine import image
 
-# from trocola.module import resolver
-# from trocola.module import util
+import bisect
 
 class Layout:
 
 	"""
 	Layout.
+	
+	:param LayoutSource source:
+	   Source which this layout has been loaded from, if any.
+	:param list executions:
+	   List of :class:`ContainerExecution` values, if any.
 	"""
 	
-	def __init__(self):
+	def __init__(self, source=None, executions=None):
 	
-		self.__executions = []
+		self.__source = source
+		self.__executions = [] if executions is None else executions
+		
+	@property
+	def source(self):
+	
+		"""
+		Source of type :class:`LayoutSource`, if any.
+		"""
+		
+		return self.__source
 		
 	@property
 	def executions(self):
@@ -43,6 +59,114 @@ class Layout:
 		
 		return self.__executions
 		
+class LayoutSource:
+
+	"""
+	Layout definition which some layouts have been loaded from, with the
+	loaded parts and the property paths they have read.
+	
+	Parts are identified by ``( "containers", key )``, ``( "volumes", key )``
+	and ``( "executions", index )`` tuples.
+	
+	Executions of the last loaded layout are kept together with their
+	indexes, so a reload only replaces the executions loaded again.
+	
+	:param trocola.core.resolver.ResolvableMapping definition:
+	   Resolvable layout definition.
+	:param dict overrides:
+	   Properties changed by reloads, laid over the rest of properties of
+	   the definition.
+	"""
+	
+	def __init__(self, definition, overrides=None):
+	
+		self.__definition = definition
+		self.__overrides = {} if overrides is None else overrides
+		self.__parts = {}
+		self.__readers = {}
+		self.__dependents = {}
+		self.__users = {}
+		self.__indexes = []
+		self.__executions = []
+		
+	@property
+	def definition(self):
+	
+		"""
+		Resolvable layout definition.
+		"""
+		
+		return self.__definition
+		
+	@property
+	def overrides(self):
+	
+		"""
+		Dictionary of the properties changed by reloads.
+		"""
+		
+		return self.__overrides
+		
+	@property
+	def parts(self):
+	
+		"""
+		Dictionary with a tuple of the loaded value and the read property
+		paths for every loaded part. Value of disabled executions is None.
+		"""
+		
+		return self.__parts
+		
+	@property
+	def readers(self):
+	
+		"""
+		Dictionary with the set of parts which have read every property
+		path.
+		"""
+		
+		return self.__readers
+		
+	@property
+	def dependents(self):
+	
+		"""
+		Dictionary with the set of parts which have read any property path
+		starting with every path prefix.
+		"""
+		
+		return self.__dependents
+		
+	@property
+	def users(self):
+	
+		"""
+		Dictionary with the set of execution parts which use every loaded
+		container or volume part.
+		"""
+		
+		return self.__users
+		
+	@property
+	def indexes(self):
+	
+		"""
+		Sorted list of the indexes of the enabled executions of the last
+		loaded layout.
+		"""
+		
+		return self.__indexes
+		
+	@property
+	def executions(self):
+	
+		"""
+		List of the enabled executions of the last loaded layout, in the
+		same order as :attr:`indexes`.
+		"""
+		
+		return self.__executions
+		
 class Container:
 
 	"""
@@ -101,7 +225,7 @@ class ContainerPort:
 		return self.__name
 		
 	@property
-	def service_name():
+	def service_name(self):
 	
 		"""
 		Service name.
@@ -242,54 +366,152 @@ class VolumeMount:
 		
 		return self.__path
 		
+__size_units = "KMGT"
+
 def __load_size(data):
 
-	unit = data[-1]
-	if unit.isdigit():
-		fact = 0
-		index = 1
-	elif unit == "B":
+	if type(data) == int:
+		return data
+	num_str = data.rstrip("Bb")
+	unit = num_str[-1:].upper()
+	if unit in __size_units:
+		fact = __size_units.index(unit) + 1
+		num_str = num_str[:-1]
+	elif unit.isdigit():
 		fact = 0
-		index = 2
-	elif c == "K":
-		fact = 1
-		index = 2
-	elif c == "M":
-		fact = 2
-		index = 2
-	elif c == "G":
-		fact = 3
-		index = 2
-	elif c == "T":
-		fact = 4
-		index = 2
 	else:
 		raise Exception("Invalid size unit '{}'".format(data))
 	
-	num_str = data[0:-index]
-	num = eval(num_str)
-	if type(num) != int:
+	if not num_str.isdigit():
 		raise Exception("Invalid size integer '{}'".format(num_str))
+	num = int(num_str)
 	for i in range(fact):
 		num = num * 1024
 	return num
 	
-def __load_execution(data, containers, volumes):
+def __load_part(source, part, load_fn, *args):
+
+	scope = source.definition.scope
+	loaded = source.parts.get(part)
+	if loaded is not None:
+		scope.record_paths(loaded[1])
+		return loaded[0]
+	scope.start_recording()
+	try:
+		value = load_fn(source, *args)
+	finally:
+		paths = scope.stop_recording()
+	source.parts[part] = ( value, paths )
+	readers = source.readers
+	dependents = source.dependents
+	for path in paths:
+		readers.setdefault(path, set()).add(part)
+		for i in range(1, len(path) + 1):
+			dependents.setdefault(path[:i], set()).add(part)
+	return value
+	
+def __forget_part(source, part):
+
+	value, paths = source.parts.pop(part)
+	for path in paths:
+		source.readers[path].discard(part)
+		for i in range(1, len(path) + 1):
+			source.dependents[path[:i]].discard(part)
+			
+def __use_part(source, part, user):
 
-	cont = containers[data["container"]]
+	source.users.setdefault(part, set()).add(user)
+	
+def __load_container(source, key):
+
+	data = source.definition["containers"][key]
+	image_data = data["image"]
+	if "version" in image_data:
+		image_version = image_data["version"]
+	else:
+		image_version = None
+	image_ref = image.ImageRef(image_data["name"], image_version)
+	cont = Container(image_ref)
+	if "ports" in data:
+		for port_data in data["ports"]:
+			name = port_data["name"]
+			serv_name = port_data["service"]
+			cont.ports.append(ContainerPort(name, serv_name))
+	return cont
+	
+def __load_volume(source, key):
+
+	data = source.definition["volumes"][key]
+	stor_type = data["storage"]
+	size = __load_size(data["size"])
+	return Volume(stor_type, size)
+	
+def __load_execution(source, index):
+
+	data = source.definition["executions"][index]
+	enabled = data["enabled"] if "enabled" in data else True
+	if not resolver.boolean(enabled):
+		return None
+	cont_key = data["container"]
+	cont = __load_part(
+		source,
+		( "containers", cont_key ),
+		__load_container,
+		cont_key
+	)
+	__use_part(source, ( "containers", cont_key ), ( "executions", index ))
 	plat_name = data["platform"]
-	if "configuration" in exec_data:
+	if "configuration" in data:
 		config = ContainerExecutionConfig()
-		config_data = exec_data["configuration"]
+		config_data = data["configuration"]
 		if "volumes" in config_data:
 			for vol_data in config_data["volumes"]:
-				vol = volumes[vol_data["volume"]]
+				vol_key = vol_data["volume"]
+				vol = __load_part(
+					source,
+					( "volumes", vol_key ),
+					__load_volume,
+					vol_key
+				)
+				__use_part(source, ( "volumes", vol_key ), ( "executions", index ))
 				path = vol_data["path"]
 				config.volumes.append(VolumeMount(vol, path))
 	else:
 		config = None
 	return ContainerExecution(cont, plat_name, config)
 	
+def __load_executions(source, indexes):
+
+	enabled = source.indexes
+	executions = source.executions
+	for index in sorted(indexes):
+		execut = __load_part(
+			source,
+			( "executions", index ),
+			__load_execution,
+			index
+		)
+		pos = bisect.bisect_left(enabled, index)
+		if pos < len(enabled) and enabled[pos] == index:
+			if execut is None:
+				del enabled[pos]
+				del executions[pos]
+			else:
+				executions[pos] = execut
+		elif execut is not None:
+			enabled.insert(pos, index)
+			executions.insert(pos, execut)
+	return Layout(source, list(executions))
+	
+def __changed_paths(props, prefix):
+
+	for key, value in props.items():
+		path = prefix + ( key, )
+		if isinstance(value, dict) and len(value) > 0:
+			yield from __changed_paths(value, path)
+		else:
+			yield path
+			
 def load(layout_data, props=None):
 
 	"""
@@ -354,45 +576,69 @@ def load(layout_data, props=None):
 	       }
 	   }
 	   
-	Data dictionary will be treated as a resolvable one.
+	Data dictionary will be treated as a resolvable one. Only containers and
+	volumes used by enabled executions are loaded, so the rest of them are
+	never resolved.
 	"""
 	
-	layout_props = {}
+	overrides = {}
 	if "properties" in layout_data:
-		util.merge_dict(layout_props, layout_data["properties"])
-	if props is not None:
-		util.merge_dict(layout_props, props)
+		layout_props = util.ChainProps(
+			overrides,
+			props,
+			layout_data["properties"]
+		)
+	else:
+		layout_props = util.ChainProps(overrides, props)
 	layout_def = resolver.resolvable(layout_data["layout"], layout_props)
-	
-	containers = {}
-	if "containers" in layout_def:
-		for cont_key, cont_data in layout_def["containers"].items():
-			image_data = cont_data["image"]
-			if "version" in image_data:
-				image_version = image_data["version"]
-			else:
-				image_version = None
-			image_ref = image.ImageRef(image_data["name"], image_version)
-			cont = Container(image_ref)
-			if "ports" in cont_data:
-				for port_data in cont_data["ports"]:
-					name = port_data["name"]
-					serv_name = port_data["service"]
-					cont.ports.append(ContainerPort(name, serv_name))
-			containers[cont_key] = cont
-			
-	volumes = {}
-	if "volumes" in layout_def:
-		for vol_key, vol_data in layout_def["volumes"].items():
-			stor_type = vol_data["storage"]
-			size = __load_size(vol_data["size"])
-			volumes[vol_key] = Volume(stor_type, size)
-			
-	layout = Layout()
+	source = LayoutSource(layout_def, overrides)
 	if "executions" in layout_def:
-		for exec_data in layout_def["executions"]:
-			if "enabled" not in exec_data or eval(exec_data["enabled"]):
-				execut = __load_execution(exec_data, containers, volumes)
-				layout.executions.append(execut)
-	return layout
+		indexes = range(len(layout_def["executions"]))
+	else:
+		indexes = ()
+	return __load_executions(source, indexes)
+	
+def reload(previous_layout, changed_props):
 
+	"""
+	Load a layout again after some properties have changed.
+	
+	Only executions, containers and volumes which have read some changed
+	property are loaded again, together with the executions using those
+	containers and volumes. The rest of them are taken from the previous
+	layout, whose source is shared with the new one, so the previous layout
+	must not be reloaded anymore.
+	
+	:param Layout previous_layout:
+	   Layout given by :func:`load` or :func:`reload`.
+	:param dict changed_props:
+	   Changed properties, merged into the ones changed by previous
+	   reloads and laid over the rest of them.
+	:rtype:
+	   Layout
+	:return:
+	   The reloaded layout.
+	"""
+	
+	source = previous_layout.source
+	if source is None:
+		raise Exception("Layout has not been loaded from a source")
+	scope = source.definition.scope
+	util.merge_dict(source.overrides, changed_props)
+	scope.update(util.ChainProps(*scope.props.layers))
+	
+	parts = set()
+	for path in __changed_paths(changed_props, ()):
+		parts.update(source.dependents.get(path, ()))
+		for i in range(1, len(path)):
+			parts.update(source.readers.get(path[:i], ()))
+	for part in list(parts):
+		if part[0] != "executions":
+			parts.update(source.users.pop(part, ()))
+	indexes = set()
+	for part in parts:
+		if part in source.parts:
+			__forget_part(source, part)
+		if part[0] == "executions":
+			indexes.add(part[1])
+	return __load_executions(source, indexes)
@@ -0,0 +1,115 @@
+#
+# This file is part of TROCOLA.
+#
+# TROCOLA is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# TROCOLA is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with TROCOLA.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from trocola.core import binary
+from trocola.core import json
+
+import io
+import unittest
+
+class TestBinary(unittest.TestCase):
+
+	def test_value_numbers(self):
+	
+		value = [
+			0, 127, -1, -32, -33, 128, -129, 40000, -40000, 2 ** 40, -2 ** 40,
+			2 ** 70, -2 ** 70, 1.5, 0.1, 1e300
+		]
+		data = binary.encode(value)
+		self.assertEqual(binary.decode(data), value)
+		self.assertEqual(bytes(binary.encode([ 1, -1, 1.5 ])),
+			b"\xc4\x07\x01\xff\xca\x3f\xc0\x00\x00"
+		)
+		
+	def test_value_str(self):
+	
+		for value in ( "", "abc", "x" * 31, "x" * 32, "x" * 300, "é" * 40000 ):
+			data = binary.encode(value)
+			self.assertEqual(binary.decode(data), value)
+			self.assertEqual(binary.read(io.BytesIO(data)).value(), value)
+			
+	def test_value_complex(self):
+	
+		value = {
+			"name": "complex",
+			"items": [ "item{}".format(i) for i in range(100) ],
+			"properties": { "type": "binary", "depth": 2, "empty": {} }
+		}
+		data = binary.encode(value)
+		self.assertEqual(binary.decode(data), value)
+		json_out = io.StringIO()
+		json.write(json_out, value)
+		self.assertLess(len(data), len(json_out.getvalue()))
+		with self.assertRaises(json.ReaderException):
+			binary.decode(data[:-1])
+		with self.assertRaises(json.WriterException):
+			binary.encode({ 1: "key" })
+		for data in ( b"\xc5\x02\x01\x01", b"\xc5\x03\xc4\x00\x01" ):
+			with self.assertRaises(json.ReaderException):
+				binary.decode(data)
+			with self.assertRaises(json.ReaderException):
+				binary.read(io.BytesIO(data)).value()
+			
+	def test_stream_complex(self):
+	
+		bin_out = io.BytesIO()
+		writer = binary.write_dict(bin_out)
+		writer.put("name", "complex")
+		writer.put("complexity", 1)
+		wa = writer.put_list("items")
+		wa.append("item1")
+		wn = wa.append_number()
+		wn.write("2.5")
+		wn.close()
+		ws = wa.append_str()
+		ws.write("item")
+		ws.write("3")
+		ws.close()
+		wa.close()
+		wa = writer.put_dict("properties")
+		wa.put("type", "stream")
+		wa.put("depth", 2)
+		wa.close()
+		writer.close()
+		self.assertEqual(bin_out.getvalue(), binary.encode({
+			"name": "complex",
+			"complexity": 1,
+			"items": [ "item1", 2.5, "item3" ],
+			"properties": { "type": "stream", "depth": 2 }
+		}))
+		
+	def test_stream_skip(self):
+	
+		data = binary.encode({
+			"skipped": [ "x" * 1000, { "nested": list(range(1000)) } ],
+			"partial": [ 1, [ 2, 3 ], 4 ],
+			"kept": "value"
+		})
+		scanner = binary.Scanner(io.BytesIO(data), 16)
+		reader = binary.read(scanner)
+		self.assertTrue(reader.isdict())
+		found = {}
+		for key, child in reader:
+			if key == "partial":
+				items = iter(child)
+				self.assertEqual(next(items).value(), 1)
+				self.assertTrue(next(items).islist())
+				found[key] = child.value()
+			elif key == "kept":
+				found[key] = child.value()
+		self.assertEqual(found, { "partial": [ 4 ], "kept": "value" })
+		self.assertEqual(scanner.offset, len(data))
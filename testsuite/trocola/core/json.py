@@ -17,8 +17,11 @@
 
 from trocola.core import json
 
+import asyncio
 import io
+import mmap
 import os.path
+import tempfile
 import unittest
 
 class TestRead(unittest.TestCase):
@@ -73,6 +76,43 @@ class TestRead(unittest.TestCase):
 		finally:
 			json_in.close()
 		
+	def __next_value(self, reader):
+	
+		if reader.isnumber() or reader.isstr():
+			chars = []
+			c = reader.read(1)
+			while len(c) > 0:
+				chars.extend(reader.next(c))
+				c = reader.read(1)
+			return "".join(
+				c if isinstance(c, str) else c.decode()
+				for c in chars
+			)
+		items = []
+		c = reader.read(1)
+		while len(c) > 0:
+			for item in reader.next(c):
+				if reader.isdict():
+					items.append(( item[0], self.__next_value(item[1]) ))
+				else:
+					items.append(self.__next_value(item))
+			c = reader.read(1)
+		return dict(items) if reader.isdict() else items
+		
+	def test_next_chars(self):
+	
+		text = "{ \"a\": [ 12, \"x\\ny\" , [] ], \"b\": 3.5 }"
+		for src in ( io.StringIO(text), text.encode() ):
+			self.assertEqual(self.__next_value(json.read(src)), {
+				"a": [ "12", "x\ny", [] ],
+				"b": "3.5"
+			})
+		reader = json.read(io.StringIO("1"))
+		self.assertEqual(list(reader.next("7")), [ "7" ])
+		self.assertEqual(list(reader.next("6")), [ "6" ])
+		self.assertEqual(list(reader.next(" ")), [])
+		self.assertEqual(reader.value(), 176)
+		
 	def test_stream_complex(self):
 	
 		try:
@@ -112,6 +152,383 @@ class TestRead(unittest.TestCase):
 		finally:
 			json_in.close()
 			
+	def test_value_dict_key_cache(self):
+	
+		text = "[{\"name\": 1, \"v\\u0065rsion\": 2}, {\"name\": 3, \"version\": 4}]"
+		cache = json.KeyCache()
+		first = json.read(io.StringIO(text), cache).value()
+		second = json.read(text.encode("utf-8"), cache).value()
+		self.assertEqual(first, [ { "name": 1, "version": 2 }, { "name": 3, "version": 4 } ])
+		self.assertEqual(second, first)
+		keys = [ k for value in first + second for k in value ]
+		self.assertIs(keys[0], keys[2])
+		self.assertIs(keys[0], keys[4])
+		self.assertIs(keys[1], keys[3])
+		self.assertIs(keys[1], keys[7])
+		cache = json.KeyCache(1)
+		self.assertEqual(json.read(text.encode("utf-8"), cache).value(), first)
+		self.assertEqual(len(cache), 2)
+		
+	def test_value_dict_binary(self):
+	
+		try:
+			json_in = resource_open("value-dict.json", "rb")
+			reader = json.read(json_in)
+			self.assertTrue(reader.isdict())
+			value = reader.value()
+			self.assertEqual(value["key1"], "value1")
+			self.assertEqual(value["key3"], "value3")
+		finally:
+			json_in.close()
+			
+	def test_value_dict_mmap(self):
+	
+		try:
+			json_in = resource_open("value-dict.json", "rb")
+			json_map = mmap.mmap(json_in.fileno(), 0, access=mmap.ACCESS_READ)
+			value = json.read(json_map).value()
+			self.assertEqual(value["key2"], "value2")
+		finally:
+			json_map.close()
+			json_in.close()
+			
+	def test_value_str_utf8(self):
+	
+		text = "\"a\u00e9\u20ac\\n\U0001f600\"".encode("utf-8")
+		for size in range(1, 8):
+			reader = json.read(json.Scanner(io.BytesIO(text), size))
+			self.assertEqual(reader.value(), "a\u00e9\u20ac\n\U0001f600")
+		reader = json.read(memoryview(text))
+		self.assertEqual(reader.value(), "a\u00e9\u20ac\n\U0001f600")
+		
+	def test_value_list_numbers(self):
+	
+		reader = json.read(io.StringIO("[1, 2.5,3]"))
+		self.assertEqual(reader.value(), [ 1, 2.5, 3 ])
+		
+	def test_value_number_forms(self):
+	
+		for text, expected in (
+			( "-12", -12 ),
+			( "0.25", 0.25 ),
+			( "1e3", 1000.0 ),
+			( "-2.5E-2", -0.025 )
+		):
+			reader = json.read(io.StringIO(text))
+			self.assertEqual(reader.value(), expected)
+		with self.assertRaises(json.ReaderException):
+			json.read(io.StringIO("1e")).value()
+			
+	def test_value_str_escapes(self):
+	
+		text = "\"\\\"\\\\\\/\\b\\f\\n\\r\\t\\u00e9\\ud83d\\ude00\""
+		for size in range(1, 8):
+			reader = json.read(json.Scanner(io.StringIO(text), size))
+			self.assertEqual(reader.value(), "\"\\/\b\f\n\r\t\u00e9\U0001f600")
+		with self.assertRaises(json.ReaderException):
+			json.read(io.StringIO("\"\\x\"")).value()
+			
+	def test_value_array(self):
+	
+		for size in range(1, 8):
+			text = "[ 1, -2.5e1 ,3.25,4 ]"
+			reader = json.read(json.Scanner(io.StringIO(text), size))
+			value = reader.value_array()
+			self.assertEqual(value.typecode, "d")
+			self.assertEqual(list(value), [ 1.0, -25.0, 3.25, 4.0 ])
+		reader = json.read(io.StringIO("[]"))
+		self.assertEqual(list(reader.value_array("q")), [])
+		with self.assertRaises(json.ReaderException):
+			json.read(io.StringIO("[1, 2.5]")).value_array("q")
+		with self.assertRaises(json.ReaderException):
+			json.read(io.StringIO("[1, \"2\"]")).value_array()
+			
+	def test_stream_complex_chunks(self):
+	
+		for size in range(1, 8):
+			try:
+				json_in = resource_open("stream-complex.json")
+				reader = json.read(json.Scanner(json_in, size))
+				value = reader.value()
+				self.assertEqual(value["name"], "complex")
+				self.assertEqual(value["items"], [ "item1", "item2", "item3" ])
+				self.assertEqual(value["properties"]["depth"], 2)
+			finally:
+				json_in.close()
+				
+	def test_stream_complex_unconsumed(self):
+	
+		try:
+			json_in = resource_open("stream-complex.json")
+			reader = json.read(json_in)
+			keys = [ ra_k for ra_k, ra_v in reader ]
+			self.assertEqual(keys, [ "name", "complexity", "items", "properties" ])
+		finally:
+			json_in.close()
+			
+	def test_stream_complex_skip(self):
+	
+		try:
+			json_in = resource_open("stream-complex.json")
+			reader = json.read(json_in)
+			for ra_k, ra_v in reader:
+				if ra_k == "items":
+					for rb in ra_v:
+						self.assertEqual(rb.value(), "item1")
+						break
+					ra_v.skip()
+				elif ra_k == "properties":
+					self.assertEqual(ra_v.value(), {
+						"type": "stream",
+						"depth": 2
+					})
+				else:
+					ra_v.skip()
+		finally:
+			json_in.close()
+			
+	def test_skip_nested(self):
+	
+		reader = json.read(io.StringIO("[{\"a\": [\"]\\\"\", 1]}, 2]"))
+		for r_i, r in enumerate(reader):
+			if r_i == 0:
+				r.skip()
+			else:
+				self.assertEqual(r.value(), 2)
+				
+	def test_index_complex(self):
+	
+		for depth in ( None, 0, 1 ):
+			try:
+				json_in = resource_open("stream-complex.json", "rb")
+				index = json.index(json_in, depth)
+				self.assertEqual(index.get("name"), "complex")
+				self.assertEqual(index.get("items", 1), "item2")
+				self.assertEqual(index.get("properties", "depth"), 2)
+				self.assertEqual(index.get("properties"), {
+					"type": "stream",
+					"depth": 2
+				})
+				with self.assertRaises(KeyError):
+					index.get("items", 3)
+			finally:
+				index.close()
+				json_in.close()
+				
+	def test_load_lazy(self):
+	
+		with resource_open("stream-complex.json", "rb") as json_in:
+			value = json.load_lazy(json_in)
+			self.assertIsInstance(value, json.LazyMapping)
+			self.assertEqual(value["name"], "complex")
+			self.assertIsInstance(value["items"], json.LazySequence)
+			self.assertEqual(value["items"][-1], "item3")
+			self.assertEqual(value["items"][0:2], [ "item1", "item2" ])
+			self.assertIs(value["properties"], value["properties"])
+			self.assertEqual(value["properties"]["depth"], 2)
+			with self.assertRaises(KeyError):
+				value["missing"]
+			with self.assertRaises(IndexError):
+				value["items"][3]
+			self.assertEqual(value, {
+				"name": "complex",
+				"complexity": 1,
+				"items": [ "item1", "item2", "item3" ],
+				"properties": { "type": "stream", "depth": 2 }
+			})
+		self.assertEqual(json.load_lazy(io.StringIO(" [ 1, { \"k\": [] } ]"))[1]["k"], [])
+		self.assertEqual(json.load_lazy(b"176"), 176)
+		
+	def test_parallel_load(self):
+	
+		value = [ { "name": "item{}".format(i), "ports": [ i, 80 ] } for i in range(500) ]
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			path = os.path.join(tmp_dir, "list.json")
+			with open(path, "w") as json_out:
+				json.write(json_out, value, 0)
+			self.assertEqual(json.parallel_load(path, 2), value)
+			self.assertEqual(json.parallel_load(path, 1), value)
+			with open(path, "w") as json_out:
+				json_out.write("{ \"items\": [] }")
+			self.assertEqual(json.parallel_load(path, 2), { "items": [] })
+			
+	def test_read_many(self):
+	
+		text = "{\"a\": 1}\n[1, 2]\n\"x\"\n"
+		values = list(json.read_many(io.StringIO(text)))
+		self.assertEqual(values, [
+			( 0, { "a": 1 } ),
+			( 9, [ 1, 2 ] ),
+			( 16, "x" )
+		])
+		
+	def test_read_many_recover(self):
+	
+		errors = []
+		text = b"{\"a\": 1}\n{\"a\" 2}\n{\"a\": 3}\n"
+		values = list(json.read_many(text, lambda o, e: errors.append(o)))
+		self.assertEqual(values, [ ( 0, { "a": 1 } ), ( 17, { "a": 3 } ) ])
+		self.assertEqual(errors, [ 9 ])
+		with self.assertRaises(json.ReaderException):
+			list(json.read_many(text))
+			
+	def test_read_many_truncated(self):
+	
+		for text in ( "[1,2\n{\"b\":2}\n\"x\"\n", b"[1,2\n{\"b\":2}\n\"x\"" ):
+			for size in ( 2, 7, 65536 ):
+				errors = []
+				scanner = json.Scanner(
+					io.BytesIO(text) if isinstance(text, bytes) else io.StringIO(text),
+					size
+				)
+				values = list(json.read_many(
+					scanner,
+					lambda o, e: errors.append(o)
+				))
+				self.assertEqual(values, [ ( 5, { "b": 2 } ), ( 13, "x" ) ])
+				self.assertEqual(errors, [ 0 ])
+				
+	def test_read_many_spanning(self):
+	
+		truncated = "[" + ",".join(str(i) for i in range(200)) + "\n"
+		pretty = "{\n" + ",\n".join(
+			"  \"key{}\": {}".format(i, i)
+			for i in range(100)
+		) + "\n}\n"
+		text = truncated + "{\"b\": 2}\n" + pretty
+		for size in ( 16, 65536 ):
+			errors = []
+			scanner = json.Scanner(io.StringIO(text), size)
+			values = list(json.read_many(scanner, lambda o, e: errors.append(o)))
+			self.assertEqual(errors, [ 0 ])
+			self.assertEqual(values, [
+				( len(truncated), { "b": 2 } ),
+				( text.index(pretty), { "key{}".format(i): i for i in range(100) } )
+			])
+			
+	def test_aread_complex(self):
+	
+		async def aread_value(data, size):
+			stream = asyncio.StreamReader()
+			for i in range(0, len(data), size):
+				stream.feed_data(data[i:i + size])
+			stream.feed_eof()
+			reader = await json.aread(stream)
+			self.assertTrue(reader.isdict())
+			return await reader.value()
+			
+		try:
+			json_in = resource_open("stream-complex.json", "rb")
+			data = json_in.read()
+		finally:
+			json_in.close()
+		for size in ( 1, 3, 1024 ):
+			value = asyncio.run(aread_value(data, size))
+			self.assertEqual(value["items"], [ "item1", "item2", "item3" ])
+			self.assertEqual(value["properties"]["depth"], 2)
+			
+	def test_aread_stream(self):
+	
+		async def aread_items():
+			stream = asyncio.StreamReader()
+			stream.feed_data(b"[1, {\"a\": [2]}, \"x\"]")
+			reader = await json.aread(stream)
+			items = []
+			async for r in reader:
+				if not r.isdict():
+					items.append(await r.value())
+			return items
+			
+		self.assertEqual(asyncio.run(aread_items()), [ 1, "x" ])
+		
+	def test_events_complex(self):
+	
+		try:
+			json_in = resource_open("stream-complex.json")
+			self.assertEqual(list(json.events(json_in)), [
+				( "start_map", None ),
+				( "map_key", "name" ),
+				( "string", "complex" ),
+				( "map_key", "complexity" ),
+				( "number", 1 ),
+				( "map_key", "items" ),
+				( "start_array", None ),
+				( "string", "item1" ),
+				( "string", "item2" ),
+				( "string", "item3" ),
+				( "end_array", None ),
+				( "map_key", "properties" ),
+				( "start_map", None ),
+				( "map_key", "type" ),
+				( "string", "stream" ),
+				( "map_key", "depth" ),
+				( "number", 2 ),
+				( "end_map", None ),
+				( "end_map", None )
+			])
+		finally:
+			json_in.close()
+			
+	def test_events_illegal(self):
+	
+		with self.assertRaises(json.ReaderException):
+			list(json.events(io.StringIO("[1, 2}")))
+			
+	def test_trailing_commas(self):
+	
+		for text, value in ( ( "[1, 2,]", [ 1, 2 ] ), ( "{\"a\": 1,}", { "a": 1 } ) ):
+			self.assertEqual(json.read(io.StringIO(text)).value(), value)
+			self.assertEqual(json.load_lazy(text.encode()), value)
+			with self.assertRaises(json.ReaderException):
+				list(json.events(io.StringIO(text)))
+			parser = json.FeedParser()
+			with self.assertRaises(json.ReaderException):
+				parser.feed(text)
+				
+	def test_feed_chunks(self):
+	
+		text = (
+			"{\"name\": \"caf\\u00e9 \\\"x\\\"\", \"n\": [-12.5e3, 7, {}],"
+			" \"s\": \"\\ud83d\\ude00\u00e9\", \"e\": []} 42"
+		)
+		data = text.encode("utf-8")
+		expected = list(json.events(io.StringIO(text.rsplit(" ", 1)[0])))
+		expected.append(( "number", 42 ))
+		for size in ( 1, 2, 3, 7, len(data) ):
+			parser = json.FeedParser()
+			found = []
+			for i in range(0, len(data), size):
+				parser.feed(data[i:i + size])
+				found.extend(parser.events())
+			self.assertEqual(found, expected[:-1])
+			parser.close()
+			found.extend(parser.events())
+			self.assertEqual(found, expected)
+			
+	def test_feed_illegal(self):
+	
+		for text in ( "[1, 2}", "{\"a\" 1}", "\"\\x\"", "[1,", "{\"a\": \"b" ):
+			parser = json.FeedParser()
+			with self.assertRaises(json.ReaderException):
+				parser.feed(text)
+				parser.close()
+				
+	def test_select_complex(self):
+	
+		for path_expr, expected in (
+			( "$.items[*]", [ "item1", "item2", "item3" ] ),
+			( "items[1]", [ "item2" ] ),
+			( "properties.depth", [ 2 ] ),
+			( "$[\"properties\"].*", [ "stream", 2 ] ),
+			( "missing.name", [] )
+		):
+			try:
+				json_in = resource_open("stream-complex.json")
+				values = list(json.select(json_in, path_expr))
+				self.assertEqual(values, expected)
+			finally:
+				json_in.close()
+				
 class TestWrite(unittest.TestCase):
 
 	def test_value_number(self):
@@ -123,9 +540,27 @@ class TestWrite(unittest.TestCase):
 	def test_value_str(self):
 	
 		json_out = io.StringIO()
-		json.write(json_out, "abcD123\\\"aaa")
+		json.write(json_out, "abcD123\"aaa")
 		self.assertSameContent(json_out, "value-str.json")
 		
+	def test_value_str_escapes(self):
+	
+		value = "q\"b\\n\n\x01\u00e9\U0001f600"
+		json_out = io.StringIO()
+		json.write(json_out, value)
+		self.assertEqual(json_out.getvalue(), "\"q\\\"b\\\\n\\n\\u0001\u00e9\U0001f600\"")
+		self.assertEqual(json.read(io.StringIO(json_out.getvalue())).value(), value)
+		json_out = io.StringIO()
+		json.write(json.OutputBuffer(json_out, ascii=True), { value: value })
+		self.assertEqual(json_out.getvalue().encode("ascii").count(b"\\ud83d\\ude00"), 2)
+		self.assertEqual(json.read(io.StringIO(json_out.getvalue())).value(), { value: value })
+		json_out = io.StringIO()
+		writer = json.write_str(json_out)
+		writer.write(value[:4])
+		writer.write(value[4:])
+		writer.close()
+		self.assertEqual(json.read(io.StringIO(json_out.getvalue())).value(), value)
+		
 	def test_value_list(self):
 	
 		json_out = io.StringIO()
@@ -164,6 +599,132 @@ class TestWrite(unittest.TestCase):
 		writer.close()
 		self.assertSameContent(json_out, "stream-complex.json")
 		
+	def test_buffer(self):
+	
+		class Target:
+		
+			def __init__(self):
+			
+				self.data = []
+				
+			def write(self, data):
+			
+				self.data.append(data)
+				
+		target = Target()
+		writer = json.write_dict(json.OutputBuffer(target, 16), 0)
+		writer.put("nested", { "key1": [ 1, 2 ], "key2": {} })
+		writer.put("name", "buffer")
+		self.assertGreater(len(target.data), 0)
+		self.assertTrue(all(len(data) >= 16 for data in target.data))
+		writer.close()
+		self.assertEqual("".join(target.data), "{\n"
+			"\t\"nested\": {\n"
+			"\t\t\"key1\": [\n\t\t\t1,\n\t\t\t2\n\t\t],\n"
+			"\t\t\"key2\": {\n\t\t}\n"
+			"\t},\n"
+			"\t\"name\": \"buffer\"\n"
+			"}"
+		)
+		
+	def test_encode(self):
+	
+		value = { "name": "complex", "items": [ 1, 2.5, [], {} ], "none": {} }
+		self.assertEqual("".join(json.encode(value)),
+			"{\"name\":\"complex\",\"items\":[1,2.5,[],{}],\"none\":{}}"
+		)
+		self.assertEqual("".join(json.encode(value, 1)), "{\n"
+			"\t\t\"name\": \"complex\",\n"
+			"\t\t\"items\": [\n\t\t\t1,\n\t\t\t2.5,\n\t\t\t[\n\t\t\t],\n\t\t\t{\n\t\t\t}\n\t\t],\n"
+			"\t\t\"none\": {\n\t\t}\n"
+			"\t}"
+		)
+		with self.assertRaises(json.WriterException):
+			"".join(json.encode([ 1, None ]))
+			
+	def test_stream_iterables(self):
+	
+		class Report:
+		
+			def __json_stream__(self):
+			
+				yield ( "name", "report" )
+				yield ( "rows", ( [ i, str(i) ] for i in range(3) ) )
+				
+		produced = []
+		
+		def items():
+		
+			for i in range(3):
+				produced.append(i)
+				yield i
+				
+		json_out = io.StringIO()
+		json.write(json_out, {
+			"report": Report(),
+			"items": items(),
+			"tuple": ( 1, "a" ),
+			"pairs": iter({ "k": "v" }.items()),
+			"view": { "k": {} }.items()
+		})
+		self.assertEqual(produced, [ 0, 1, 2 ])
+		self.assertEqual(json.read(io.StringIO(json_out.getvalue())).value(), {
+			"report": { "name": "report", "rows": [ [ 0, "0" ], [ 1, "1" ], [ 2, "2" ] ] },
+			"items": [ 0, 1, 2 ],
+			"tuple": [ 1, "a" ],
+			"pairs": { "k": "v" },
+			"view": { "k": {} }
+		})
+		json_out = io.StringIO()
+		json.write(json_out, ( i for i in range(2) ), 0)
+		self.assertEqual(json_out.getvalue(), "[\n\t0,\n\t1\n]")
+		with self.assertRaises(json.WriterException):
+			json.write(io.StringIO(), [ b"bytes" ])
+			
+	def test_many(self):
+	
+		json_out = io.StringIO()
+		json.write_many(json_out, [ 176, [ "value1" ], { "key1": 1 } ])
+		self.assertEqual(json_out.getvalue(), "176\n[\"value1\"]\n{\"key1\":1}\n")
+		
+	def test_awrite(self):
+	
+		class Target:
+		
+			def __init__(self):
+			
+				self.data = []
+				self.drains = 0
+				
+			def write(self, data):
+			
+				self.data.append(data)
+				
+			async def drain(self):
+			
+				self.drains += 1
+				
+		target = Target()
+		asyncio.run(json.awrite(target, [ "value1", "value2", "value3" ], 0, 8))
+		self.assertEqual(target.drains, 2)
+		self.assertNotIn(b"", target.data)
+		json_out = io.StringIO(b"".join(target.data).decode("utf-8"))
+		json_out.seek(0, io.SEEK_END)
+		self.assertSameContent(json_out, "value-list.json")
+		
+		value = {
+			"a": list(range(100000)),
+			"b": { "c": ( str(i) for i in range(10000) ) }
+		}
+		target = Target()
+		asyncio.run(json.awrite(target, value, None, 1024))
+		self.assertGreater(target.drains, 100)
+		self.assertLess(max(len(data) for data in target.data), 16 * 1024)
+		self.assertEqual(json.read(b"".join(target.data)).value(), {
+			"a": list(range(100000)),
+			"b": { "c": [ str(i) for i in range(10000) ] }
+		})
+		
 	def assertSameContent(self, str_io, res_path, msg=None):
 	
 		try:
@@ -174,10 +735,10 @@ class TestWrite(unittest.TestCase):
 		finally:
 			res_in.close()
 			
-def resource_open(path):
+def resource_open(path, mode="r"):
 	
 	res_path = os.path.dirname(__file__)
 	res_path = os.path.join(res_path, "resources")
 	res_path = os.path.join(res_path, path)
-	return open(res_path)
+	return open(res_path, mode)
 
@@ -0,0 +1,121 @@
+#
+# This file is part of TROCOLA.
+#
+# TROCOLA is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# TROCOLA is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with TROCOLA.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from trocola.core import resolver
+
+import unittest
+
+class TestResolver(unittest.TestCase):
+
+	__props = {
+		"main_platform": {
+			"name": "local",
+			"enabled": "true"
+		},
+		"hosts": [ "alpha", "beta" ],
+		"port": 8080
+	}
+	
+	def test_expression(self):
+	
+		for text, expected in (
+			( "main_platform['name']", "local" ),
+			( "main_platform[\"enabled\"]", "true" ),
+			( " main_platform . name ", "local" ),
+			( "hosts[1]", "beta" ),
+			( "port", 8080 )
+		):
+			self.assertEqual(resolver.expression(text)(self.__props), expected)
+		self.assertIs(resolver.expression("port"), resolver.expression("port"))
+		for text in ( "", "__import__('os').system('true')", "port + 1" ):
+			with self.assertRaises(resolver.ResolverException):
+				resolver.expression(text)
+		with self.assertRaises(resolver.ResolverException):
+			resolver.expression("hosts[2]")(self.__props)
+			
+	def test_resolve(self):
+	
+		data = {
+			"platform": "#{main_platform['name']}",
+			"url": "http://#{hosts[0]}:#{port}/",
+			"port": "#{port}",
+			"items": [ "#{hosts[1]}", 1, "plain" ]
+		}
+		self.assertEqual(resolver.resolvable(data, self.__props), {
+			"platform": "local",
+			"url": "http://alpha:8080/",
+			"port": 8080,
+			"items": [ "beta", 1, "plain" ]
+		})
+		self.assertEqual(data["port"], "#{port}")
+		
+	def test_resolvable_lazy(self):
+	
+		props = { "name": "first" }
+		data = {
+			"name": "#{name}",
+			"nested": { "items": [ "#{name}-1", "#{missing}" ] }
+		}
+		resolved = resolver.resolvable(data, props)
+		self.assertIsInstance(resolved, resolver.ResolvableMapping)
+		self.assertEqual(resolved["name"], "first")
+		items = resolved["nested"]["items"]
+		self.assertIs(resolved["nested"]["items"], items)
+		self.assertEqual(items[0], "first-1")
+		with self.assertRaises(resolver.ResolverException):
+			items[1]
+		props["name"] = "second"
+		self.assertEqual(items[0], "first-1")
+		resolved.scope.update()
+		self.assertEqual(resolved["name"], "second")
+		self.assertEqual(items[0], "second-1")
+		resolved.scope.update({ "name": "third", "missing": "found" })
+		self.assertEqual(list(items), [ "third-1", "found" ])
+		
+	def test_recording(self):
+	
+		self.assertEqual(
+			resolver.dependencies("#{main_platform['name']}:#{hosts[0]}"),
+			( ( "main_platform", "name" ), ( "hosts", 0 ) )
+		)
+		resolved = resolver.resolvable({
+			"name": "#{main_platform.name}",
+			"items": [ "#{port}", "plain" ]
+		}, self.__props)
+		scope = resolved.scope
+		scope.start_recording()
+		resolved["name"]
+		scope.start_recording()
+		list(resolved["items"])
+		self.assertEqual(scope.stop_recording(), { ( "port", ) })
+		self.assertEqual(scope.stop_recording(), {
+			( "main_platform", "name" ),
+			( "port", )
+		})
+		scope.start_recording()
+		resolved["name"]
+		self.assertEqual(scope.stop_recording(), { ( "main_platform", "name" ) })
+		self.assertFalse(scope.recording)
+		
+	def test_boolean(self):
+	
+		self.assertTrue(resolver.boolean("true"))
+		self.assertTrue(resolver.boolean(" True"))
+		self.assertFalse(resolver.boolean("no"))
+		self.assertFalse(resolver.boolean(False))
+		with self.assertRaises(resolver.ResolverException):
+			resolver.boolean("maybe")
@@ -0,0 +1,53 @@
+#
+# This file is part of TROCOLA.
+#
+# TROCOLA is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# TROCOLA is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with TROCOLA.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from trocola.core import util
+
+import unittest
+
+class TestUtil(unittest.TestCase):
+
+	def test_merge_dict(self):
+	
+		source = { "a": { "b": 1, "c": { "d": 2 } }, "e": 3 }
+		target = { "a": { "b": 0, "x": 9 }, "e": { "f": 4 } }
+		util.merge_dict(target, source)
+		self.assertEqual(target, {
+			"a": { "b": 1, "x": 9, "c": { "d": 2 } },
+			"e": 3
+		})
+		self.assertIsNot(target["a"]["c"], source["a"]["c"])
+		
+	def test_chain_props(self):
+	
+		base = { "a": { "b": 1, "c": { "d": 2 } }, "e": 3, "f": { "g": 4 } }
+		top = { "a": { "b": 0, "x": 9 }, "e": { "h": 5 }, "f": 6 }
+		props = util.ChainProps(top, None, base)
+		merged = {}
+		util.merge_dict(merged, base)
+		util.merge_dict(merged, top)
+		self.assertEqual(props, merged)
+		self.assertEqual(props.to_dict(), merged)
+		self.assertEqual(list(props), [ "a", "e", "f" ])
+		self.assertIs(props["a"], props["a"])
+		self.assertIs(props["a"]["c"], base["a"]["c"])
+		self.assertEqual(props.find("a.c.d"), 2)
+		self.assertEqual(props.find(( "a", "x" )), 9)
+		self.assertEqual(props.find("e.h"), 5)
+		for path in ( "a.y", "f.g", "e.h.i" ):
+			with self.assertRaises(KeyError):
+				props.find(path)
@@ -0,0 +1,201 @@
+#
+# This file is part of TROCOLA.
+#
+# TROCOLA is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# TROCOLA is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with TROCOLA.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from trocola.engine import image
+
+import unittest
+
+def new_image(name, version, extends=None, ports=(), execution=()):
+
+	base_ref = None if extends is None else image.ImageRef(*extends)
+	img = image.Image(image.ImageRef(name, version), base_ref)
+	for port_name, port_value in ports:
+		img.ports.append(image.ImagePort(port_name, port_value))
+	img.provision.append(image.ImageCommand([ "setup", name ]))
+	for args in execution:
+		img.execution.append(image.ImageCommand(args))
+	return img
+	
+class BaseResource:
+
+	def ref(self, uri):
+	
+		return ( "base", uri )
+		
+def image_data(name, version, extends=None):
+
+	data = {
+		"properties": {
+			"service": {
+				"port": 80,
+				"user": "members"
+			}
+		},
+		"image": {
+			"name": name,
+			"version": version,
+			"ports": [
+				{
+					"name": "http",
+					"value": "#{service.port}"
+				},
+				{
+					"name": "metrics",
+					"value": 9100,
+					"protocol": "udp"
+				}
+			],
+			"resources": [
+				{
+					"source": {
+						"uri": "files/#{service.user}.conf"
+					},
+					"target": "/etc/#{service.user}.conf"
+				}
+			],
+			"provision": [
+				{
+					"arguments": [ "useradd", "#{service.user}" ]
+				}
+			],
+			"execution": [
+				{
+					"arguments": [ "serve", "--user", "#{service.user}" ]
+				}
+			]
+		}
+	}
+	if extends is not None:
+		data["image"]["extends"] = {
+			"name": extends[0],
+			"version": extends[1]
+		}
+	return data
+	
+class TestImage(unittest.TestCase):
+
+	def test_load(self):
+	
+		base_res = BaseResource()
+		loaded = image.load(
+			base_res,
+			image_data("members-service", "2.3", ( "rest-service", "1.4" )),
+			{ "service": { "port": 8080 } }
+		)
+		self.assertEqual(loaded.ref.name, "members-service")
+		self.assertEqual(loaded.ref.version, "2.3")
+		self.assertEqual(loaded.extends.name, "rest-service")
+		self.assertEqual(
+			[ ( port.name, port.value, port.protocol ) for port in loaded.ports ],
+			[ ( "http", 8080, "tcp" ), ( "metrics", 9100, "udp" ) ]
+		)
+		resource = loaded.resources[0]
+		self.assertEqual(resource.source_res, ( "base", "files/members.conf" ))
+		self.assertEqual(resource.target_path, "/etc/members.conf")
+		self.assertEqual(loaded.provision[0].arguments, [ "useradd", "members" ])
+		
+		catalog = image.ImageCatalog()
+		catalog.add(loaded)
+		catalog.add(image.load(base_res, image_data("rest-service", "1.4")))
+		flat = catalog.flatten(image.ImageRef("members-service", "2.3"))
+		self.assertEqual(
+			[ ( port.name, port.value ) for port in flat.ports ],
+			[ ( "http", 8080 ), ( "metrics", 9100 ) ]
+		)
+		self.assertEqual([ cmd.arguments for cmd in flat.provision ], [
+			[ "useradd", "members" ],
+			[ "useradd", "members" ]
+		])
+		self.assertEqual([ cmd.arguments for cmd in flat.execution ], [
+			[ "serve", "--user", "members" ]
+		])
+		
+class TestImageCatalog(unittest.TestCase):
+
+	def test_flatten(self):
+	
+		catalog = image.ImageCatalog()
+		members_ref = image.ImageRef("members-service", "2.3")
+		catalog.add(new_image(
+			"base",
+			"1.0",
+			ports=[ ( "ssh", 22 ) ],
+			execution=[ [ "init" ] ]
+		))
+		catalog.add(new_image(
+			"rest-service",
+			"1.4",
+			( "base", "1.0" ),
+			ports=[ ( "http", 8080 ) ]
+		))
+		catalog.add(new_image(
+			"members-service",
+			"2.3",
+			( "rest-service", "1.4" ),
+			ports=[ ( "http", 80 ) ],
+			execution=[ [ "serve" ] ]
+		))
+		
+		flat = catalog.flatten(members_ref)
+		self.assertEqual(
+			[ ( port.name, port.value ) for port in flat.ports ],
+			[ ( "ssh", 22 ), ( "http", 80 ) ]
+		)
+		self.assertEqual(
+			[ cmd.arguments[1] for cmd in flat.provision ],
+			[ "base", "rest-service", "members-service" ]
+		)
+		self.assertEqual([ cmd.arguments for cmd in flat.execution ], [
+			[ "serve" ]
+		])
+		rest = catalog.flatten(image.ImageRef("rest-service", "1.4"))
+		self.assertEqual([ cmd.arguments for cmd in rest.execution ], [
+			[ "init" ]
+		])
+		self.assertIs(catalog.flatten(members_ref), flat)
+		
+		base = catalog.flatten(image.ImageRef("base", "1.0"))
+		catalog.add(new_image(
+			"rest-service",
+			"1.4",
+			( "base", "1.0" ),
+			ports=[ ( "https", 8443 ) ]
+		))
+		flat = catalog.flatten(members_ref)
+		self.assertEqual(
+			[ port.name for port in flat.ports ],
+			[ "ssh", "https", "http" ]
+		)
+		self.assertIs(catalog.flatten(image.ImageRef("base", "1.0")), base)
+		
+	def test_flatten_errors(self):
+	
+		catalog = image.ImageCatalog()
+		catalog.add(new_image("a", "1", ( "b", "1" )))
+		catalog.add(new_image("b", "1", ( "c", "1" )))
+		with self.assertRaises(image.ImageException):
+			catalog.flatten(image.ImageRef("a", "1"))
+		catalog.add(new_image("c", "1", ( "a", "1" )))
+		with self.assertRaises(image.ImageException):
+			catalog.flatten(image.ImageRef("a", "1"))
+		catalog.add(new_image("c", "1"))
+		flat = catalog.flatten(image.ImageRef("a", "1"))
+		self.assertEqual(len(flat.provision), 3)
+		catalog.remove(image.ImageRef("c", "1"))
+		self.assertEqual(len(catalog), 2)
+		with self.assertRaises(image.ImageException):
+			catalog.flatten(image.ImageRef("a", "1"))
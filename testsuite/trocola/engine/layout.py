@@ -0,0 +1,172 @@
+#
+# This file is part of TROCOLA.
+#
+# TROCOLA is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# TROCOLA is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with TROCOLA.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from trocola.engine import layout
+
+import unittest
+
+def layout_data():
+
+	return {
+		"properties": {
+			"main_platform": {
+				"name": "local",
+				"enabled": "true"
+			},
+			"backup": {
+				"enabled": "false"
+			}
+		},
+		"layout": {
+			"containers": {
+				"members-service-01": {
+					"image": {
+						"name": "members-service",
+						"version": "2.3"
+					},
+					"ports": [
+						{
+							"name": "http",
+							"service": "members"
+						}
+					]
+				},
+				"backup-01": {
+					"image": {
+						"name": "backup",
+						"version": "#{backup.version}"
+					}
+				}
+			},
+			"volumes": {
+				"members-volume-01": {
+					"storage": "local",
+					"size": "8Gb"
+				}
+			},
+			"executions": [
+				{
+					"container": "members-service-01",
+					"platform": "#{main_platform['name']}",
+					"configuration": {
+						"volumes": [
+							{
+								"volume": "members-volume-01",
+								"path": "/var/database"
+							}
+						]
+					},
+					"enabled": "#{main_platform['enabled']}"
+				},
+				{
+					"container": "members-service-01",
+					"platform": "remote"
+				},
+				{
+					"container": "backup-01",
+					"platform": "remote",
+					"enabled": "#{backup.enabled}"
+				}
+			]
+		}
+	}
+	
+class TestLayout(unittest.TestCase):
+
+	def test_load(self):
+	
+		loaded = layout.load(layout_data(), {
+			"main_platform": {
+				"name": "docker"
+			}
+		})
+		self.assertEqual(len(loaded.executions), 2)
+		execut = loaded.executions[0]
+		self.assertEqual(execut.platform_name, "docker")
+		self.assertEqual(execut.container.image_ref.version, "2.3")
+		self.assertEqual(execut.container.ports[0].service_name, "members")
+		mount = execut.configuration.volumes[0]
+		self.assertEqual(mount.volume.size, 8 * 1024 ** 3)
+		self.assertEqual(mount.path, "/var/database")
+		self.assertIs(loaded.executions[1].container, execut.container)
+		
+	def test_reload(self):
+	
+		loaded = layout.load(layout_data())
+		first, second = loaded.executions
+		
+		reloaded = layout.reload(loaded, {
+			"main_platform": {
+				"name": "docker"
+			}
+		})
+		self.assertEqual(len(reloaded.executions), 2)
+		self.assertEqual(reloaded.executions[0].platform_name, "docker")
+		self.assertIsNot(reloaded.executions[0], first)
+		self.assertIs(reloaded.executions[0].container, first.container)
+		self.assertIs(reloaded.executions[1], second)
+		
+		reloaded = layout.reload(reloaded, {
+			"backup": {
+				"enabled": "true",
+				"version": "1.0"
+			}
+		})
+		self.assertEqual(len(reloaded.executions), 3)
+		self.assertIs(reloaded.executions[1], second)
+		self.assertEqual(reloaded.executions[2].container.image_ref.version, "1.0")
+		
+		backup = reloaded.executions[2]
+		reloaded = layout.reload(reloaded, {
+			"backup": {
+				"version": "1.1"
+			}
+		})
+		self.assertIsNot(reloaded.executions[2], backup)
+		self.assertEqual(reloaded.executions[2].container.image_ref.version, "1.1")
+		self.assertIs(reloaded.executions[1], second)
+		
+		reloaded = layout.reload(reloaded, {
+			"main_platform": {
+				"enabled": "false"
+			}
+		})
+		self.assertEqual(len(reloaded.executions), 2)
+		self.assertIs(reloaded.executions[0], second)
+		
+	def test_reload_layers(self):
+	
+		loaded = layout.load(layout_data(), {
+			"main_platform": {
+				"name": "docker"
+			}
+		})
+		scope = loaded.source.definition.scope
+		self.assertEqual(len(scope.props.layers), 3)
+		for i in range(10):
+			loaded = layout.reload(loaded, {
+				"main_platform": {
+					"name": "platform{}".format(i)
+				}
+			})
+			self.assertEqual(len(scope.props.layers), 3)
+		self.assertEqual(loaded.executions[0].platform_name, "platform9")
+		self.assertEqual(loaded.source.overrides, {
+			"main_platform": {
+				"name": "platform9"
+			}
+		})